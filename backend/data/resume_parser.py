@@ -2,12 +2,13 @@ import pdfplumber
 import json
 import os
 import sys
-import google.generativeai as genai
 from dotenv import load_dotenv
 import re
 
+# Run from the project root: python -m backend.data.resume_parser
+from backend.rag.llm_client import get_llm_client
+
 load_dotenv()
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))  # Load API key from .env file
 
 def clean_text(text):
     """Remove unwanted characters like \u2013 (en dash) and other unicode artifacts."""
@@ -30,7 +31,7 @@ def extract_pdf(pdf_path):
     return "\n".join(extracted_text), links
 
 def parse_resume_with_gemini(resume_text, links):
-    """Use Gemini Flash 2 to extract structured resume data."""
+    """Use Gemini (GEMINI_MODEL, the shared client's model) to extract structured resume data."""
     prompt = (
         "You are an excellent Resume Parser.Extract the following structured information from the resume text:\n"
         "- Contact Information (Name, Phone, Email, LinkedIn, GitHub)\n"
@@ -46,11 +47,10 @@ def parse_resume_with_gemini(resume_text, links):
         "Extracted Links:\n" + json.dumps(links)
     )
     
-    model=genai.GenerativeModel("gemini-2.0-flash")
-    response = model.generate_content(prompt)
+    response_text = get_llm_client().generate(prompt, purpose="resume_parsing")
     
     try:
-        return json.loads(response.text.strip().strip('```json').strip('```'))
+        return json.loads(response_text.strip().strip('```json').strip('```'))
     except json.JSONDecodeError:
         print("Failed to parse Gemini response as JSON.")
         return None
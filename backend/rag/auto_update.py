@@ -4,7 +4,8 @@ import json
 from pathlib import Path
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
-from .pinecone_store import create_pinecone_embeddings, clear_pinecone_index
+from .config import CHUNK_SIZE, CHUNK_OVERLAP
+from .pinecone_store import update_embeddings
 import logging
 
 logger = logging.getLogger(__name__)
@@ -56,29 +57,26 @@ class DataUpdateHandler(FileSystemEventHandler):
         timer.start()
     
     def _update_embeddings(self):
-        """Regenerate embeddings in Pinecone if enough time has passed"""
+        """Regenerate embeddings in the vector store if enough time has passed"""
         if time.time() - self.last_update < self.update_delay:
             return  # Another change happened, skip this update
             
         try:
-            logger.info("🔄 Regenerating Pinecone embeddings due to data changes...")
+            logger.info("🔄 Regenerating embeddings due to data changes...")
             
-            # Clear old embeddings from Pinecone
-            logger.info("🗑️ Clearing old embeddings from Pinecone...")
-            clear_pinecone_index()
-            
-            # Create new embeddings
-            logger.info("🌲 Creating new embeddings...")
-            create_pinecone_embeddings(
+            # Only chunks whose content changed are embedded; a full rebuild (into a
+            # fresh index generation, switched to atomically) happens only when needed
+            logger.info("🌲 Updating embeddings for changed chunks...")
+            update_embeddings(
                 json_directory=self.json_directory,
-                chunk_size=512,
-                overlap=120
+                chunk_size=CHUNK_SIZE,
+                overlap=CHUNK_OVERLAP
             )
             
-            logger.info("✅ Pinecone embeddings successfully regenerated!")
+            logger.info("✅ Embeddings successfully regenerated!")
             
         except Exception as e:
-            logger.error(f"❌ Error regenerating Pinecone embeddings: {str(e)}")
+            logger.error(f"❌ Error regenerating embeddings: {str(e)}")
 
 class AutoUpdateVectorStore:
     """Main class for automatic vector store updates"""
@@ -0,0 +1,165 @@
+"""
+Thread-safe caches and data-version tracking for the RAG pipeline
+Cached answers are stamped with the version of the data they were built
+from, so they disappear as soon as the embeddings are regenerated
+"""
+
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .config import DATA_DIRECTORY
+
+_data_version: Optional[str] = None
+_data_version_lock = threading.Lock()
+_version_listeners: List[Callable[[], None]] = []
+
+
+def compute_data_version(json_directory: str = DATA_DIRECTORY) -> str:
+    """Fingerprint the JSON data files (names + contents)"""
+    digest = hashlib.sha256()
+    if os.path.isdir(json_directory):
+        for filename in sorted(os.listdir(json_directory)):
+            if filename.endswith(".json"):
+                digest.update(filename.encode())
+                with open(os.path.join(json_directory, filename), "rb") as f:
+                    digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def get_data_version() -> str:
+    """Current data version, fingerprinted from DATA_DIRECTORY on first use"""
+    global _data_version
+    if _data_version is None:
+        with _data_version_lock:
+            if _data_version is None:
+                _data_version = compute_data_version()
+    return _data_version
+
+
+def bump_data_version(version: Optional[str] = None) -> str:
+    """
+    Record that the indexed data changed and drop in-process caches.
+    Called by create_pinecone_embeddings once the new vectors are uploaded.
+    """
+    global _data_version
+    with _data_version_lock:
+        _data_version = version or compute_data_version()
+        listeners = list(_version_listeners)
+    for listener in listeners:
+        listener()
+    print(f"🔖 Data version is now {_data_version} - cached answers invalidated")
+    return _data_version
+
+
+def on_data_version_change(listener: Callable[[], None]):
+    """Register a callback to run whenever the data version is bumped"""
+    with _data_version_lock:
+        _version_listeners.append(listener)
+
+
+class LRUCache:
+    """
+    Bounded LRU cache with a per-entry TTL and a data-version stamp.
+    Entries written under an older data version are treated as misses.
+    All operations hold a lock, so executor threads can share one instance.
+    """
+
+    def __init__(self, max_entries: int = 100, ttl_seconds: Optional[float] = 3600, versioned: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.versioned = versioned
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expired = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing, expired or stale"""
+        now = time.monotonic()
+        version = get_data_version() if self.versioned else None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            value, expires_at, entry_version = entry
+            if (expires_at is not None and now >= expires_at) or entry_version != version:
+                del self._entries[key]
+                self._expired += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: str, value: Any):
+        """Insert or refresh an entry, evicting the least recently used if full"""
+        if self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else None
+        version = get_data_version() if self.versioned else None
+        with self._lock:
+            self._entries[key] = (value, expires_at, version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expired": self._expired,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0
+            }
+
+
+class EmbeddingCache(LRUCache):
+    """
+    LRU cache of query embeddings keyed by (model, normalized text).
+    Vectors are stored as float32 arrays (4 bytes per dimension instead of a
+    Python float object each). Embeddings don't depend on the indexed data,
+    so entries survive data-version bumps.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        super().__init__(max_entries=max_entries, ttl_seconds=None, versioned=False)
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        return f"{model}:{' '.join(text.lower().split())}"
+
+    def get_embedding(self, model: str, text: str) -> Optional[np.ndarray]:
+        return self.get(self.make_key(model, text))
+
+    def put_embedding(self, model: str, text: str, embedding) -> np.ndarray:
+        vector = np.array(embedding, dtype=np.float32)
+        vector.setflags(write=False)  # shared by every caller that hits this entry
+        self.set(self.make_key(model, text), vector)
+        return vector
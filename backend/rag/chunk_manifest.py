@@ -0,0 +1,72 @@
+"""
+Chunk Manifest
+Stable chunk IDs and a record of what an index generation holds, so a data
+edit only re-embeds the chunks it changed:
+  - chunk IDs are a hash of the chunk's source file, section and text, so an
+    unchanged chunk keeps its ID across rebuilds
+  - the manifest (manifest.json in the generation's directory) stores every
+    indexed chunk's metadata plus the settings the vectors depend on
+    (embedding model, chunk size, overlap); if those change, the IDs no
+    longer describe the vectors and a full rebuild is needed
+"""
+
+import os
+import json
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def chunk_id(source: str, section: str, text: str) -> str:
+    """ID of a chunk: first 24 hex chars of sha256(source, section, text)"""
+    digest = hashlib.sha256()
+    for part in (source, section, text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return f"c_{digest.hexdigest()[:24]}"
+
+
+def assign_chunk_ids(chunk_metadata: List[Dict[str, Any]]) -> List[str]:
+    """IDs for a chunk list; identical chunks of one section get a -2, -3... suffix"""
+    ids, seen = [], {}
+    for metadata in chunk_metadata:
+        base = chunk_id(metadata.get("source", ""), metadata.get("section", ""), metadata["text"])
+        seen[base] = seen.get(base, 0) + 1
+        ids.append(base if seen[base] == 1 else f"{base}-{seen[base]}")
+    return ids
+
+
+def build_manifest(settings: Dict[str, Any], ids: List[str], chunk_metadata: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "version": MANIFEST_VERSION,
+        "settings": settings,
+        "chunks": dict(zip(ids, chunk_metadata))
+    }
+
+
+def load_manifest(directory: str) -> Optional[Dict[str, Any]]:
+    """Manifest of a generation, or None if it has none (e.g. built before manifests)"""
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE), "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+
+def save_manifest(directory: str, manifest: Dict[str, Any]):
+    """Write the manifest (temp file + rename)"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, MANIFEST_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, separators=(",", ":"))
+    os.replace(path + ".tmp", path)
+
+
+def diff_chunks(manifest: Dict[str, Any], ids: List[str]) -> Tuple[List[str], List[str]]:
+    """(IDs to add, IDs to delete) to turn the manifest's chunk set into `ids`"""
+    indexed = manifest["chunks"]
+    wanted = set(ids)
+    return [i for i in ids if i not in indexed], [i for i in indexed if i not in wanted]
@@ -13,11 +13,20 @@ import os
 # Set to False for more accurate but slower classification + 2x API calls
 SKIP_INTENT_CLASSIFICATION = os.getenv("SKIP_INTENT_CLASSIFICATION", "true").lower() == "true"
 
+# When skipping the LLM call: "local" = trained TF-IDF classifier (falls back to
+# keywords if the artifact is missing), "keyword" = the plain keyword rules
+INTENT_CLASSIFIER = os.getenv("INTENT_CLASSIFIER", "local").lower()
+INTENT_MODEL_PATH = os.getenv("INTENT_MODEL_PATH", "backend/rag/artifacts/intent_model.npz")
+
 # Reduce chunk retrieval for faster response
 # Lower = fewer tokens sent to API = lower cost
 # Default: 4 (was 8-12, which sent 3x more context!)
 DEFAULT_TOP_K = int(os.getenv("DEFAULT_TOP_K", "4"))
 
+# Token budget for retrieved context in the prompt
+# Overlapping chunk text and repeated section headers are removed before packing
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1200"))
+
 # Chunk sizes for embeddings (smaller = faster + less tokens)
 CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "400"))  # Default: 400 (was 512)
 CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "80"))  # Default: 80 (was 120)
@@ -26,25 +35,145 @@ CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "80"))  # Default: 80 (was 120)
 # Repeated questions = 0 API calls (free!)
 ENABLE_RESPONSE_CACHE = os.getenv("ENABLE_RESPONSE_CACHE", "true").lower() == "true"
 CACHE_SIZE = int(os.getenv("CACHE_SIZE", "100"))  # Cache last 100 queries
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "86400"))  # Seconds before a cached answer expires (1 day)
+
+# Disk cache - answers persist across restarts and are shared by all uvicorn workers
+# SQLite in WAL mode; keyed by query + data version so data edits never serve stale answers
+ENABLE_DISK_CACHE = os.getenv("ENABLE_DISK_CACHE", "true").lower() == "true"
+DISK_CACHE_PATH = os.getenv("DISK_CACHE_PATH", "backend/cache/answers.sqlite3")
+DISK_CACHE_MAX_ENTRIES = int(os.getenv("DISK_CACHE_MAX_ENTRIES", "5000"))
+
+# Semantic cache - paraphrased questions reuse an earlier answer
+# Matches on cosine similarity of query embeddings (1.0 = identical meaning)
+ENABLE_SEMANTIC_CACHE = os.getenv("ENABLE_SEMANTIC_CACHE", "true").lower() == "true"
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+SEMANTIC_CACHE_SIZE = int(os.getenv("SEMANTIC_CACHE_SIZE", "256"))
+
+# Data files the knowledge base is built from
+DATA_DIRECTORY = os.getenv("DATA_DIRECTORY", "backend/data")
+
+# Fact engine - direct date/company/role lookups answered from the JSON data without any API call
+ENABLE_FACT_ENGINE = os.getenv("ENABLE_FACT_ENGINE", "true").lower() == "true"
+
+# Answer mode: "llm" (Gemini writes the answer) or "extractive" (best matching
+# sentences from the retrieved chunks, zero LLM calls). Extractive answers are
+# also the fallback when the Gemini quota is exhausted or generation times out.
+ANSWER_MODE = os.getenv("ANSWER_MODE", "llm").lower()
+EXTRACTIVE_MAX_SENTENCES = int(os.getenv("EXTRACTIVE_MAX_SENTENCES", "4"))
+
+# Embedding backend: "pinecone" (hosted llama-text-embed-v2, 1024-dim) or "local"
+# (sentence-transformers on CPU, no network; install requirements-local.txt).
+# Local vectors have a different dimension, so pair EMBEDDING_BACKEND=local
+# with a local VECTOR_BACKEND.
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "pinecone").lower()
+LOCAL_EMBEDDING_MODEL = os.getenv("LOCAL_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+LOCAL_EMBEDDING_RUNTIME = os.getenv("LOCAL_EMBEDDING_RUNTIME", "torch").lower()  # "torch" or "onnx"
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "2"))  # 0 = library default (all cores)
+
+# Passage embedding cache - chunk vectors persist on disk keyed by (model, input type, text hash),
+# so rebuilds and backend switches only embed chunks whose text was never embedded before
+ENABLE_PASSAGE_CACHE = os.getenv("ENABLE_PASSAGE_CACHE", "true").lower() == "true"
+PASSAGE_CACHE_DIR = os.getenv("PASSAGE_CACHE_DIR", "backend/cache/embeddings")
+
+# Ingestion pipeline (index builds): embed and upsert workers overlap, joined by a queue of
+# INGEST_QUEUE_SIZE embedded batches. Batches hold at most INGEST_BATCH_SIZE chunks (Pinecone
+# inference accepts 96 inputs) and ~INGEST_BATCH_MAX_BYTES of upsert payload (Pinecone's
+# request limit is 2MB). With a local embedding model, one embed worker already uses every core.
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "96"))
+INGEST_BATCH_MAX_BYTES = int(os.getenv("INGEST_BATCH_MAX_BYTES", "1500000"))
+INGEST_EMBED_WORKERS = int(os.getenv("INGEST_EMBED_WORKERS", "2"))
+INGEST_UPSERT_WORKERS = int(os.getenv("INGEST_UPSERT_WORKERS", "2"))
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "4"))
+
+# Pinecone calls made while indexing (inference, upserts, deletes, stats) retry transient
+# failures (429, 5xx, timeouts) up to RETRY_MAX_ATTEMPTS times with jittered exponential
+# backoff from RETRY_BASE_DELAY to RETRY_MAX_DELAY seconds, or the server's Retry-After
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "6"))
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "30"))
+
+# Vector backend: "pinecone" (hosted index), "hnsw" (in-process hnswlib graph) or
+# "numpy" (exact brute-force search over a memory-mapped matrix). The local ones
+# are persisted under VECTOR_INDEX_DIR and loaded at startup - no vector service needed
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "pinecone").lower()
+VECTOR_INDEX_DIR = os.getenv("VECTOR_INDEX_DIR", "backend/cache/vector_index")
+
+# Narrow vector search with chunk metadata: a company/project named in the query,
+# else the intent category (falls back to an unfiltered search when nothing matches).
+# The category filter needs an intent confidence of at least METADATA_FILTER_MIN_CONFIDENCE
+METADATA_FILTERS = os.getenv("METADATA_FILTERS", "true").lower() == "true"
+METADATA_FILTER_MIN_CONFIDENCE = float(os.getenv("METADATA_FILTER_MIN_CONFIDENCE", "0.6"))
+
+# Reranking + adaptive cutoff after retrieval: score = dense similarity blended with
+# query-term coverage; chunks below RERANK_MIN_RELATIVE_SCORE x the best score, or
+# after a drop larger than RERANK_MAX_SCORE_GAP x the best, are not sent to the LLM
+ENABLE_RERANKER = os.getenv("ENABLE_RERANKER", "true").lower() == "true"
+RERANK_LEXICAL_WEIGHT = float(os.getenv("RERANK_LEXICAL_WEIGHT", "0.3"))
+RERANK_MIN_RELATIVE_SCORE = float(os.getenv("RERANK_MIN_RELATIVE_SCORE", "0.75"))
+RERANK_MAX_SCORE_GAP = float(os.getenv("RERANK_MAX_SCORE_GAP", "0.15"))
+RERANK_MIN_CHUNKS = int(os.getenv("RERANK_MIN_CHUNKS", "1"))
+
+# Blue/green reindexing: each rebuild is a new index generation (local subdirectory /
+# Pinecone namespace) verified for up to INDEX_VERIFY_TIMEOUT seconds before readers
+# switch to it; old generations are deleted INDEX_GC_DELAY seconds after the switch.
+# Workers re-read the generation pointer every INDEX_POINTER_CHECK_INTERVAL seconds.
+INDEX_VERIFY_TIMEOUT = float(os.getenv("INDEX_VERIFY_TIMEOUT", "60"))
+INDEX_GC_DELAY = float(os.getenv("INDEX_GC_DELAY", "30"))
+INDEX_POINTER_CHECK_INTERVAL = float(os.getenv("INDEX_POINTER_CHECK_INTERVAL", "2"))
+
+# Hybrid retrieval: a BM25 index over the same chunks (saved under VECTOR_INDEX_DIR)
+# is fused with the dense results by reciprocal rank fusion; each side contributes
+# top_k * HYBRID_CANDIDATE_FACTOR candidates
+HYBRID_SEARCH = os.getenv("HYBRID_SEARCH", "true").lower() == "true"
+HYBRID_CANDIDATE_FACTOR = int(os.getenv("HYBRID_CANDIDATE_FACTOR", "2"))
+
+# Query embedding cache - repeated queries skip the Pinecone embed round trip
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024"))
 
 # Model selection (flash models are faster)
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-exp")
 
+# Shared Gemini client: max simultaneous calls per model and SDK transport
+# grpc keeps one HTTP/2 channel open for the process; "rest" is the fallback
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_TRANSPORT = os.getenv("LLM_TRANSPORT", "grpc")
+
 # === RENDER-SPECIFIC OPTIMIZATIONS ===
 
 # Timeout settings (Render has 30s timeout on free tier)
 REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "25"))  # 25 seconds max
 
+# Per-stage budgets (seconds), each capped by what is left of REQUEST_TIMEOUT
+# When generation runs out, the answer is built from the retrieved chunks instead
+EMBED_TIMEOUT = float(os.getenv("EMBED_TIMEOUT", "4"))
+VECTOR_QUERY_TIMEOUT = float(os.getenv("VECTOR_QUERY_TIMEOUT", "4"))
+INTENT_TIMEOUT = float(os.getenv("INTENT_TIMEOUT", "4"))
+GENERATION_TIMEOUT = float(os.getenv("GENERATION_TIMEOUT", "15"))
+
 # Connection pooling
 PINECONE_POOL_SIZE = int(os.getenv("PINECONE_POOL_SIZE", "5"))
 
+# Worker threads for the blocking RAG pipeline (Pinecone + Gemini calls)
+# Keeps the event loop free so /health and /documents stay responsive
+# while dozens of chats wait on the network
+RAG_MAX_WORKERS = int(os.getenv("RAG_MAX_WORKERS", "32"))
+
 print(f"""
 ⚡ RAG Performance & Cost Optimization:
-   - Intent Classification: {'Keyword-based (SAVES 1 API call/query!)' if SKIP_INTENT_CLASSIFICATION else 'LLM-based (2x API calls)'}
-   - Top K Chunks: {DEFAULT_TOP_K} (reduced from 8-12 = 60% less tokens!)
+   - Intent Classification: {f'{INTENT_CLASSIFIER.capitalize()} (SAVES 1 API call/query!)' if SKIP_INTENT_CLASSIFICATION else 'LLM-based (2x API calls)'}
+   - Top K Chunks: {DEFAULT_TOP_K} (reduced from 8-12 = 60% less tokens!){', adaptive cutoff' if ENABLE_RERANKER else ''}
    - Chunk Size: {CHUNK_SIZE} (overlap: {CHUNK_OVERLAP})
-   - Response Cache: {'Enabled (repeated queries = FREE!)' if ENABLE_RESPONSE_CACHE else 'Disabled'}
+   - Context Budget: {CONTEXT_TOKEN_BUDGET} tokens (deduplicated)
+   - Response Cache: {f'Enabled (LRU, {CACHE_SIZE} entries, TTL {RESPONSE_CACHE_TTL}s)' if ENABLE_RESPONSE_CACHE else 'Disabled'}
+   - Disk Cache: {DISK_CACHE_PATH if ENABLE_DISK_CACHE else 'Disabled'}
+   - Fact Engine: {'Enabled (zero-API lookups)' if ENABLE_FACT_ENGINE else 'Disabled'}
+   - Semantic Cache: {f'Enabled (similarity >= {SEMANTIC_CACHE_THRESHOLD})' if ENABLE_SEMANTIC_CACHE else 'Disabled'}
+   - Embeddings: {LOCAL_EMBEDDING_MODEL + ' (local)' if EMBEDDING_BACKEND == 'local' else 'Pinecone inference'}{', cached in ' + PASSAGE_CACHE_DIR if ENABLE_PASSAGE_CACHE else ''}
+   - Vector Backend: {VECTOR_BACKEND}{' + BM25 (RRF)' if HYBRID_SEARCH else ''}{' + metadata filters' if METADATA_FILTERS else ''}
+   - Answer Mode: {ANSWER_MODE}
    - Model: {GEMINI_MODEL}
+   - RAG Workers: {RAG_MAX_WORKERS} concurrent chats per process
    
 💰 Expected API Usage Reduction: ~70-80% vs old config
 """)
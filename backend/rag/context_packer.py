@@ -0,0 +1,110 @@
+"""
+Context Packer
+Turns retrieved chunks into a compact prompt context: strips the repeated
+"section:" headers, removes the text that overlapping chunks share, groups
+chunks under one header per section and fills a token budget in score order
+"""
+
+from typing import Any, Dict, List, Tuple
+
+# Shortest shared span treated as chunk overlap rather than coincidence
+MIN_OVERLAP_CHARS = 20
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English text)"""
+    return (len(text) + 3) // 4
+
+
+def strip_section_header(text: str, section: str) -> str:
+    """Remove the "section:" prefix(es) split_documents and extract_section_texts add"""
+    header = f"{section}:"
+    text = text.strip()
+    while text.startswith(header):
+        text = text[len(header):].lstrip()
+    return text
+
+
+def _overlap(left: str, right: str) -> int:
+    """Length of the longest suffix of left that is also a prefix of right"""
+    for size in range(min(len(left), len(right)), MIN_OVERLAP_CHARS - 1, -1):
+        if left.endswith(right[:size]):
+            return size
+    return 0
+
+
+def _dedupe(body: str, kept: List[str]) -> str:
+    """Drop the parts of body already present in kept chunks of the same section"""
+    for previous in kept:
+        if body in previous:
+            return ""
+        # The splitter repeats the tail of one chunk at the head of the next
+        # (and retrieval may return them in either order)
+        head = _overlap(previous, body)
+        if head:
+            body = body[head:].lstrip()
+        tail = _overlap(body, previous)
+        if tail:
+            body = body[:-tail].rstrip()
+    return body
+
+
+def _truncate_to_budget(text: str, max_tokens: int) -> str:
+    """Cut text to max_tokens, preferring a line or sentence boundary"""
+    if max_tokens <= 0:
+        return ""
+    limit = max_tokens * 4
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    boundary = max(cut.rfind("\n"), cut.rfind(". "))
+    if boundary > limit // 2:
+        cut = cut[:boundary + 1]
+    return cut.rstrip()
+
+
+def pack_context(chunks: List[Any], token_budget: int) -> Tuple[str, Dict[str, int]]:
+    """
+    Pack retrieved chunks (highest score first) into prompt context.
+    Returns (context_text, stats).
+    """
+    raw_tokens = sum(estimate_tokens(chunk.page_content) for chunk in chunks)
+    sections: Dict[str, List[str]] = {}  # insertion order = best score per section
+    used_tokens = 0
+    dropped = 0
+
+    for chunk in chunks:
+        if used_tokens >= token_budget:
+            dropped += 1
+            continue
+        section = chunk.metadata.get('section', 'unknown')
+        kept = sections.setdefault(section, [])
+        body = _dedupe(strip_section_header(chunk.page_content, section), kept)
+        if not body:
+            dropped += 1
+            continue
+
+        # Budget the header the first time a section appears
+        cost = estimate_tokens(body) + (0 if kept else estimate_tokens(f"{section}:\n"))
+        remaining = token_budget - used_tokens
+        if cost > remaining:
+            body = _truncate_to_budget(body, remaining - (cost - estimate_tokens(body)))
+            if not body:
+                dropped += 1
+                continue
+            cost = remaining
+        kept.append(body)
+        used_tokens += cost
+
+    blocks = []
+    for i, (section, bodies) in enumerate(((s, b) for s, b in sections.items() if b), 1):
+        blocks.append(f"[{i}] {section}:\n" + "\n".join(bodies))
+    context_text = "\n\n".join(blocks)
+
+    stats = {
+        "chunks": len(chunks),
+        "chunks_dropped": dropped,
+        "raw_tokens": raw_tokens,
+        "packed_tokens": estimate_tokens(context_text)
+    }
+    return context_text, stats
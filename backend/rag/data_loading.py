@@ -7,8 +7,8 @@ def load_json_file(file_path):
     with open(file_path, "r") as f:
         return json.load(f)
 
-def load_all_json_files(directory):
-    """Load all JSON files from a given directory."""
+def load_named_json_files(directory):
+    """Load all JSON files from a given directory as (filename, object) pairs, sorted by name."""
     json_objects = []
     print(f"\n🔍 Scanning directory: {os.path.abspath(directory)}")
     
@@ -16,18 +16,22 @@ def load_all_json_files(directory):
         print(f"❌ Directory does not exist: {directory}")
         return json_objects
 
-    for filename in os.listdir(directory):
+    for filename in sorted(os.listdir(directory)):
         if filename.endswith(".json"):
             file_path = os.path.join(directory, filename)
             print(f"📂 Found JSON file: {file_path}")
             try:
                 json_obj = load_json_file(file_path)
-                json_objects.append(json_obj)
+                json_objects.append((filename, json_obj))
                 print(f"✅ Successfully loaded {filename}")
             except Exception as e:
                 print(f"❌ Error loading {filename}: {str(e)}")
     return json_objects
 
+def load_all_json_files(directory):
+    """Load all JSON files from a given directory."""
+    return [json_obj for _, json_obj in load_named_json_files(directory)]
+
 # Test the loader
 if __name__ == "__main__":
     directory = "../data"  # Create this directory and add some JSON files
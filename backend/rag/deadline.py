@@ -0,0 +1,106 @@
+"""
+Request Deadlines
+Propagates REQUEST_TIMEOUT through the RAG pipeline: each stage (embedding,
+vector query, generation) gets its own budget, capped by whatever is left
+of the overall request deadline
+"""
+
+import time
+import queue
+import threading
+from concurrent.futures import Executor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Iterator
+
+_END = object()
+
+
+class DeadlineExceeded(TimeoutError):
+    """A pipeline stage ran out of time"""
+
+    def __init__(self, stage: str, budget: float):
+        super().__init__(f"{stage} exceeded its {budget:.1f}s budget")
+        self.stage = stage
+        self.budget = budget
+
+
+class Deadline:
+    """
+    Deadline for one request.
+    run() executes a blocking stage on the given executor and stops waiting
+    when the stage budget or the request deadline expires, whichever is first.
+    stream() does the same for an iterator, bounding the wait for each item.
+    The abandoned call finishes in the background; its result is discarded.
+    """
+
+    def __init__(self, total_seconds: float, executor: Executor):
+        self.total_seconds = total_seconds
+        self.expires_at = time.monotonic() + total_seconds
+        self._executor = executor
+        self.timings: Dict[str, float] = {}
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def run(self, stage: str, budget: float, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        timeout = min(budget, self.remaining())
+        if timeout <= 0:
+            raise DeadlineExceeded(stage, 0.0)
+
+        start = time.monotonic()
+        future = self._executor.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            print(f"⏰ {stage} timed out after {timeout:.1f}s")
+            raise DeadlineExceeded(stage, timeout)
+        finally:
+            self.timings[stage] = round(time.monotonic() - start, 3)
+
+    def stream(self, stage: str, budget: float, fn: Callable[..., Iterator[Any]], *args, **kwargs) -> Iterator[Any]:
+        """
+        Yield the items of fn(*args, **kwargs), iterated on the executor.
+        Waiting for the next item stops when the stage budget or the request
+        deadline expires, so a stream that hangs mid-way is still bounded.
+        """
+        timeout = min(budget, self.remaining())
+        if timeout <= 0:
+            raise DeadlineExceeded(stage, 0.0)
+
+        start = time.monotonic()
+        expires_at = start + timeout
+        items: "queue.Queue" = queue.Queue()
+        stop = threading.Event()
+
+        def pump():
+            # The iterator is created, advanced and closed on this thread only
+            iterator = fn(*args, **kwargs)
+            try:
+                for item in iterator:
+                    if stop.is_set():
+                        break
+                    items.put((item, None))
+                items.put((_END, None))
+            except Exception as e:
+                items.put((_END, e))
+            finally:
+                close = getattr(iterator, "close", None)
+                if close:
+                    close()
+
+        self._executor.submit(pump)
+        try:
+            while True:
+                try:
+                    item, error = items.get(timeout=max(0.0, expires_at - time.monotonic()))
+                except queue.Empty:
+                    print(f"⏰ {stage} timed out after {timeout:.1f}s")
+                    raise DeadlineExceeded(stage, timeout)
+                if error is not None:
+                    raise error
+                if item is _END:
+                    return
+                yield item
+        finally:
+            stop.set()
+            self.timings[stage] = round(time.monotonic() - start, 3)
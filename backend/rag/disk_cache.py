@@ -0,0 +1,123 @@
+"""
+Persistent Answer Cache
+SQLite (WAL mode) file shared by every uvicorn worker on the host, so
+answers survive restarts and free-tier sleeps instead of being paid for
+again by the first visitors after a cold start
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, Optional
+
+
+class DiskAnswerCache:
+    """
+    Answers keyed by (query hash, data version).
+    Each thread gets its own connection; WAL mode lets readers in all
+    workers proceed while one writer commits.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 86400, max_entries: int = 5000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS answers (
+                    query_hash TEXT NOT NULL,
+                    data_version TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (query_hash, data_version)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_answers_created ON answers (created_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, counter: str):
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, query_hash: str, data_version: str) -> Optional[Dict[str, Any]]:
+        """Return the stored answer for this query and data version, if fresh"""
+        try:
+            row = self._connect().execute(
+                "SELECT response FROM answers WHERE query_hash = ? AND data_version = ? AND created_at > ?",
+                (query_hash, data_version, time.time() - self.ttl_seconds)
+            ).fetchone()
+        except sqlite3.Error as e:
+            # The disk cache is an optimization - never fail a chat because of it
+            print(f"⚠️ Disk cache read failed: {e}")
+            self._count("_errors")
+            return None
+
+        if row is None:
+            self._count("_misses")
+            return None
+        self._count("_hits")
+        return json.loads(row[0])
+
+    def set(self, query_hash: str, data_version: str, response: Dict[str, Any]):
+        """Store an answer for this query and data version"""
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO answers (query_hash, data_version, response, created_at) VALUES (?, ?, ?, ?)",
+                    (query_hash, data_version, json.dumps(response), time.time())
+                )
+        except sqlite3.Error as e:
+            print(f"⚠️ Disk cache write failed: {e}")
+            self._count("_errors")
+
+    def prune(self, data_version: str):
+        """Delete answers from other data versions, expired rows and anything beyond max_entries"""
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "DELETE FROM answers WHERE data_version != ? OR created_at <= ?",
+                    (data_version, time.time() - self.ttl_seconds)
+                )
+                conn.execute(
+                    "DELETE FROM answers WHERE rowid IN "
+                    "(SELECT rowid FROM answers ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+        except sqlite3.Error as e:
+            print(f"⚠️ Disk cache prune failed: {e}")
+            self._count("_errors")
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring (hits/misses are per process)"""
+        try:
+            size = self._connect().execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+        except sqlite3.Error:
+            size = None
+        with self._stats_lock:
+            lookups = self._hits + self._misses
+            return {
+                "path": self.path,
+                "size": size,
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "errors": self._errors,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0
+            }
@@ -0,0 +1,115 @@
+"""
+Embedding Backends
+Turns chunk and query text into vectors:
+  - PineconeEmbedder: Pinecone inference (llama-text-embed-v2, 1024-dim,
+    one network round trip per call)
+  - LocalEmbedder: a sentence-transformers model on CPU (all-MiniLM-L6-v2,
+    384-dim by default), optionally through ONNX Runtime; no network access
+    once the model files are cached
+Both return float32 arrays, one row per input text.
+"""
+
+from typing import List, Sequence
+
+import numpy as np
+
+from .resilience import AdaptiveBatchSize, call_in_batches
+
+
+class Embedder:
+    """Interface every embedding backend implements"""
+
+    model_name = "base"
+    dimension = 0
+
+    def embed_passages(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed document chunks (n_texts x dimension, float32)"""
+        raise NotImplementedError
+
+    def embed_query(self, text: str) -> np.ndarray:
+        """Embed one search query (dimension,)"""
+        raise NotImplementedError
+
+    def warm_up(self):
+        """Load weights / open connections before the first request"""
+
+
+class PineconeEmbedder(Embedder):
+    """Pinecone's hosted inference API"""
+
+    batch_size = 96  # Pinecone API batch limit
+
+    def __init__(self, client, model_name: str, dimension: int = 1024):
+        self._client = client
+        self.model_name = model_name
+        self.dimension = dimension
+        # Shrinks on 413/429 and recovers; shared by concurrent ingestion workers
+        self._passage_batch = AdaptiveBatchSize(self.batch_size)
+
+    def _call(self, texts: List[str], input_type: str) -> List[List[float]]:
+        response = self._client.inference.embed(
+            model=self.model_name,
+            inputs=texts,
+            parameters={"input_type": input_type}
+        )
+        return [item['values'] for item in response]
+
+    def _embed(self, texts: List[str], input_type: str) -> np.ndarray:
+        batches = call_in_batches(
+            lambda batch: self._call(batch, input_type), texts, self._passage_batch, "Pinecone embed"
+        )
+        return np.asarray([row for rows in batches for row in rows], dtype=np.float32)
+
+    def embed_passages(self, texts: Sequence[str]) -> np.ndarray:
+        return self._embed(list(texts), "passage")
+
+    def embed_query(self, text: str) -> np.ndarray:
+        # Not retried: a query has a latency budget and the generator handles failures
+        return np.asarray(self._call([text], "query")[0], dtype=np.float32)
+
+
+class LocalEmbedder(Embedder):
+    """
+    sentence-transformers model running in this process.
+    Texts are encoded in batches of `batch_size`; `threads` caps the intra-op
+    CPU threads so embedding doesn't starve the uvicorn workers.
+    """
+
+    def __init__(self, model_name: str, batch_size: int = 32, threads: int = 0, runtime: str = "torch"):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "EMBEDDING_BACKEND=local needs sentence-transformers (pip install -r requirements-local.txt)"
+            ) from e
+
+        if threads > 0:
+            import torch
+            torch.set_num_threads(threads)
+
+        kwargs = {"backend": "onnx"} if runtime == "onnx" else {}
+        self._model = SentenceTransformer(model_name, device="cpu", **kwargs)
+        self.model_name = model_name
+        self.dimension = self._model.get_sentence_embedding_dimension()
+        self.batch_size = batch_size
+        print(f"🧮 Local embedding model {model_name} ({runtime}, dim {self.dimension}, "
+              f"{threads or 'default'} threads)")
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return self._model.encode(
+            texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        ).astype(np.float32, copy=False)
+
+    def embed_passages(self, texts: Sequence[str]) -> np.ndarray:
+        return self._encode(list(texts))
+
+    def embed_query(self, text: str) -> np.ndarray:
+        return self._encode([text])[0]
+
+    def warm_up(self):
+        # The first encode pays for lazy init and kernel selection
+        self._encode(["warm up"])
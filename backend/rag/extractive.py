@@ -0,0 +1,145 @@
+"""
+Extractive Answerer
+Builds an answer from the retrieved chunks themselves: every sentence is
+scored against the query with BM25 (vectorized in NumPy) and the best ones
+are returned under their section labels. No LLM call, so it works when the
+Gemini quota is exhausted and as a zero-cost answer mode.
+"""
+
+import re
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .context_packer import strip_section_header
+
+# BM25 parameters
+BM25_K1 = 1.2
+# Lower than the usual 0.75: short "Field: value" lines would otherwise outrank real sentences
+BM25_B = 0.3
+
+# Weight of the chunk's retrieval score relative to the sentence's lexical score
+RETRIEVAL_PRIOR = 0.5
+
+MIN_SENTENCE_CHARS = 25
+
+# Spans shorter than this are extended with the next sentence of the same chunk
+MIN_SPAN_CHARS = 80
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])|\n+")
+# Nested JSON values reach the chunks as Python reprs: {'Project_Name': 'X', 'Technologies': ['A', 'B']}
+_REPR_KEY = re.compile(r"['\"]([A-Za-z][\w ]*)['\"]:\s*['\"]?")
+_REPR_BRACKETS = re.compile(r"[{}\[\]]")
+_REPR_ITEM_SEPARATOR = re.compile(r"['\"],\s*['\"]")
+_FIELD_LABEL = re.compile(r"^[A-Z][\w ]{0,40}:\s")
+_STOPWORDS = frozenset("""
+a about after all also an and any are as at be been before by can could did do does for from had has
+have he her him his how i in into is it its kushagra kushagra's me my of on or our she so tell than
+that the their them then there these they this to was we were what when where which who whom why
+will with would you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased content terms of a text"""
+    return [token for token in _TOKEN.findall(text.lower()) if token not in _STOPWORDS]
+
+
+def _sentence_terms(sentence: str) -> List[str]:
+    """Terms of a sentence, ignoring a "Field Name: " label ("Project Name:" matches every project)"""
+    return tokenize(_FIELD_LABEL.sub("", sentence))
+
+
+def _unrepr(text: str) -> str:
+    """Turn dict/list reprs into "Field: value" lines"""
+    text = _REPR_KEY.sub(lambda m: "\n" + m.group(1).replace("_", " ") + ": ", text)
+    text = _REPR_ITEM_SEPARATOR.sub(", ", text)
+    return _REPR_BRACKETS.sub("\n", text)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split chunk text into sentences (and bullet/field lines)"""
+    sentences = []
+    for piece in _SENTENCE_BOUNDARY.split(_unrepr(text)):
+        piece = piece.strip(" -•*,'\"\t")
+        if len(piece) >= MIN_SENTENCE_CHARS:
+            sentences.append(piece)
+    return sentences
+
+
+def _bm25_scores(query_terms: List[str], sentence_terms: List[List[str]]) -> np.ndarray:
+    """BM25 score of every sentence against the query terms"""
+    vocab = {term: i for i, term in enumerate(dict.fromkeys(query_terms))}
+    tf = np.zeros((len(sentence_terms), len(vocab)), dtype=np.float32)
+    lengths = np.empty(len(sentence_terms), dtype=np.float32)
+    for row, terms in enumerate(sentence_terms):
+        lengths[row] = len(terms)
+        for term in terms:
+            col = vocab.get(term)
+            if col is not None:
+                tf[row, col] += 1.0
+
+    n = len(sentence_terms)
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((n - df + 0.5) / (df + 0.5))
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths / max(float(lengths.mean()), 1.0))
+    saturated = tf * (BM25_K1 + 1) / (tf + norm[:, None])
+    return saturated @ idf.astype(np.float32)
+
+
+def extract_answer(query: str, chunks: List[Any], max_sentences: int = 4) -> Tuple[str, Dict[str, Any]]:
+    """
+    Best-matching sentences from the retrieved chunks, grouped by section.
+    Returns (answer_markdown, stats); the answer is empty when nothing matches.
+    """
+    sentences: List[str] = []
+    spans: List[str] = []
+    sections: List[str] = []
+    priors: List[float] = []
+    seen = set()
+    for chunk in chunks:
+        section = chunk.metadata.get('section', 'unknown')
+        chunk_sentences = split_sentences(strip_section_header(chunk.page_content, section))
+        for i, sentence in enumerate(chunk_sentences):
+            key = sentence.lower()
+            if key in seen:  # overlapping chunks repeat sentences
+                continue
+            seen.add(key)
+            span = sentence
+            for following in chunk_sentences[i + 1:]:
+                if len(span) >= MIN_SPAN_CHARS:
+                    break
+                span = f"{span} {following}" if span.endswith((".", ":")) else f"{span}; {following}"
+            sentences.append(sentence)
+            spans.append(span)
+            sections.append(section)
+            priors.append(float(chunk.metadata.get('score', 0.0)))
+
+    query_terms = tokenize(query)
+    stats = {"sentences": len(sentences), "selected": 0}
+    if not sentences or not query_terms:
+        return "", stats
+
+    lexical = _bm25_scores(query_terms, [_sentence_terms(sentence) for sentence in sentences])
+    scores = lexical + RETRIEVAL_PRIOR * np.asarray(priors, dtype=np.float32)
+    # A sentence must share at least one term with the query to be picked
+    scores[lexical <= 0] = -np.inf
+
+    k = min(max_sentences, len(sentences))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = [int(i) for i in top[np.argsort(-scores[top])] if np.isfinite(scores[i])]
+    stats["selected"] = len(top)
+    if not top:
+        return "", stats
+
+    # Group under section labels, best section first
+    grouped: Dict[str, List[str]] = {}
+    shown = set()
+    for i in top:
+        if spans[i] in shown or any(spans[i] in other for other in shown):
+            continue
+        shown.add(spans[i])
+        grouped.setdefault(sections[i], []).append(spans[i])
+    blocks = [f"**{section}**\n" + "\n".join(f"- {s}" for s in picked) for section, picked in grouped.items()]
+    return "\n\n".join(blocks), stats
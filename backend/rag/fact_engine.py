@@ -0,0 +1,379 @@
+"""
+Structured Fact Engine
+Answers direct lookups ("When did Kushagra work at Deutsche Telekom?",
+"What is his current role?") straight from the JSON data with templates:
+no embedding, no vector search, no LLM call. Anything it is not confident
+about falls through to the normal RAG pipeline.
+"""
+
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+from .config import DATA_DIRECTORY
+from .data_loading import load_all_json_files
+
+# Questions that need reasoning or a narrative answer - leave them to RAG
+_OPEN_ENDED = re.compile(
+    r"\b(before|after|prior|previous(ly)?|compare|versus|vs|why|how did|tell me|describe|explain|"
+    r"achievement|impact|responsibilit\w*|what did|working on)\b"
+)
+_CURRENT = re.compile(
+    r"\bcurrent(ly)?\b.*\b(role|job|position|title|company|employer)\b"
+    r"|\bwhere (does|is) (he|kushagra) (currently )?work(ing)?\b"
+    r"|\bwhat does (he|kushagra) do for (a )?(living|work)\b"
+)
+_DATES = re.compile(r"\b(when|how long|since when|duration|dates?|period|which years?|timeline)\b")
+_ROLE = re.compile(r"\b(role|title|position|designation)\b")
+_LOCATION = re.compile(r"\b(where|location|located|city|based)\b")
+_TECHNOLOGIES = re.compile(r"\b(technologies|tech stack|technology stack|built with)\b")
+_EDUCATION = re.compile(r"\b(degree|university|college|graduat\w*|studied|education|institution)\b")
+_COURSEWORK = re.compile(r"\b(coursework|courses|subjects)\b")
+
+# Personal questions -> keys of others.json (first-person sentences)
+_PERSONAL_RULES = [
+    (re.compile(r"\b(age|how old|birthday|birth date|date of birth)\b"), ["age", "birthdate"]),
+    (re.compile(r"\b(where (is|was) (he|kushagra) (from|born)|hometown|where does (he|kushagra) live|lives?|reside\w*)\b"),
+     ["place_of_birth", "current_residency"]),
+    (re.compile(r"\blanguages? does (he|kushagra) speak\b|\bspoken languages\b"), ["languages_known"]),
+    (re.compile(r"\b(hobbies|hobby|free time|sports)\b"), ["sports_hobbies", "other_hobbies"]),
+]
+_IRREGULAR_VERBS = {"am": "is", "was": "was", "can": "can", "have": "has", "will": "will"}
+
+
+def _normalize(text: str) -> str:
+    return " ".join(re.sub(r"[^a-z0-9+#]+", " ", text.lower()).split())
+
+
+# Trailing words of a company name visitors usually leave out ("Deutsche Telekom Digital Labs")
+_COMPANY_SUFFIXES = {"digital", "labs", "ai", "technologies", "solutions", "inc", "ltd", "pvt", "private", "limited"}
+
+
+def _aliases(*names: str, company: bool = False) -> List[str]:
+    """
+    Spellings a visitor is likely to use for an entity name: the full name,
+    its part before a colon or " with ", curated short names (passed in as
+    extra names), CamelCase brand tokens ("SalesAssist", "GrocExpress") and,
+    for companies, the name without corporate suffixes. Generic fragments
+    such as "real time" or "llm powered" are never aliases.
+    """
+    aliases = set()
+    for name in names:
+        if not name:
+            continue
+        for variant in (name, name.split(":")[0], name.split(" with ")[0]):
+            norm = _normalize(variant)
+            if len(norm) < 3:
+                continue
+            aliases.update({norm, norm.replace(" ", "")})
+            if norm.endswith(" ai") and " " not in norm[:-3]:
+                aliases.add(norm[:-3])  # "salesassist ai" -> "salesassist"
+        aliases.update(
+            token.lower() for token in re.findall(r"[A-Za-z0-9]+", name)
+            if len(token) >= 5 and re.search(r"[a-z][A-Z]", token)
+        )
+        if company:
+            words = _normalize(name).split()
+            while len(words) > 1 and words[-1] in _COMPANY_SUFFIXES:
+                words.pop()
+            aliases.add(" ".join(words))
+            if words and words[-1].endswith("ai") and len(words[-1]) > 6:
+                aliases.add(words[-1][:-2])  # "shorthillsai" -> "shorthills"
+    return sorted(aliases, key=len, reverse=True)
+
+
+def _third_person(sentence: str, subject: str) -> str:
+    """ "I am 21 years old." -> "Kushagra is 21 years old." """
+    def verb(match):
+        adverb, word = match.group(1) or "", match.group(2)
+        word = _IRREGULAR_VERBS.get(word, word if word.endswith("s") else word + "s")
+        return f"{subject} {adverb}{word}"
+    sentence = re.sub(r"\bI ((?:currently|also|really) )?(\w+)", verb, sentence)
+    sentence = re.sub(r"\b[Mm]y\b", "his", sentence)
+    return sentence[:1].upper() + sentence[1:]
+
+
+def _article(word: str) -> str:
+    return "an" if word and word[0].lower() in "aeiou" else "a"
+
+
+def _join(items: List[str]) -> str:
+    items = [str(item) for item in items if item]
+    if len(items) <= 1:
+        return "".join(items)
+    return ", ".join(items[:-1]) + f" and {items[-1]}"
+
+
+class FactIndex:
+    """
+    Entity and attribute lookup tables built from the portfolio JSON files.
+    Entities are companies (Work_Experience), projects (Projects and
+    Key_Projects) and education entries; personal facts come from others.json.
+    """
+
+    def __init__(self, json_objects: List[Dict[str, Any]]):
+        self.companies: List[Dict[str, Any]] = []
+        self.projects: List[Dict[str, Any]] = []
+        self.education: List[Dict[str, Any]] = []
+        self.personal: Dict[str, str] = {}
+        self._alias_index: Dict[str, tuple] = {}
+        self._ambiguous: set = set()
+
+        for json_object in json_objects:
+            for experience in json_object.get("Work_Experience", []) or []:
+                self._add_company(experience)
+            projects = json_object.get("Projects")
+            if isinstance(projects, dict):
+                for items in projects.values():
+                    for project in items:
+                        self._add_project(
+                            project.get("Project_Name"), project.get("Short_Name"),
+                            project.get("Technologies", []), project.get("Description")
+                        )
+            for entry in json_object.get("Education", []) or []:
+                if isinstance(entry, dict) and entry.get("Institution"):
+                    self.education.append(entry)
+            for rule_keys in (keys for _, keys in _PERSONAL_RULES):
+                for key in rule_keys:
+                    if isinstance(json_object.get(key), str):
+                        self.personal[key] = json_object[key]
+
+        # An alias must point at one entity, and a technology name ("opencv", "datadog")
+        # is a question about the technology, not about the project named after it
+        technologies = {
+            _normalize(tech) for entity in self.companies + self.projects for tech in entity["technologies"]
+        }
+        for alias in self._ambiguous | (technologies & set(self._alias_index)):
+            self._alias_index.pop(alias, None)
+
+        # Longest alias first so "deutsche telekom digital labs" wins over "deutsche telekom"
+        self._aliases = sorted(self._alias_index, key=len, reverse=True)
+
+    def _add_company(self, experience: Dict[str, Any]):
+        company = {
+            "name": experience.get("Company"),
+            "role": experience.get("Title"),
+            "location": experience.get("Location"),
+            "start": experience.get("Start_Date"),
+            "end": experience.get("End_Date"),
+            "duration": experience.get("Duration"),
+            "technologies": experience.get("Technologies_Used", []),
+            "current": experience.get("End_Date") == "Present"
+        }
+        self.companies.append(company)
+        for alias in _aliases(company["name"], company=True):
+            self._register(alias, "company", company)
+        for project in experience.get("Key_Projects", []) or []:
+            self._add_project(
+                project.get("Project"), None, project.get("Technologies", []),
+                project.get("Description"), company=company["name"]
+            )
+
+    def _add_project(self, name, short_name, technologies, description, company=None):
+        if not name:
+            return
+        project = {
+            "name": name,
+            "technologies": technologies or [],
+            "description": description,
+            "company": company
+        }
+        self.projects.append(project)
+        for alias in _aliases(name, short_name):
+            self._register(alias, "project", project)
+
+    def _register(self, alias: str, kind: str, entity: Dict[str, Any]):
+        existing = self._alias_index.setdefault(alias, (kind, entity))
+        if existing[1] is not entity:
+            self._ambiguous.add(alias)
+
+    def _scan(self, normalized_query: str, kinds=("company", "project")):
+        """(entities of the given kinds mentioned in the query, the query without their names)"""
+        padded = f" {normalized_query} "
+        found, seen = [], set()
+        for alias in self._aliases:
+            if f" {alias} " in padded:
+                kind, entity = self._alias_index[alias]
+                if kind not in kinds:
+                    continue
+                padded = padded.replace(f" {alias} ", " ")
+                if id(entity) not in seen:
+                    seen.add(id(entity))
+                    found.append((kind, entity))
+        return found, padded.strip()
+
+    def find_entities(self, normalized_query: str) -> List[tuple]:
+        """Entities mentioned in the query, without overlapping matches"""
+        return self._scan(normalized_query)[0]
+
+    def entity_names(self, query: str) -> frozenset:
+        """Names of the companies and projects a query mentions"""
+        return frozenset(entity["name"] for _, entity in self.find_entities(_normalize(query)))
+
+    def strip_project_names(self, query: str) -> str:
+        """
+        The query, normalized, with project names removed, so words inside a
+        name ("HR Resume Assistant") are not read as words of the question
+        """
+        return self._scan(_normalize(query), kinds=("project",))[1]
+
+    def entity_filter(self, query: str) -> Optional[Dict[str, List[str]]]:
+        """
+        Chunk metadata filter for the companies or projects a query names,
+        e.g. {"company": ["ShorthillsAI"]}; None when it names none or mixes kinds.
+        """
+        entities = self.find_entities(_normalize(query))
+        kinds = {kind for kind, _ in entities}
+        if len(kinds) != 1:
+            return None
+        return {kinds.pop(): [entity["name"] for _, entity in entities]}
+
+    def answer(self, query: str) -> Optional[Dict[str, Any]]:
+        """
+        Answer a direct lookup question, or return None when not confident.
+        Returns {"answer", "category", "fact"} on success.
+        """
+        q = _normalize(query)
+        if not q or _OPEN_ENDED.search(q):
+            return None
+
+        entities = self.find_entities(q)
+        companies = [e for kind, e in entities if kind == "company"]
+        projects = [e for kind, e in entities if kind == "project"]
+        # One entity per question keeps the template answer unambiguous
+        if len(entities) > 1:
+            return None
+
+        if _CURRENT.search(q) and not projects:
+            current = [c for c in self.companies if c["current"]]
+            if len(current) == 1 and (not companies or companies[0] is current[0]):
+                c = current[0]
+                return self._result(
+                    f"Kushagra is currently working as {_article(c['role'])} {c['role']} at {c['name']} "
+                    f"(since {c['start']}, {c['location']}).",
+                    "work_experience", "current_role"
+                )
+            return None
+
+        if companies:
+            c = companies[0]
+            if _DATES.search(q):
+                if c["current"]:
+                    text = f"Kushagra has been working at {c['name']} as {_article(c['role'])} {c['role']} since {c['start']}"
+                else:
+                    text = f"Kushagra worked at {c['name']} as {_article(c['role'])} {c['role']} from {c['start']} to {c['end']}"
+                text += f" ({c['duration']})." if c.get("duration") else "."
+                return self._result(text, "work_experience", "dates")
+            if _ROLE.search(q):
+                tense = "is" if c["current"] else "was"
+                return self._result(
+                    f"Kushagra's role at {c['name']} {tense} {c['role']} ({c['start']} to {c['end']}).",
+                    "work_experience", "role"
+                )
+            if _TECHNOLOGIES.search(q) and c["technologies"]:
+                return self._result(
+                    f"At {c['name']}, Kushagra worked with {_join(c['technologies'])}.",
+                    "work_experience", "technologies"
+                )
+            if _LOCATION.search(q) and c.get("location"):
+                return self._result(
+                    f"Kushagra's role at {c['name']} was based in {c['location']}.",
+                    "work_experience", "location"
+                )
+            return None
+
+        if projects:
+            p = projects[0]
+            if _TECHNOLOGIES.search(q) and p["technologies"]:
+                where = f" (built at {p['company']})" if p.get("company") else ""
+                return self._result(
+                    f"{p['name']}{where} uses {_join(p['technologies'])}.",
+                    "projects", "technologies"
+                )
+            return None
+
+        if self.education and (_EDUCATION.search(q) or _COURSEWORK.search(q)):
+            if _DATES.search(q):
+                # The degree template has no dates; only answer when every entry has its years
+                if not all(e.get("Year") for e in self.education):
+                    return None
+                return self._result(
+                    "Kushagra studied " + _join(
+                        f"{e.get('Degree', '')} {e.get('Field', '')}".strip() + f" at {e['Institution']} ({e['Year']})"
+                        for e in self.education
+                    ) + ".",
+                    "education", "dates"
+                )
+            if _COURSEWORK.search(q):
+                e = self.education[0]
+                return self._result(
+                    f"Kushagra's coursework at {e['Institution']} included {_join(e.get('Coursework', []))}.",
+                    "education", "coursework"
+                )
+            lines = [
+                f"{e.get('Degree', '')} {e.get('Field', '')}".strip()
+                + f" from {e['Institution']}" + (f" ({e['Status']})" if e.get("Status") else "")
+                for e in self.education
+            ]
+            return self._result(f"Kushagra holds a {_join(lines)}.", "education", "degree")
+
+        for pattern, keys in _PERSONAL_RULES:
+            if pattern.search(q):
+                sentences = [self.personal[key] for key in keys if key in self.personal]
+                if not sentences:
+                    return None
+                text = " ".join(
+                    _third_person(sentence, "Kushagra" if i == 0 else "he")
+                    for i, sentence in enumerate(sentences)
+                )
+                return self._result(text, "personal", keys[0])
+
+        return None
+
+    @staticmethod
+    def _result(answer: str, category: str, fact: str) -> Dict[str, Any]:
+        return {"answer": answer, "category": category, "fact": fact}
+
+
+_fact_index: Optional[FactIndex] = None
+_fact_index_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def rebuild_fact_index(json_objects: List[Dict[str, Any]]) -> FactIndex:
+    """Build the fact index from freshly loaded data (called when embeddings are created)"""
+    global _fact_index
+    index = FactIndex(json_objects)
+    with _fact_index_lock:
+        _fact_index = index
+    print(f"📇 Fact index: {len(index.companies)} companies, {len(index.projects)} projects, "
+          f"{len(index.education)} education entries")
+    return index
+
+
+def get_fact_index() -> FactIndex:
+    """Current fact index, built from DATA_DIRECTORY on first use"""
+    global _fact_index
+    if _fact_index is None:
+        with _fact_index_lock:
+            if _fact_index is None:
+                _fact_index = FactIndex(load_all_json_files(DATA_DIRECTORY))
+    return _fact_index
+
+
+def answer_fact_query(query: str) -> Optional[Dict[str, Any]]:
+    """Template answer for a direct lookup question, or None to fall back to RAG"""
+    fact = get_fact_index().answer(query)
+    with _fact_index_lock:
+        _stats["hits" if fact is not None else "misses"] += 1
+    return fact
+
+
+def get_fact_stats() -> Dict[str, Any]:
+    """Hit/miss counters and index size"""
+    index = _fact_index
+    return {
+        **_stats,
+        "companies": len(index.companies) if index else 0,
+        "projects": len(index.projects) if index else 0
+    }
@@ -1,12 +1,35 @@
-from langchain_google_genai import GoogleGenerativeAI
 import os
 import json
-import google.generativeai as genai
 from dotenv import load_dotenv
-from .pinecone_store import retrieve_from_pinecone
-from typing import Dict, Optional, Any
+from .pinecone_store import (
+    retrieve_from_pinecone, embed_query, get_embedding_cache_stats, get_passage_cache_stats, get_ingestion_stats
+)
+from .llm_client import get_llm_client, get_llm_stats, is_quota_error
+from .resilience import get_resilience_stats
+from .context_packer import pack_context
+from .extractive import extract_answer
+from .reranker import rerank, get_reranker_stats
+from .singleflight import SingleFlight
+from .semantic_cache import SemanticCache
+from .cache import LRUCache, get_data_version, on_data_version_change
+from .disk_cache import DiskAnswerCache
+from .deadline import Deadline, DeadlineExceeded
+from .fact_engine import answer_fact_query, get_fact_stats, get_fact_index
+from .intent_model import get_intent_model
+from .text_chunking import INTENT_CATEGORY_FILTERS
+from typing import Dict, Optional, Any, Iterator, AsyncIterator
 import hashlib
-from .config import SKIP_INTENT_CLASSIFICATION, DEFAULT_TOP_K, GEMINI_MODEL
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from .config import (
+    SKIP_INTENT_CLASSIFICATION, INTENT_CLASSIFIER, DEFAULT_TOP_K, RAG_MAX_WORKERS, CONTEXT_TOKEN_BUDGET,
+    ENABLE_RESPONSE_CACHE, CACHE_SIZE, RESPONSE_CACHE_TTL,
+    ENABLE_DISK_CACHE, DISK_CACHE_PATH, DISK_CACHE_MAX_ENTRIES,
+    ENABLE_SEMANTIC_CACHE, SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_SIZE, ENABLE_FACT_ENGINE,
+    REQUEST_TIMEOUT, EMBED_TIMEOUT, VECTOR_QUERY_TIMEOUT, INTENT_TIMEOUT, GENERATION_TIMEOUT,
+    ANSWER_MODE, EXTRACTIVE_MAX_SENTENCES, METADATA_FILTERS, METADATA_FILTER_MIN_CONFIDENCE,
+    ENABLE_RERANKER, RERANK_LEXICAL_WEIGHT, RERANK_MIN_RELATIVE_SCORE, RERANK_MAX_SCORE_GAP, RERANK_MIN_CHUNKS
+)
 
 # Load environment variables
 load_dotenv()
@@ -16,16 +39,40 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 if not GEMINI_API_KEY:
     raise ValueError("GEMINI_API_KEY environment variable is not set")
 
-# Set for langchain
-os.environ["GOOGLE_API_KEY"] = GEMINI_API_KEY
+# Response cache: LRU with TTL, invalidated whenever the data version changes
+_response_cache = LRUCache(max_entries=CACHE_SIZE, ttl_seconds=RESPONSE_CACHE_TTL)
 
-genai.configure(api_key=GEMINI_API_KEY)
+# Bounded executor for the blocking RAG pipeline. Pinecone embed/query and
+# Gemini invoke are synchronous, so async callers hand them to this pool
+# instead of running them on the event loop.
+_rag_executor = ThreadPoolExecutor(max_workers=RAG_MAX_WORKERS, thread_name_prefix="rag")
 
-# Initialize Gemini model for intent classification
-model = genai.GenerativeModel(GEMINI_MODEL)
+# Separate pool for individual network stages, so a request can stop waiting
+# on a hung embed/query/LLM call once its deadline passes
+_stage_executor = ThreadPoolExecutor(max_workers=RAG_MAX_WORKERS, thread_name_prefix="rag-stage")
 
-# Response cache (holds last 100 query-response pairs)
-_response_cache: Dict[str, Dict[str, Any]] = {}
+# Identical queries that arrive while the first one is still being answered
+# share its result instead of paying for their own embed/query/LLM calls
+_inflight = SingleFlight()
+
+# Semantic cache: paraphrases of an answered question reuse its answer
+_semantic_cache = SemanticCache(max_entries=SEMANTIC_CACHE_SIZE, threshold=SEMANTIC_CACHE_THRESHOLD)
+
+# Disk cache shared by all workers: survives restarts and free-tier sleeps
+_disk_cache: Optional[DiskAnswerCache] = None
+if ENABLE_DISK_CACHE:
+    try:
+        _disk_cache = DiskAnswerCache(DISK_CACHE_PATH, ttl_seconds=RESPONSE_CACHE_TTL, max_entries=DISK_CACHE_MAX_ENTRIES)
+        _disk_cache.prune(get_data_version())
+    except Exception as e:
+        print(f"⚠️ Disk cache disabled: {e}")
+        _disk_cache = None
+
+# Drop every cached answer as soon as the embeddings are regenerated
+on_data_version_change(_response_cache.clear)
+on_data_version_change(_semantic_cache.clear)
+if _disk_cache is not None:
+    on_data_version_change(lambda: _disk_cache.prune(get_data_version()))
 
 def classify_query_intent(query: str) -> Dict:
     """
@@ -58,8 +105,7 @@ Complexity:
 - complex: Requires comprehensive analysis or multiple sources"""
 
     try:
-        response = model.generate_content(classification_prompt)
-        response_text = response.text.strip()
+        response_text = get_llm_client().generate(classification_prompt, purpose="intent").strip()
         
         # Extract JSON
         if "```json" in response_text:
@@ -80,9 +126,9 @@ Complexity:
         }
 
 # Retrieve relevant documents from Pinecone
-def retrieve_documents(query, top_k=5):
+def retrieve_documents(query, top_k=5, query_embedding=None, filters=None):
     """Retrieve documents using Pinecone vector store"""
-    docs = retrieve_from_pinecone(query, top_k=top_k)
+    docs = retrieve_from_pinecone(query, top_k=top_k, query_embedding=query_embedding, filters=filters)
     
     print(f"\n🔍 Retrieved {len(docs)} chunks from Pinecone:")
     for doc in docs:
@@ -113,50 +159,74 @@ Answer:"""
     return prompt
 
 
-def generate_response(query: str, skip_intent_classification: Optional[bool] = None) -> Dict[str, Any]:
-    """
-    Optimized RAG response generation with optional intent classification and caching.
-    :param query: The user query.
-    :param skip_intent_classification: Skip intent classification for faster response (None = use config default)
-    :return: Dict with enhanced response and metadata
-    """
-    
-    # Use config default if not specified
-    if skip_intent_classification is None:
-        skip_intent_classification = SKIP_INTENT_CLASSIFICATION
-    
-    # Check cache first - SAVES API CALLS!
+DEGRADED_ANSWER_INTRO = "I'm taking longer than usual to put together a full answer, so here is what I found in Kushagra's profile:"
+
+QUOTA_ANSWER_INTRO = "My AI brain is resting (daily API limit reached), but here is what Kushagra's profile says:"
+
+NO_CONTEXT_ANSWER = "I don't have enough information in my knowledge base to answer this question accurately. Please try asking about Kushagra's work experience, projects, skills, or education."
+
+
+def _query_hash(query: str) -> str:
+    """Cache key for a query: md5 of the lowercased, stripped text"""
     query_normalized = query.lower().strip()
-    query_hash = hashlib.md5(query_normalized.encode()).hexdigest()
-    
-    if query_hash in _response_cache:
-        print("💰 Cache HIT! Returning cached response (saved API call)")
-        return _response_cache[query_hash]
-    
-    # Step 1: Fast keyword-based classification (replaces slow LLM intent classification)
+    return hashlib.md5(query_normalized.encode()).hexdigest()
+
+
+def _keyword_intent(query: str):
+    """Keyword rules: (intent, top_k) without any model"""
+    query_lower = query.lower()
+    if any(word in query_lower for word in ['project', 'built', 'developed', 'implemented']):
+        top_k = DEFAULT_TOP_K
+        intent = {'category': 'projects', 'complexity': 'moderate'}
+    elif any(word in query_lower for word in ['work', 'job', 'company', 'experience', 'role']):
+        top_k = DEFAULT_TOP_K
+        intent = {'category': 'work_experience', 'complexity': 'moderate'}
+    elif any(word in query_lower for word in ['skill', 'technology', 'tech', 'know', 'programming']):
+        top_k = max(DEFAULT_TOP_K - 1, 3)
+        intent = {'category': 'skills', 'complexity': 'simple'}
+    elif any(word in query_lower for word in ['education', 'degree', 'university', 'college']):
+        top_k = max(DEFAULT_TOP_K - 1, 3)
+        intent = {'category': 'education', 'complexity': 'simple'}
+    else:
+        top_k = DEFAULT_TOP_K
+        intent = {'category': 'general', 'complexity': 'moderate'}
+    return intent, top_k
+
+
+def _local_intent(query: str):
+    """Trained TF-IDF classifier: (intent, top_k), or None if the model isn't available"""
+    model = get_intent_model()
+    if model is None:
+        return None
+    intent = model.predict(query)
+    # Complexity drives how much context is retrieved
+    top_k = {
+        'simple': max(DEFAULT_TOP_K - 1, 3),
+        'moderate': DEFAULT_TOP_K,
+        'complex': DEFAULT_TOP_K + 2
+    }.get(intent['complexity'], DEFAULT_TOP_K)
+    return intent, top_k
+
+
+def _resolve_intent(query: str, skip_intent_classification: bool, deadline: Deadline):
+    """Pick the intent and the number of chunks to retrieve for a query"""
+    # Step 1: Fast local classification (replaces slow LLM intent classification)
     if skip_intent_classification:
-        # Simple keyword-based approach - much faster
-        query_lower = query.lower()
-        if any(word in query_lower for word in ['project', 'built', 'developed', 'implemented']):
-            top_k = DEFAULT_TOP_K
-            intent = {'category': 'projects', 'complexity': 'moderate'}
-        elif any(word in query_lower for word in ['work', 'job', 'company', 'experience', 'role']):
-            top_k = DEFAULT_TOP_K
-            intent = {'category': 'work_experience', 'complexity': 'moderate'}
-        elif any(word in query_lower for word in ['skill', 'technology', 'tech', 'know', 'programming']):
-            top_k = max(DEFAULT_TOP_K - 1, 3)
-            intent = {'category': 'skills', 'complexity': 'simple'}
-        elif any(word in query_lower for word in ['education', 'degree', 'university', 'college']):
-            top_k = max(DEFAULT_TOP_K - 1, 3)
-            intent = {'category': 'education', 'complexity': 'simple'}
+        resolved = _local_intent(query) if INTENT_CLASSIFIER == "local" else None
+        if resolved is not None:
+            intent, top_k = resolved
+            print(f"\n⚡ Local classification: {intent['category']}/{intent['complexity']} "
+                  f"(confidence {intent['confidence']}, top_k={top_k})")
         else:
-            top_k = DEFAULT_TOP_K
-            intent = {'category': 'general', 'complexity': 'moderate'}
-        print(f"\n⚡ Fast classification: {intent.get('category')} (top_k={top_k})")
+            intent, top_k = _keyword_intent(query)
+            print(f"\n⚡ Fast classification: {intent.get('category')} (top_k={top_k})")
     else:
         # Original slower but more accurate classification
         print("\n🧠 Analyzing query intent...")
-        intent = classify_query_intent(query)
+        try:
+            intent = deadline.run("intent", INTENT_TIMEOUT, classify_query_intent, query)
+        except DeadlineExceeded:
+            intent = {"category": "general", "complexity": "moderate"}
         print(f"   Category: {intent.get('category')}")
         print(f"   Complexity: {intent.get('complexity')}")
         
@@ -168,31 +238,249 @@ def generate_response(query: str, skip_intent_classification: Optional[bool] = N
         else:
             top_k = 7
     
-    # Initialize LLM (API key already set in environment at module level)
-    llm = GoogleGenerativeAI(model=GEMINI_MODEL)
+    return intent, top_k
+
+
+def _metadata_filter(query: str, intent: Dict) -> Optional[Dict[str, Any]]:
+    """
+    Chunk filter for a query: the companies/projects it names, else its intent
+    category - only when the classifier is confident (LLM intents carry no score)
+    """
+    if not METADATA_FILTERS:
+        return None
+    entity_filter = get_fact_index().entity_filter(query)
+    if entity_filter is not None:
+        return entity_filter
+    if intent.get('confidence', 1.0) < METADATA_FILTER_MIN_CONFIDENCE:
+        return None
+    categories = INTENT_CATEGORY_FILTERS.get(intent.get('category'))
+    return {'category': categories} if categories else None
+
+
+def _format_context(retrieved_chunks) -> str:
+    """Pack retrieved chunks into deduplicated, token-budgeted context"""
+    context_text, stats = pack_context(retrieved_chunks, CONTEXT_TOKEN_BUDGET)
+    print(f"📦 Packed context: {stats['raw_tokens']} -> {stats['packed_tokens']} tokens "
+          f"({stats['chunks_dropped']}/{stats['chunks']} chunks fully redundant or over budget)")
+    return context_text
+
+
+def _lookup_cache(query_hash: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the cached response for a query hash, if caching is enabled.
+    Checks memory first, then the shared disk cache (promoting hits to memory).
+    """
+    if not ENABLE_RESPONSE_CACHE:
+        return None
+    cached = _response_cache.get(query_hash)
+    if cached is not None or _disk_cache is None:
+        return cached
     
-    retrieved_chunks = retrieve_documents(query, top_k=top_k)
+    cached = _disk_cache.get(query_hash, get_data_version())
+    if cached is not None:
+        print("💽 Disk cache HIT! Answer persisted from an earlier run or another worker")
+        _response_cache.set(query_hash, cached)
+    return cached
+
+
+def _lookup_fact(query: str) -> Optional[Dict[str, Any]]:
+    """Template answer from the fact index for direct lookups (no API calls)"""
+    if not ENABLE_FACT_ENGINE:
+        return None
+    try:
+        fact = answer_fact_query(query)
+    except Exception as e:
+        print(f"⚠️ Fact engine error, falling back to RAG: {e}")
+        return None
+    if fact is None:
+        return None
+    print(f"📇 Fact engine HIT ({fact['fact']}) - answered without embedding or LLM")
+    return {
+        "answer": fact["answer"],
+        "intent": {"category": fact["category"], "complexity": "simple"},
+        "num_chunks": 0,
+        "source": "facts"
+    }
+
+
+def _semantic_key(query: str) -> Optional[frozenset]:
+    """
+    Entities the query names, so paraphrases only share an answer when they
+    ask about the same companies/projects ("GrocExpress stack" vs "SalesAssist stack")
+    """
+    try:
+        return get_fact_index().entity_names(query)
+    except Exception as e:
+        print(f"⚠️ Fact index unavailable, skipping the semantic cache: {e}")
+        return None
+
+
+def _semantic_lookup(query: str, deadline: Deadline):
+    """
+    Embed the query and look for a cached answer to a paraphrase of it that
+    names the same entities. Returns (query_embedding, cached_response); the
+    embedding is reused for retrieval on a miss, so this costs no extra network call.
+    A hit is not written to the exact-match caches: it stays a reuse of
+    another question's answer and is looked up (and re-checked) again next time.
+    """
+    query_embedding = deadline.run("embedding", EMBED_TIMEOUT, embed_query, query)
+    if not ENABLE_SEMANTIC_CACHE:
+        return query_embedding, None
+    
+    key = _semantic_key(query)
+    if key is None:
+        return query_embedding, None
+    match = _semantic_cache.lookup(query_embedding, key)
+    if match is None:
+        return query_embedding, None
+    
+    cached, similarity = match
+    print(f"🧭 Semantic cache HIT (similarity {similarity:.3f}) - reusing answer to a similar question")
+    return query_embedding, cached
+
+
+def _semantic_store(query: str, query_embedding, result: Dict[str, Any]):
+    """Offer a fresh answer for reuse by paraphrases naming the same entities"""
+    if not ENABLE_SEMANTIC_CACHE:
+        return
+    key = _semantic_key(query)
+    if key is not None:
+        _semantic_cache.add(query_embedding, result, key)
+
+
+def _retrieve(query: str, top_k: int, query_embedding, intent: Dict, deadline: Deadline):
+    """Vector search, narrowed by the query's metadata filter, under the vector query budget"""
+    return deadline.run(
+        "vector_query", VECTOR_QUERY_TIMEOUT,
+        retrieve_documents, query, top_k=top_k, query_embedding=query_embedding,
+        filters=_metadata_filter(query, intent)
+    )
+
+
+def _rerank(query: str, retrieved_chunks):
+    """Rescore the retrieved chunks and drop the ones far below the best match"""
+    if not ENABLE_RERANKER or not retrieved_chunks:
+        return retrieved_chunks
+    kept, stats = rerank(
+        query, retrieved_chunks,
+        lexical_weight=RERANK_LEXICAL_WEIGHT,
+        min_relative_score=RERANK_MIN_RELATIVE_SCORE,
+        max_score_gap=RERANK_MAX_SCORE_GAP,
+        min_chunks=RERANK_MIN_CHUNKS
+    )
+    print(f"🎯 Reranked: kept {stats['kept']}/{stats['chunks']} chunks "
+          f"({stats['chunks_dropped']} dropped, ~{stats['tokens_saved']} tokens saved)")
+    return kept
+
+
+def _extractive_response(query: str, retrieved_chunks, intent: Dict, intro: Optional[str] = None) -> Dict[str, Any]:
+    """Answer made of the retrieved sentences that best match the query (no LLM call)"""
+    answer, stats = extract_answer(query, retrieved_chunks, EXTRACTIVE_MAX_SENTENCES)
+    print(f"✂️ Extractive answer: {stats['selected']} of {stats['sentences']} sentences")
+    if not answer:
+        # No sentence shares a term with the query - show the best chunks instead
+        answer, _ = pack_context(retrieved_chunks, CONTEXT_TOKEN_BUDGET // 4)
+    return {
+        "answer": f"{intro}\n\n{answer}" if intro else answer,
+        "intent": intent,
+        "num_chunks": len(retrieved_chunks),
+        "source": "extractive"
+    }
+
+
+def _degraded_response(query: str, retrieved_chunks, intent: Dict, intro: str = DEGRADED_ANSWER_INTRO) -> Dict[str, Any]:
+    """Extractive answer used when generation runs out of time or quota"""
+    result = _extractive_response(query, retrieved_chunks, intent, intro)
+    result["degraded"] = True
+    return result
+
+
+def _cache_response(query_hash: str, result: Dict[str, Any]):
+    """Cache the response in memory (LRU eviction beyond CACHE_SIZE entries) and on disk"""
+    if not ENABLE_RESPONSE_CACHE:
+        return
+    _response_cache.set(query_hash, result)
+    if _disk_cache is not None:
+        _disk_cache.set(query_hash, get_data_version(), result)
+    print(f"💾 Response cached ({len(_response_cache)}/{CACHE_SIZE} cached queries)")
+
+
+def generate_response(query: str, skip_intent_classification: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Optimized RAG response generation with optional intent classification and caching.
+    Concurrent calls for the same normalized query are coalesced into one.
+    :param query: The user query.
+    :param skip_intent_classification: Skip intent classification for faster response (None = use config default)
+    :return: Dict with enhanced response and metadata
+    """
+    return _inflight.do(_query_hash(query), _generate_response, query, skip_intent_classification)
+
+
+def _generate_response(query: str, skip_intent_classification: Optional[bool] = None) -> Dict[str, Any]:
+    """Uncoalesced body of generate_response"""
+    
+    # Use config default if not specified
+    if skip_intent_classification is None:
+        skip_intent_classification = SKIP_INTENT_CLASSIFICATION
+    
+    # Check cache first - SAVES API CALLS!
+    query_hash = _query_hash(query)
+    
+    cached = _lookup_cache(query_hash)
+    if cached is not None:
+        print("💰 Cache HIT! Returning cached response (saved API call)")
+        return cached
+    
+    fact = _lookup_fact(query)
+    if fact is not None:
+        return fact
+    
+    # Every network stage below shares this request's REQUEST_TIMEOUT
+    deadline = Deadline(REQUEST_TIMEOUT, _stage_executor)
+    
+    query_embedding, cached = _semantic_lookup(query, deadline)
+    if cached is not None:
+        return cached
+    
+    intent, top_k = _resolve_intent(query, skip_intent_classification, deadline)
+    
+    retrieved_chunks = _rerank(query, _retrieve(query, top_k, query_embedding, intent, deadline))
 
     # Ensure we have valid retrieved context
     if not retrieved_chunks:
         return {
-            "answer": "I don't have enough information in my knowledge base to answer this question accurately. Please try asking about Kushagra's work experience, projects, skills, or education.",
+            "answer": NO_CONTEXT_ANSWER,
             "intent": intent,
             "num_chunks": 0
         }
 
-    # Step 3: Format context - SIMPLIFIED to save tokens
-    context_text = ""
-    for i, chunk in enumerate(retrieved_chunks, 1):
-        # Only include essential info - no verbose metadata
-        context_text += f"[{i}] {chunk.page_content}\n\n"
+    if ANSWER_MODE == "extractive":
+        result = _extractive_response(query, retrieved_chunks, intent)
+        _cache_response(query_hash, result)
+        return result
+
+    # Step 3: Format context
+    context_text = _format_context(retrieved_chunks)
 
     # Step 4: Create enhanced prompt based on intent
     prompt = create_enhanced_prompt(query, context_text, intent)
     
     # Step 5: Generate response with enhanced LLM
+    # Shared client - connection and auth are reused across requests
+    llm = get_llm_client()
     print("🤖 Generating enhanced response...")
-    response = llm.invoke(prompt).strip()
+    try:
+        response = deadline.run("generation", GENERATION_TIMEOUT, llm.generate, prompt).strip()
+    except DeadlineExceeded:
+        # Out of time: the retrieved chunks still answer most questions.
+        # Not cached, so the next ask gets a full answer.
+        print(f"🩹 Returning degraded answer (stage timings: {deadline.timings})")
+        return _degraded_response(query, retrieved_chunks, intent)
+    except Exception as e:
+        if not is_quota_error(e):
+            raise
+        print(f"🪫 Gemini quota exhausted, answering extractively: {e}")
+        return _degraded_response(query, retrieved_chunks, intent, QUOTA_ANSWER_INTRO)
 
     # Return structured response with metadata
     result = {
@@ -201,16 +489,198 @@ def generate_response(query: str, skip_intent_classification: Optional[bool] = N
         "num_chunks": len(retrieved_chunks)
     }
     
-    # Cache the response - limit cache to 100 entries
-    if len(_response_cache) >= 100:
-        # Remove oldest entry (simple FIFO)
-        oldest_key = next(iter(_response_cache))
-        del _response_cache[oldest_key]
-    _response_cache[query_hash] = result
-    print(f"💾 Response cached ({len(_response_cache)}/100 cached queries)")
+    _cache_response(query_hash, result)
+    _semantic_store(query, query_embedding, result)
     
     return result
 
+
+def generate_response_stream(query: str, skip_intent_classification: Optional[bool] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming variant of generate_response.
+    Yields events as dicts with "event" and "data" keys:
+      - "answer": a complete answer (cache hits, fact lookups, no context found)
+      - "metadata": retrieval results, sent before any token
+      - "token": a piece of generated text as Gemini produces it
+      - "done": final answer and metadata once generation finishes
+    """
+    if skip_intent_classification is None:
+        skip_intent_classification = SKIP_INTENT_CLASSIFICATION
+    
+    # Cache hits are replayed as a single event
+    query_hash = _query_hash(query)
+    cached = _lookup_cache(query_hash)
+    if cached is not None:
+        print("💰 Cache HIT! Replaying cached response (saved API call)")
+        yield {"event": "answer", "data": {**cached, "cached": True}}
+        return
+    
+    fact = _lookup_fact(query)
+    if fact is not None:
+        yield {"event": "answer", "data": fact}
+        return
+    
+    deadline = Deadline(REQUEST_TIMEOUT, _stage_executor)
+    
+    # Tokens can't be shared, but an identical non-streaming request already
+    # in flight can: wait for it (within the generation budget) and replay its answer
+    leader_timed_out = False
+    pending = _inflight.peek(query_hash)
+    if pending is not None:
+        print("🔗 Joining in-flight request for the same query")
+        try:
+            result = pending.result(timeout=min(GENERATION_TIMEOUT, deadline.remaining()))
+        except FutureTimeoutError:
+            # The leader is stuck: retrieve ourselves and answer extractively
+            print("⏰ In-flight request for the same query timed out, answering from retrieval")
+            leader_timed_out = True
+        else:
+            yield {"event": "answer", "data": {**result, "cached": True}}
+            return
+    
+    query_embedding, cached = _semantic_lookup(query, deadline)
+    if cached is not None:
+        yield {"event": "answer", "data": {**cached, "cached": True}}
+        return
+    
+    intent, top_k = _resolve_intent(query, skip_intent_classification, deadline)
+    retrieved_chunks = _rerank(query, _retrieve(query, top_k, query_embedding, intent, deadline))
+    
+    if not retrieved_chunks:
+        yield {"event": "answer", "data": {"answer": NO_CONTEXT_ANSWER, "intent": intent, "num_chunks": 0}}
+        return
+    
+    # Retrieval metadata goes out first so the client has something to show
+    yield {
+        "event": "metadata",
+        "data": {
+            "intent": intent,
+            "num_chunks": len(retrieved_chunks),
+            "sections": [chunk.metadata.get('section', 'unknown') for chunk in retrieved_chunks]
+        }
+    }
+    
+    if leader_timed_out:
+        yield {"event": "answer", "data": _degraded_response(query, retrieved_chunks, intent)}
+        return
+    
+    if ANSWER_MODE == "extractive":
+        result = _extractive_response(query, retrieved_chunks, intent)
+        _cache_response(query_hash, result)
+        yield {"event": "answer", "data": result}
+        return
+    
+    prompt = create_enhanced_prompt(query, _format_context(retrieved_chunks), intent)
+    llm = get_llm_client()
+    
+    print("🤖 Streaming enhanced response...")
+    parts = []
+    timed_out = False
+    # Tokens are pulled through the stage executor, so a stream that stops
+    # sending is abandoned at the deadline instead of hanging the request
+    tokens = deadline.stream("generation", GENERATION_TIMEOUT, llm.stream, prompt)
+    try:
+        for token in tokens:
+            if token:
+                parts.append(token)
+                yield {"event": "token", "data": {"text": token}}
+    except DeadlineExceeded:
+        timed_out = True
+    except Exception as e:
+        # Quota errors surface before the first token; later failures are real errors
+        if parts or not is_quota_error(e):
+            raise
+        print(f"🪫 Gemini quota exhausted, answering extractively: {e}")
+        yield {"event": "answer", "data": _degraded_response(query, retrieved_chunks, intent, QUOTA_ANSWER_INTRO)}
+        return
+    finally:
+        tokens.close()
+    
+    if timed_out and not parts:
+        yield {"event": "answer", "data": _degraded_response(query, retrieved_chunks, intent)}
+        return
+    
+    result = {
+        "answer": "".join(parts).strip(),
+        "intent": intent,
+        "num_chunks": len(retrieved_chunks)
+    }
+    if timed_out:
+        # Cut short - send what we have, but don't cache a truncated answer
+        result["truncated"] = True
+    else:
+        _cache_response(query_hash, result)
+        _semantic_store(query, query_embedding, result)
+    
+    yield {"event": "done", "data": result}
+
+
+async def generate_response_async(query: str, skip_intent_classification: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Run generate_response on the RAG executor so the event loop stays free.
+    Use this from async endpoints; at most RAG_MAX_WORKERS chats run at once,
+    the rest queue without blocking other requests. Callers that ask the same
+    question while it is being answered await the leader's future without
+    taking a worker thread.
+    """
+    query_hash = _query_hash(query)
+    future, is_leader = _inflight.acquire(query_hash)
+    if is_leader:
+        _rag_executor.submit(
+            _inflight.complete, query_hash, future,
+            _generate_response, query, skip_intent_classification
+        )
+    else:
+        print("🔗 Coalesced with in-flight request for the same query")
+    return await asyncio.wrap_future(future)
+
+
+async def generate_response_stream_async(query: str, skip_intent_classification: Optional[bool] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Async wrapper around generate_response_stream.
+    Each step of the blocking generator runs on the RAG executor, so events
+    reach the client as soon as they are produced.
+    """
+    loop = asyncio.get_running_loop()
+    events = generate_response_stream(query, skip_intent_classification)
+    done = object()
+    try:
+        while True:
+            event = await loop.run_in_executor(_rag_executor, next, events, done)
+            if event is done:
+                break
+            yield event
+    finally:
+        try:
+            events.close()
+        except ValueError:
+            # Client disconnected while a step was still running on a worker thread
+            pass
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Response cache and request coalescing counters"""
+    return {
+        "data_version": get_data_version(),
+        "response_cache": _response_cache.stats(),
+        "disk_cache": _disk_cache.stats() if _disk_cache is not None else None,
+        "semantic_cache": _semantic_cache.stats(),
+        "fact_engine": get_fact_stats(),
+        "reranker": get_reranker_stats(),
+        "query_embedding_cache": get_embedding_cache_stats(),
+        "passage_embedding_cache": get_passage_cache_stats(),
+        "ingestion": get_ingestion_stats(),
+        "pinecone_retries": get_resilience_stats(),
+        "single_flight": _inflight.stats(),
+        "llm": get_llm_stats()
+    }
+
+
+def shutdown_executor():
+    """Stop accepting new RAG work and release the worker threads"""
+    _rag_executor.shutdown(wait=False, cancel_futures=True)
+    _stage_executor.shutdown(wait=False, cancel_futures=True)
+
 # Example usage
 if __name__ == "__main__":
     query = "Can you tell about the technologies he used in his project about SalesAssist AI"
@@ -0,0 +1,122 @@
+"""
+Index Generations (blue/green reindexing)
+Every rebuild of the vector index goes into a fresh, named generation
+(a subdirectory for the local backends, a namespace in Pinecone) while
+readers keep using the current one. Once the new generation is complete
+and verified, one atomic write of the CURRENT pointer file switches
+readers over and the old generations are garbage-collected.
+
+The generation "" is the unversioned layout used before generations
+existed (files directly in VECTOR_INDEX_DIR, Pinecone's default namespace);
+it stays current until the first rebuild.
+"""
+
+import os
+import json
+import time
+import shutil
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: single process assumed
+    fcntl = None
+
+GENERATION_PREFIX = "gen-"
+POINTER_FILE = "CURRENT"
+GENERATIONS_DIR = "generations"
+LOCK_FILE = "BUILD.lock"
+
+# Files the unversioned layout kept directly in the index root
+LEGACY_FILES = (
+    "hnsw_index.bin", "hnsw_meta.json",
+    "numpy_vectors.npy", "numpy_meta.json",
+    "bm25_index.npz",
+)
+
+
+def new_generation_name() -> str:
+    """Sortable, unique-per-millisecond generation name"""
+    return f"{GENERATION_PREFIX}{time.strftime('%Y%m%d-%H%M%S')}-{int(time.time() * 1000) % 1000:03d}"
+
+
+def is_generation(name: str) -> bool:
+    """True for names this module created (never touch anything else)"""
+    return name.startswith(GENERATION_PREFIX)
+
+
+def generation_dir(root: str, generation: str) -> str:
+    """Directory holding a generation's local files"""
+    return os.path.join(root, GENERATIONS_DIR, generation) if generation else root
+
+
+def pointer_exists(root: str) -> bool:
+    """True once a CURRENT pointer file has been written under root"""
+    return os.path.exists(os.path.join(root, POINTER_FILE))
+
+
+def read_current_pointer(root: str) -> Tuple[str, int]:
+    """
+    (generation, revision) readers should use ("" = unversioned layout).
+    The revision changes whenever the generation is modified in place, so
+    workers holding it open know to reload it.
+    """
+    try:
+        with open(os.path.join(root, POINTER_FILE), "r") as f:
+            pointer = json.load(f)
+        return pointer.get("generation", ""), int(pointer.get("revision", 0))
+    except (OSError, ValueError):
+        return "", 0
+
+
+def read_current_generation(root: str) -> str:
+    """Generation readers should use ("" = unversioned layout)"""
+    return read_current_pointer(root)[0]
+
+
+def write_current_generation(root: str, generation: str) -> int:
+    """Point readers at a generation with a new revision (temp file + rename, so it is atomic)"""
+    os.makedirs(root, exist_ok=True)
+    revision = read_current_pointer(root)[1] + 1
+    path = os.path.join(root, POINTER_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump({"generation": generation, "revision": revision, "switched_at": time.time()}, f)
+    os.replace(path + ".tmp", path)
+    return revision
+
+
+@contextmanager
+def build_lock(root: str) -> Iterator[None]:
+    """
+    Exclusive advisory lock on the index root, shared by every process using it
+    (uvicorn workers, the auto-updater, scripts). Held for each build and GC pass.
+    """
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, LOCK_FILE), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def list_local_generations(root: str) -> List[str]:
+    """Generations that have a directory under root"""
+    directory = os.path.join(root, GENERATIONS_DIR)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(name for name in os.listdir(directory) if is_generation(name))
+
+
+def remove_local_generation(root: str, generation: str):
+    """Delete a generation's local files"""
+    if generation:
+        shutil.rmtree(generation_dir(root, generation), ignore_errors=True)
+        return
+    for name in LEGACY_FILES:
+        path = os.path.join(root, name)
+        if os.path.exists(path):
+            os.remove(path)
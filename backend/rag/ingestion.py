@@ -0,0 +1,152 @@
+"""
+Ingestion Pipeline
+Embeds and upserts chunks in two overlapping stages instead of a serial
+embed -> wait -> upsert -> wait loop:
+  - batches are capped by chunk count (the embedding API's input limit) and by
+    estimated upsert payload bytes (the vector store's request size limit)
+  - embed workers take batches and hand the vectors to upsert workers through
+    a bounded queue, so embedding never runs more than a few batches ahead of
+    what has been written
+  - the first error stops both stages and is re-raised to the caller
+Throughput (batches, vectors, bytes, busy time per stage) is returned and printed.
+"""
+
+import json
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Upsert payloads are JSON: a float32 value costs ~20 bytes as text
+_BYTES_PER_VALUE = 20
+
+_DONE = object()
+
+
+def estimate_record_bytes(vector_id: str, metadata: Dict[str, Any], dimension: int) -> int:
+    """Approximate upsert payload size of one vector with its metadata"""
+    return len(vector_id) + len(json.dumps(metadata, separators=(",", ":"))) + dimension * _BYTES_PER_VALUE
+
+
+def plan_batches(ids: Sequence[str], chunk_metadata: Sequence[Dict[str, Any]], dimension: int,
+                 max_count: int, max_bytes: int) -> List[List[int]]:
+    """Split chunk positions into batches of at most max_count chunks and ~max_bytes payload"""
+    batches, current, current_bytes = [], [], 0
+    for i, (vector_id, metadata) in enumerate(zip(ids, chunk_metadata)):
+        size = estimate_record_bytes(vector_id, metadata, dimension)
+        if current and (len(current) >= max_count or current_bytes + size > max_bytes):
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.append(i)
+        current_bytes += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def run_pipeline(
+    batches: List[List[int]],
+    embed: Callable[[List[int]], np.ndarray],
+    upsert: Callable[[List[int], np.ndarray], None],
+    embed_workers: int = 2,
+    upsert_workers: int = 2,
+    queue_size: int = 4,
+    batch_bytes: Optional[Callable[[List[int]], int]] = None
+) -> Dict[str, Any]:
+    """
+    Run embed(batch) -> upsert(batch, embeddings) for every batch on two worker pools.
+    Returns throughput stats plus "probe", one upserted embedding (None if nothing ran).
+    """
+    pending: "queue.Queue" = queue.Queue()
+    for batch in batches:
+        pending.put(batch)
+    embedded: "queue.Queue" = queue.Queue(maxsize=max(1, queue_size))
+    stop = threading.Event()
+    lock = threading.Lock()
+    errors: List[BaseException] = []
+    stats = {"batches": 0, "vectors": 0, "bytes": 0, "embed_s": 0.0, "upsert_s": 0.0}
+    total = sum(len(batch) for batch in batches)
+    probe = [None]
+
+    def fail(error: BaseException):
+        with lock:
+            errors.append(error)
+        stop.set()
+
+    def embed_worker():
+        while not stop.is_set():
+            try:
+                batch = pending.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                start = time.perf_counter()
+                embeddings = embed(batch)
+                with lock:
+                    stats["embed_s"] += time.perf_counter() - start
+            except Exception as e:
+                fail(e)
+                return
+            # Bounded hand-off; keep checking for a failed upsert stage while waiting
+            while not stop.is_set():
+                try:
+                    embedded.put((batch, embeddings), timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    def upsert_worker():
+        while True:
+            item = embedded.get()
+            if item is _DONE:
+                return
+            if stop.is_set():
+                continue  # drain so embed workers never block on a full queue
+            batch, embeddings = item
+            try:
+                start = time.perf_counter()
+                upsert(batch, embeddings)
+                elapsed = time.perf_counter() - start
+            except Exception as e:
+                fail(e)
+                continue
+            with lock:
+                stats["upsert_s"] += elapsed
+                stats["batches"] += 1
+                stats["vectors"] += len(batch)
+                stats["bytes"] += batch_bytes(batch) if batch_bytes else 0
+                probe[0] = embeddings[-1]
+                print(f"   ✅ Uploaded {len(batch)} vectors (total: {stats['vectors']}/{total})")
+
+    started = time.perf_counter()
+    embedders = [threading.Thread(target=embed_worker, name=f"ingest-embed-{i}", daemon=True)
+                 for i in range(max(1, embed_workers))]
+    upserters = [threading.Thread(target=upsert_worker, name=f"ingest-upsert-{i}", daemon=True)
+                 for i in range(max(1, upsert_workers))]
+    for thread in embedders + upserters:
+        thread.start()
+    for thread in embedders:
+        thread.join()
+    for _ in upserters:
+        embedded.put(_DONE)
+    for thread in upserters:
+        thread.join()
+
+    if errors:
+        raise errors[0]
+
+    wall_s = time.perf_counter() - started
+    stats.update({
+        "wall_s": round(wall_s, 3),
+        "embed_s": round(stats["embed_s"], 3),
+        "upsert_s": round(stats["upsert_s"], 3),
+        "vectors_per_s": round(stats["vectors"] / wall_s, 1) if wall_s > 0 else 0.0,
+        "mb_per_s": round(stats["bytes"] / 1e6 / wall_s, 3) if wall_s > 0 else 0.0,
+        "probe": probe[0]
+    })
+    print(f"📈 Ingested {stats['vectors']} vectors in {stats['batches']} batches: {stats['wall_s']}s wall "
+          f"(embed {stats['embed_s']}s, upsert {stats['upsert_s']}s busy), "
+          f"{stats['vectors_per_s']} vectors/s, {stats['mb_per_s']} MB/s")
+    return stats
@@ -0,0 +1,174 @@
+"""
+Local Intent Classifier
+TF-IDF features (word unigrams/bigrams + character n-grams) and two softmax
+linear models in NumPy: one for the query category, one for its complexity.
+Trained offline by backend/scripts/intent/train_intent_model.py and shipped
+as a small .npz artifact; a prediction takes well under a millisecond and
+needs no API call.
+"""
+
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .config import INTENT_MODEL_PATH
+
+# Below this probability the category is reported as "general"
+MIN_CATEGORY_CONFIDENCE = 0.35
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+
+def extract_features(text: str) -> List[str]:
+    """Word unigrams, word bigrams and character 3-5 grams of a query"""
+    words = _WORD.findall(text.lower().replace("kushagra's", "kushagra"))
+    features = [f"w:{w}" for w in words]
+    features += [f"b:{a}_{b}" for a, b in zip(words, words[1:])]
+    for word in words:
+        padded = f"<{word}>"
+        for n in (3, 4, 5):
+            features += [f"c:{padded[i:i + n]}" for i in range(len(padded) - n + 1)]
+    return features
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    logits = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+def _fit_softmax(x: np.ndarray, y: np.ndarray, num_classes: int,
+                 l2: float = 1e-3, lr: float = 2.0, epochs: int = 400):
+    """Multinomial logistic regression by full-batch gradient descent"""
+    weights = np.zeros((x.shape[1], num_classes), dtype=np.float32)
+    bias = np.zeros(num_classes, dtype=np.float32)
+    targets = np.eye(num_classes, dtype=np.float32)[y]
+    for _ in range(epochs):
+        grad = (_softmax(x @ weights + bias) - targets) / len(x)
+        weights -= lr * (x.T @ grad + l2 * weights)
+        bias -= lr * grad.sum(axis=0)
+    return weights, bias
+
+
+class IntentModel:
+    """
+    Category + complexity classifier over a shared TF-IDF vocabulary.
+    Weight matrices are float32 (features x classes); a query touches only
+    the rows of its own features.
+    """
+
+    def __init__(self, vocabulary: Sequence[str], idf: np.ndarray,
+                 category_labels: Sequence[str], category_weights: np.ndarray, category_bias: np.ndarray,
+                 complexity_labels: Sequence[str], complexity_weights: np.ndarray, complexity_bias: np.ndarray):
+        self.vocabulary = list(vocabulary)
+        self._index = {feature: i for i, feature in enumerate(self.vocabulary)}
+        self.idf = idf.astype(np.float32)
+        self.category_labels = list(category_labels)
+        self.category_weights = category_weights.astype(np.float32)
+        self.category_bias = category_bias.astype(np.float32)
+        self.complexity_labels = list(complexity_labels)
+        self.complexity_weights = complexity_weights.astype(np.float32)
+        self.complexity_bias = complexity_bias.astype(np.float32)
+
+    def _sparse_tfidf(self, text: str):
+        """(feature indices, L2-normalized sublinear tf-idf values) of the known features"""
+        counts: Dict[int, int] = {}
+        for feature in extract_features(text):
+            i = self._index.get(feature)
+            if i is not None:
+                counts[i] = counts.get(i, 0) + 1
+        indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        values = (1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))) * self.idf[indices]
+        norm = float(np.linalg.norm(values))
+        return indices, (values / norm if norm else values)
+
+    def predict(self, query: str) -> Dict[str, object]:
+        """Intent dict in the same shape classify_query_intent returns"""
+        indices, values = self._sparse_tfidf(query)
+        category_probs = _softmax(values @ self.category_weights[indices] + self.category_bias)
+        complexity_probs = _softmax(values @ self.complexity_weights[indices] + self.complexity_bias)
+
+        best = int(category_probs.argmax())
+        confidence = float(category_probs[best])
+        category = self.category_labels[best] if confidence >= MIN_CATEGORY_CONFIDENCE else "general"
+        return {
+            "category": category,
+            "complexity": self.complexity_labels[int(complexity_probs.argmax())],
+            "confidence": round(confidence, 3)
+        }
+
+    @classmethod
+    def train(cls, questions: Sequence[str], categories: Sequence[str], complexities: Sequence[str]) -> "IntentModel":
+        """Fit vocabulary, idf and both linear models on labelled questions"""
+        docs = [extract_features(q) for q in questions]
+        vocabulary = sorted({feature for doc in docs for feature in doc})
+        index = {feature: i for i, feature in enumerate(vocabulary)}
+
+        df = np.zeros(len(vocabulary), dtype=np.float32)
+        for doc in docs:
+            df[[index[f] for f in set(doc)]] += 1
+        idf = np.log((1 + len(docs)) / (1 + df)) + 1.0
+
+        x = np.zeros((len(docs), len(vocabulary)), dtype=np.float32)
+        for row, doc in enumerate(docs):
+            for feature in doc:
+                x[row, index[feature]] += 1
+        x = np.where(x > 0, 1.0 + np.log(np.maximum(x, 1.0)), 0.0) * idf
+        x /= np.maximum(np.linalg.norm(x, axis=1, keepdims=True), 1e-12)
+
+        category_labels = sorted(set(categories))
+        complexity_labels = sorted(set(complexities))
+        category_weights, category_bias = _fit_softmax(
+            x, np.array([category_labels.index(c) for c in categories]), len(category_labels))
+        complexity_weights, complexity_bias = _fit_softmax(
+            x, np.array([complexity_labels.index(c) for c in complexities]), len(complexity_labels))
+
+        return cls(vocabulary, idf, category_labels, category_weights, category_bias,
+                   complexity_labels, complexity_weights, complexity_bias)
+
+    def save(self, path: str):
+        """Write the model as a compressed .npz (no pickled objects)"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(
+            path,
+            vocabulary=np.array(self.vocabulary),
+            idf=self.idf,
+            category_labels=np.array(self.category_labels),
+            category_weights=self.category_weights.astype(np.float16),
+            category_bias=self.category_bias,
+            complexity_labels=np.array(self.complexity_labels),
+            complexity_weights=self.complexity_weights.astype(np.float16),
+            complexity_bias=self.complexity_bias
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "IntentModel":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data["vocabulary"].tolist(), data["idf"],
+                data["category_labels"].tolist(), data["category_weights"], data["category_bias"],
+                data["complexity_labels"].tolist(), data["complexity_weights"], data["complexity_bias"]
+            )
+
+
+_intent_model: Optional[IntentModel] = None
+_intent_model_loaded = False
+_intent_model_lock = threading.Lock()
+
+
+def get_intent_model() -> Optional[IntentModel]:
+    """The shipped intent model, or None if the artifact is missing or unreadable"""
+    global _intent_model, _intent_model_loaded
+    if not _intent_model_loaded:
+        with _intent_model_lock:
+            if not _intent_model_loaded:
+                try:
+                    _intent_model = IntentModel.load(INTENT_MODEL_PATH)
+                    print(f"🏷️ Loaded intent model ({len(_intent_model.vocabulary)} features) from {INTENT_MODEL_PATH}")
+                except Exception as e:
+                    print(f"⚠️ Intent model unavailable, using keyword classification: {e}")
+                _intent_model_loaded = True
+    return _intent_model
@@ -0,0 +1,146 @@
+"""
+Shared Gemini Client
+One long-lived client per model for the whole backend (answer generation,
+intent classification, resume parsing) instead of a new client per request.
+The underlying channel stays open between calls, concurrency is capped,
+and every call's latency is recorded.
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from typing import Any, Dict, Iterator, Optional
+
+import google.generativeai as genai
+from dotenv import load_dotenv
+
+from .config import GEMINI_MODEL, LLM_MAX_CONCURRENCY, LLM_TRANSPORT
+from .deadline import DeadlineExceeded
+
+load_dotenv()
+
+_configure_lock = threading.Lock()
+_configured = False
+_clients: Dict[str, "LLMClient"] = {}
+_clients_lock = threading.Lock()
+
+
+def _configure():
+    """Configure the Gemini SDK once per process"""
+    global _configured
+    if _configured:
+        return
+    with _configure_lock:
+        if _configured:
+            return
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY environment variable is not set")
+        genai.configure(api_key=api_key, transport=LLM_TRANSPORT)
+        _configured = True
+
+
+# Error text Gemini uses when the project quota or rate limit is exhausted
+# (a bare "exceeded" would also match our own deadline timeouts)
+QUOTA_ERROR_MARKERS = ('quota', 'rate limit', 'resource exhausted', 'resourceexhausted', '429')
+
+
+def is_quota_error(error: Exception) -> bool:
+    """True if a Gemini call failed because the quota / rate limit is exhausted"""
+    if isinstance(error, DeadlineExceeded):
+        return False
+    error_str = str(error).lower()
+    return any(marker in error_str for marker in QUOTA_ERROR_MARKERS)
+
+
+class LLMClient:
+    """
+    Thread-safe wrapper around one genai.GenerativeModel.
+    A semaphore bounds concurrent calls so bursts queue locally instead of
+    tripping Gemini rate limits; latency is tracked per call purpose.
+    """
+
+    def __init__(self, model_name: str = GEMINI_MODEL, max_concurrency: int = LLM_MAX_CONCURRENCY):
+        _configure()
+        self.model_name = model_name
+        self._model = genai.GenerativeModel(model_name)
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def _record(self, purpose: str, latency: float, error: bool = False):
+        with self._stats_lock:
+            stats = self._stats.setdefault(purpose, {
+                "calls": 0, "errors": 0, "total_latency": 0.0, "recent": deque(maxlen=200)
+            })
+            stats["calls"] += 1
+            stats["errors"] += int(error)
+            stats["total_latency"] += latency
+            stats["recent"].append(latency)
+
+    def generate(self, prompt, purpose: str = "generation") -> str:
+        """Run one generate_content call and return the response text"""
+        with self._semaphore:
+            start = time.perf_counter()
+            try:
+                response = self._model.generate_content(prompt)
+                text = response.text
+            except Exception:
+                self._record(purpose, time.perf_counter() - start, error=True)
+                raise
+        latency = time.perf_counter() - start
+        self._record(purpose, latency)
+        print(f"⏱️ Gemini {purpose}: {latency * 1000:.0f}ms")
+        return text
+
+    def stream(self, prompt, purpose: str = "generation") -> Iterator[str]:
+        """Yield response text chunks as Gemini produces them"""
+        with self._semaphore:
+            start = time.perf_counter()
+            error = False
+            try:
+                for chunk in self._model.generate_content(prompt, stream=True):
+                    # Chunks without parts (e.g. the final finish_reason) have no text
+                    if chunk.parts:
+                        yield chunk.text
+            except Exception:
+                error = True
+                raise
+            finally:
+                self._record(purpose, time.perf_counter() - start, error=error)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-purpose call counts and latency percentiles (ms)"""
+        with self._stats_lock:
+            report = {}
+            for purpose, stats in self._stats.items():
+                recent = sorted(stats["recent"])
+                report[purpose] = {
+                    "calls": stats["calls"],
+                    "errors": stats["errors"],
+                    "avg_ms": round(stats["total_latency"] / stats["calls"] * 1000, 1),
+                    "p50_ms": round(recent[len(recent) // 2] * 1000, 1),
+                    "p95_ms": round(recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000, 1)
+                }
+            return report
+
+
+def get_llm_client(model_name: Optional[str] = None) -> LLMClient:
+    """Return the shared client for a model, creating it on first use"""
+    model_name = model_name or GEMINI_MODEL
+    client = _clients.get(model_name)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(model_name)
+            if client is None:
+                client = LLMClient(model_name)
+                _clients[model_name] = client
+    return client
+
+
+def get_llm_stats() -> Dict[str, Any]:
+    """Latency stats for every shared client"""
+    return {name: {"max_concurrency": client.max_concurrency, "calls": client.stats()}
+            for name, client in list(_clients.items())}
@@ -0,0 +1,182 @@
+"""
+Passage Embedding Cache
+Chunk embeddings keyed by (model, input_type, sha256(text)), kept on disk so
+rebuilds, backend switches and test runs only pay the embedding API for text
+that was never embedded before.
+
+Each (model, input_type, dimension) gets one shard of two append-only files:
+  - <shard>.f32: raw float32 rows, memory-mapped for reads
+  - <shard>.idx: one sha256 hex digest per line; line n is row n
+Rows are appended before their digests, so the index never points past the
+data even if a write is interrupted; if the files still end up out of step
+(a crash mid-write), the next append truncates both to the rows they agree
+on. Appends take an advisory file lock where the platform has one, so
+several workers can share a shard.
+"""
+
+import os
+import re
+import hashlib
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single writer process assumed
+    fcntl = None
+
+_DIGEST_LINE_BYTES = 65  # 64 hex chars + newline
+
+
+def text_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class _Shard:
+    """Vectors of one (model, input_type, dimension)"""
+
+    def __init__(self, base_path: str, dimension: int):
+        self.data_path = base_path + ".f32"
+        self.index_path = base_path + ".idx"
+        self.dimension = dimension
+        self.row_bytes = 4 * dimension
+        self._reset()
+        self.refresh()
+
+    def _reset(self):
+        self.rows: Dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._index_bytes = 0
+        self._last_line = b""
+
+    def _data_bytes(self) -> int:
+        return os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0
+
+    def _line_before(self, offset: int) -> bytes:
+        with open(self.index_path, "rb") as f:
+            f.seek(offset - _DIGEST_LINE_BYTES)
+            return f.read(_DIGEST_LINE_BYTES)
+
+    def refresh(self):
+        """Pick up rows appended since the last look (possibly by another process)"""
+        size = os.path.getsize(self.index_path) if os.path.exists(self.index_path) else 0
+        if self._index_bytes and (size < self._index_bytes or self._last_line != self._line_before(self._index_bytes)):
+            # Repaired (truncated) by another process, possibly regrown since:
+            # the last line we read is gone or different, so start over
+            self._reset()
+        if size == self._index_bytes:
+            return
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_bytes)
+            tail = f.read(size - self._index_bytes)
+        complete = len(tail) - len(tail) % _DIGEST_LINE_BYTES
+        first_row = self._index_bytes // _DIGEST_LINE_BYTES
+        for row, line in enumerate(tail[:complete].decode("ascii").splitlines(), first_row):
+            self.rows.setdefault(line, row)
+        self._index_bytes += complete
+        if complete:
+            self._last_line = tail[complete - _DIGEST_LINE_BYTES:complete]
+
+        n = min(self._index_bytes // _DIGEST_LINE_BYTES, self._data_bytes() // self.row_bytes)
+        self._matrix = np.memmap(self.data_path, dtype=np.float32, mode="r", shape=(n, self.dimension)) if n else None
+
+    def get(self, digest: str) -> Optional[np.ndarray]:
+        row = self.rows.get(digest)
+        if row is None or self._matrix is None or row >= self._matrix.shape[0]:
+            return None
+        return np.array(self._matrix[row])
+
+    def append(self, digests: Sequence[str], vectors: np.ndarray):
+        os.makedirs(os.path.dirname(self.data_path) or ".", exist_ok=True)
+        with open(self.index_path, "ab") as index_file:
+            if fcntl is not None:
+                fcntl.flock(index_file, fcntl.LOCK_EX)
+            try:
+                # Another process may have appended since our last refresh
+                self.refresh()
+                new = {d: v for d, v in zip(digests, vectors) if d not in self.rows}
+                if not new:
+                    return
+                self._repair()
+                with open(self.data_path, "ab") as data_file:
+                    data_file.write(np.asarray(list(new.values()), dtype=np.float32).tobytes())
+                    data_file.flush()
+                    os.fsync(data_file.fileno())
+                index_file.write("".join(f"{d}\n" for d in new).encode("ascii"))
+                index_file.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(index_file, fcntl.LOCK_UN)
+        self.refresh()
+
+    def _repair(self):
+        """
+        Truncate both files to the rows they agree on, if an interrupted write
+        left them out of step (a data tail without digests, a torn index line).
+        Called with the shard lock held, after refresh().
+        """
+        index_bytes = os.path.getsize(self.index_path) if os.path.exists(self.index_path) else 0
+        data_bytes = self._data_bytes()
+        index_rows = index_bytes // _DIGEST_LINE_BYTES
+        if index_bytes % _DIGEST_LINE_BYTES == 0 and data_bytes == index_rows * self.row_bytes:
+            return
+        keep = min(index_rows, data_bytes // self.row_bytes)
+        # Drop our mapping before shrinking the file under it
+        self._matrix = None
+        if os.path.exists(self.data_path):
+            os.truncate(self.data_path, keep * self.row_bytes)
+        os.truncate(self.index_path, keep * _DIGEST_LINE_BYTES)
+        print(f"🩹 Repaired passage cache shard {os.path.basename(self.index_path)[:-4]}: "
+              f"kept {keep} rows (index {index_bytes} bytes, data {data_bytes} bytes)")
+        self._reset()
+        self.refresh()
+
+
+class PassageEmbeddingCache:
+    """Persistent (model, input_type, sha256(text)) -> float32 vector store"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._shards: Dict[Tuple[str, str, int], _Shard] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def _shard(self, model: str, input_type: str, dimension: int) -> _Shard:
+        key = (model, input_type, dimension)
+        shard = self._shards.get(key)
+        if shard is None:
+            name = re.sub(r"[^A-Za-z0-9._-]+", "_", f"{model}.{input_type}.{dimension}")
+            shard = self._shards[key] = _Shard(os.path.join(self.directory, name), dimension)
+        return shard
+
+    def lookup(self, model: str, input_type: str, dimension: int,
+               texts: Sequence[str]) -> Tuple[List[Optional[np.ndarray]], List[int]]:
+        """(vector or None per text, indices of the texts that missed)"""
+        digests = [text_digest(text) for text in texts]
+        with self._lock:
+            shard = self._shard(model, input_type, dimension)
+            shard.refresh()
+            vectors = [shard.get(digest) for digest in digests]
+            missing = [i for i, vector in enumerate(vectors) if vector is None]
+            self._hits += len(texts) - len(missing)
+            self._misses += len(missing)
+        return vectors, missing
+
+    def store(self, model: str, input_type: str, texts: Sequence[str], vectors: np.ndarray):
+        """Persist freshly computed embeddings"""
+        if not len(texts):
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            self._shard(model, input_type, vectors.shape[1]).append([text_digest(t) for t in texts], vectors)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "entries": sum(len(shard.rows) for shard in self._shards.values())
+            }
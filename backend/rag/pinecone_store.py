@@ -1,16 +1,47 @@
 """
 Pinecone Vector Store Implementation
 Replaces ChromaDB with cloud-native Pinecone
+Embeddings come from EMBEDDING_BACKEND (Pinecone inference or a local model,
+see embeddings.py); vectors are stored in whichever backend VECTOR_BACKEND
+selects (see vector_store.py). Each rebuild goes into a new index generation
+that readers switch to atomically once it is complete (see index_generations.py)
 """
 
 import os
-from typing import List, Dict
+import json
+import time
+import threading
+from typing import List, Dict, Optional, Any, Tuple
+import numpy as np
 from dotenv import load_dotenv
 from pinecone import Pinecone, ServerlessSpec
 from langchain.docstore.document import Document
-from .data_loading import load_all_json_files
-from .text_chunking import extract_section_texts, split_documents
+from .data_loading import load_named_json_files
+from .text_chunking import extract_section_texts, split_documents, CHUNK_SCHEMA_VERSION
+from .fact_engine import rebuild_fact_index
+from .cache import bump_data_version, compute_data_version, get_data_version, EmbeddingCache
+from .config import (
+    CHUNK_SIZE, CHUNK_OVERLAP,
+    QUERY_EMBEDDING_CACHE_SIZE, VECTOR_BACKEND, VECTOR_INDEX_DIR, HYBRID_SEARCH, HYBRID_CANDIDATE_FACTOR,
+    INDEX_VERIFY_TIMEOUT, INDEX_GC_DELAY, INDEX_POINTER_CHECK_INTERVAL,
+    EMBEDDING_BACKEND, LOCAL_EMBEDDING_MODEL, LOCAL_EMBEDDING_RUNTIME, EMBEDDING_BATCH_SIZE, EMBEDDING_THREADS,
+    ENABLE_PASSAGE_CACHE, PASSAGE_CACHE_DIR,
+    INGEST_BATCH_SIZE, INGEST_BATCH_MAX_BYTES, INGEST_EMBED_WORKERS, INGEST_UPSERT_WORKERS, INGEST_QUEUE_SIZE
+)
+from .vector_store import Filters, VectorStore, PineconeVectorStore, HnswVectorStore, NumpyVectorStore
+from .embeddings import Embedder, PineconeEmbedder, LocalEmbedder
+from .passage_cache import PassageEmbeddingCache
+from .ingestion import plan_batches, run_pipeline, estimate_record_bytes
+from .resilience import IngestCheckpoint
+from .sparse_index import rebuild_sparse_index, get_sparse_index, evict_sparse_index, fuse_hybrid
+from .chunk_manifest import assign_chunk_ids, build_manifest, load_manifest, save_manifest, diff_chunks
+from .index_generations import (
+    new_generation_name, is_generation, generation_dir, read_current_pointer, write_current_generation,
+    pointer_exists, build_lock,
+    list_local_generations, remove_local_generation
+)
 from functools import lru_cache
+from contextlib import contextmanager
 
 load_dotenv()
 
@@ -20,12 +51,53 @@ PINECONE_INDEX_NAME = "chatfolio"
 PINECONE_HOST = "https://chatfolio-5wg1pnt.svc.aped-4627-b74a.pinecone.io"
 PINECONE_EMBEDDING_MODEL = "llama-text-embed-v2"
 
-# Initialize Pinecone (singleton with connection pooling)
-pc = Pinecone(api_key=PINECONE_API_KEY)
+# BM25 index over the chunks, kept in each generation's local directory
+SPARSE_INDEX_FILE = "bm25_index.npz"
+
+# Pinecone copy of the CURRENT pointer: one record whose metadata names the live
+# generation and its build settings. The local file is the fast path; on a fresh
+# disk (e.g. a redeploy on an ephemeral filesystem) it is restored from this record.
+POINTER_NAMESPACE = "index-pointer"
+POINTER_RECORD_ID = "current"
+
+# IDs already upserted into a generation that is still being built (see resilience.py)
+CHECKPOINT_FILE = "ingest_checkpoint.jsonl"
+
+# Pinecone client (singleton with connection pooling), created on first use
+# so a fully local setup (local embeddings + local index) needs no Pinecone key
+_pinecone_client = None
 
 # Cache the index connection (reuse connection)
 _cached_index = None
 
+# Cache query embeddings (warm queries skip the embed network call)
+_query_embedding_cache = EmbeddingCache(max_entries=QUERY_EMBEDDING_CACHE_SIZE)
+
+# Persistent chunk embeddings (unchanged chunk text is never re-embedded)
+_passage_cache = PassageEmbeddingCache(PASSAGE_CACHE_DIR) if ENABLE_PASSAGE_CACHE else None
+
+# Vector and embedding backends shared by retrieval, embedding creation and auto-update.
+# _active is (generation, store), replaced as one object on cutover
+_active: Optional[Tuple[str, VectorStore]] = None
+_active_revision = 0
+_pointer_checked_at = 0.0
+_embedder: Optional[Embedder] = None
+_backend_lock = threading.Lock()
+# One rebuild at a time within this process; build_lock extends it across processes
+_reindex_lock = threading.Lock()
+# Delayed clean-ups scheduled by this process (see wait_for_old_generations)
+_gc_timers: List[threading.Timer] = []
+# Throughput of the most recent embed/upsert run (see ingestion.py)
+_last_ingestion: Optional[Dict[str, Any]] = None
+
+
+def get_pinecone_client() -> Pinecone:
+    """Get the shared Pinecone client"""
+    global _pinecone_client
+    if _pinecone_client is None:
+        _pinecone_client = Pinecone(api_key=PINECONE_API_KEY)
+    return _pinecone_client
+
 
 def get_pinecone_index():
     """Get or create Pinecone index with connection caching"""
@@ -36,6 +108,8 @@ def get_pinecone_index():
         return _cached_index
     
     try:
+        pc = get_pinecone_client()
+        
         # Check if index exists
         existing_indexes = pc.list_indexes()
         index_names = [idx['name'] for idx in existing_indexes]
@@ -62,158 +136,578 @@ def get_pinecone_index():
         raise
 
 
-def create_pinecone_embeddings(json_directory: str, chunk_size: int = 512, overlap: int = 120):
+def _open_store(generation: str) -> VectorStore:
+    """Vector store for one index generation"""
+    directory = generation_dir(VECTOR_INDEX_DIR, generation)
+    if VECTOR_BACKEND == "hnsw":
+        return HnswVectorStore(directory)
+    if VECTOR_BACKEND == "numpy":
+        return NumpyVectorStore(directory)
+    return PineconeVectorStore(get_pinecone_index(), namespace=generation)
+
+
+def _sparse_index_path(generation: str) -> str:
+    return os.path.join(generation_dir(VECTOR_INDEX_DIR, generation), SPARSE_INDEX_FILE)
+
+
+def _read_pointer_record() -> Optional[Dict[str, Any]]:
+    """Metadata of the Pinecone pointer record ({"generation", "settings"}), or None before the first cutover"""
+    return PineconeVectorStore(get_pinecone_index(), namespace=POINTER_NAMESPACE).fetch_metadata(POINTER_RECORD_ID)
+
+
+def _write_pointer_record(generation: str, settings: Dict[str, Any], dimension: int):
+    """Record the live generation in Pinecone (the record needs a non-zero vector of the index's dimension)"""
+    values = np.zeros(dimension, dtype=np.float32)
+    values[0] = 1.0
+    PineconeVectorStore(get_pinecone_index(), namespace=POINTER_NAMESPACE).upsert([{
+        "id": POINTER_RECORD_ID,
+        "values": values,
+        "metadata": {"generation": generation, "settings": json.dumps(settings, sort_keys=True)}
+    }])
+
+
+def _read_pointer() -> Tuple[str, int]:
     """
-    Create embeddings and store in Pinecone
-    
-    Args:
-        json_directory: Directory containing JSON files
-        chunk_size: Size of text chunks
-        overlap: Overlap between chunks
+    (generation, revision) named by the CURRENT file. With Pinecone, a missing
+    file is restored from the pointer record, or - for indexes built before
+    the record existed - from the newest generation namespace holding vectors.
+    """
+    if VECTOR_BACKEND in ("hnsw", "numpy") or pointer_exists(VECTOR_INDEX_DIR):
+        return read_current_pointer(VECTOR_INDEX_DIR)
+    record = _read_pointer_record()
+    if record is not None:
+        generation = record.get("generation", "")
+    else:
+        namespaces = PineconeVectorStore(get_pinecone_index()).namespaces()
+        generation = max((ns for ns in namespaces if is_generation(ns)), default="")
+    if not generation:
+        return "", 0
+    print(f"📌 Restored index pointer from Pinecone: generation {generation}")
+    return generation, write_current_generation(VECTOR_INDEX_DIR, generation)
+
+
+def _read_generation() -> str:
+    return _read_pointer()[0]
+
+
+def _get_active(refresh: bool = False) -> Tuple[str, VectorStore]:
+    """
+    Current (generation, store). The pointer file is re-read at most every
+    INDEX_POINTER_CHECK_INTERVAL seconds (or now, with refresh=True), so a
+    rebuild or incremental update done by another worker or a script is
+    picked up without a restart.
+    """
+    global _active, _active_revision, _pointer_checked_at
+    now = time.monotonic()
+    if refresh or _active is None or now - _pointer_checked_at >= INDEX_POINTER_CHECK_INTERVAL:
+        with _backend_lock:
+            if refresh or _active is None or now - _pointer_checked_at >= INDEX_POINTER_CHECK_INTERVAL:
+                generation, revision = _read_pointer()
+                if _active is None or _active[0] != generation:
+                    if _active is not None:
+                        print(f"🔀 Index generation changed to {generation or '(unversioned)'}, switching")
+                    _active = (generation, _open_store(generation))
+                elif revision != _active_revision:
+                    # Updated in place by another process: reload its vectors and BM25 index
+                    print(f"🔄 Index generation {generation or '(unversioned)'} was updated, reloading")
+                    evict_sparse_index(_sparse_index_path(generation))
+                    _active = (generation, _open_store(generation))
+                _active_revision = revision
+                _pointer_checked_at = now
+    return _active
+
+
+def get_vector_store() -> VectorStore:
+    """Get the vector store of the current index generation (created, or loaded from disk, on first use)"""
+    return _get_active()[1]
+
+
+def get_current_generation() -> str:
+    """Name of the index generation readers use ("" = unversioned layout)"""
+    return _get_active()[0]
+
+
+def get_embedder() -> Embedder:
+    """Get the configured embedding backend (a local model is loaded on first use)"""
+    global _embedder
+    if _embedder is None:
+        with _backend_lock:
+            if _embedder is None:
+                if EMBEDDING_BACKEND == "local":
+                    _embedder = LocalEmbedder(
+                        LOCAL_EMBEDDING_MODEL, batch_size=EMBEDDING_BATCH_SIZE,
+                        threads=EMBEDDING_THREADS, runtime=LOCAL_EMBEDDING_RUNTIME
+                    )
+                else:
+                    _embedder = PineconeEmbedder(get_pinecone_client(), PINECONE_EMBEDDING_MODEL)
+    return _embedder
+
+
+def _verify_generation(store: VectorStore, expected: int, probe: np.ndarray):
+    """Wait until the new generation holds every vector and answers a query"""
+    deadline = time.monotonic() + INDEX_VERIFY_TIMEOUT
+    # Pinecone's stats are eventually consistent, so poll until the count settles
+    while store.count() < expected:
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"New index generation has {store.count()}/{expected} vectors")
+        time.sleep(1)
+    while not store.query(probe, top_k=1):
+        if time.monotonic() > deadline:
+            raise RuntimeError("New index generation returns no results")
+        time.sleep(1)
+
+
+def _remove_generation(generation: str):
+    """Delete one generation's vectors and local files"""
+    if VECTOR_BACKEND not in ("hnsw", "numpy"):
+        _open_store(generation).clear()
+    remove_local_generation(VECTOR_INDEX_DIR, generation)
+    evict_sparse_index(_sparse_index_path(generation))
+
+
+@contextmanager
+def _exclusive_build():
+    """Hold the build lock of this process and of the index directory"""
+    with _reindex_lock, build_lock(VECTOR_INDEX_DIR):
+        yield
+
+
+def collect_old_generations(keep: str):
+    """Delete every index generation except `keep` and the one CURRENT names"""
+    with _exclusive_build():
+        _collect_old_generations(keep)
+
+
+def wait_for_old_generations():
+    """
+    Block until the delayed clean-ups this process scheduled have run.
+    For scripts that exit right after a rebuild: other workers only re-read
+    the pointer every INDEX_POINTER_CHECK_INTERVAL and may still be querying
+    the old generation, so the grace period is waited out, never skipped.
+    """
+    while _gc_timers:
+        timer = _gc_timers.pop(0)
+        if timer.is_alive():
+            print(f"⏳ Waiting up to {INDEX_GC_DELAY:.0f}s for readers to leave the old index generation...")
+        timer.join()
+
+
+def _collect_old_generations(keep: str):
+    # Runs under the build lock, so no build is in progress; whatever CURRENT
+    # names now (possibly another process's newer build) is kept as well
+    keep_generations = {keep, _read_generation()}
+    stale = [generation for generation in list_local_generations(VECTOR_INDEX_DIR) if generation not in keep_generations]
+    if VECTOR_BACKEND not in ("hnsw", "numpy"):
+        index_store = PineconeVectorStore(get_pinecone_index())
+        stale += [
+            ns for ns in index_store.namespaces()
+            if is_generation(ns) and ns not in keep_generations and ns not in stale
+        ]
+    if "" not in keep_generations:
+        stale.append("")  # the unversioned layout
+    for generation in stale:
+        try:
+            _remove_generation(generation)
+        except Exception as e:
+            print(f"⚠️ Could not remove index generation {generation or '(unversioned)'}: {e}")
+    print(f"🧹 Removed {len(stale)} old index generation(s)")
+
+
+def _checkpoint(generation: str) -> IngestCheckpoint:
+    return IngestCheckpoint(os.path.join(generation_dir(VECTOR_INDEX_DIR, generation), CHECKPOINT_FILE))
+
+
+def _resumable_generation(settings: Dict[str, Any]) -> Tuple[Optional[str], set]:
+    """
+    (generation, IDs already upserted) of the newest unfinished build with these
+    settings, or (None, empty set). Only Pinecone writes are durable before flush(),
+    so local backends always start a fresh generation.
+    """
+    if VECTOR_BACKEND in ("hnsw", "numpy"):
+        return None, set()
+    current = _read_generation()
+    for generation in reversed(list_local_generations(VECTOR_INDEX_DIR)):
+        if generation == current:
+            continue
+        state = _checkpoint(generation).load()
+        if state is not None and state["settings"] == settings:
+            return generation, state["committed"]
+    return None, set()
+
+
+def _switch_generation(generation: str, store: VectorStore, settings: Dict[str, Any]):
+    """Point readers at a new generation (Pinecone pointer record, atomic pointer file write, in-process swap)"""
+    global _active, _active_revision, _pointer_checked_at
+    if VECTOR_BACKEND not in ("hnsw", "numpy"):
+        _write_pointer_record(generation, settings, settings["dimension"])
+    with _backend_lock:
+        _active_revision = write_current_generation(VECTOR_INDEX_DIR, generation)
+        _active = (generation, store)
+        _pointer_checked_at = time.monotonic()
+
+
+def _load_chunks(json_directory: str, chunk_size: int, overlap: int):
+    """
+    Load and chunk the data files.
+    Returns (json_objects, chunk ids, chunk metadata incl. text), or None if there is nothing to index.
     """
     print(f"\n🔍 Loading data from: {json_directory}")
     
     # 1. Load JSON files
-    json_objects = load_all_json_files(json_directory)
-    if not json_objects:
+    named_objects = load_named_json_files(json_directory)
+    if not named_objects:
         print("❌ No JSON files found")
         return None
     
-    # 2. Extract sections into documents
+    # 2. Extract sections into documents, remembering the file each came from
     docs = []
-    for json_object in json_objects:
-        docs.extend(extract_section_texts(json_object))
+    for filename, json_object in named_objects:
+        for doc in extract_section_texts(json_object):
+            doc.metadata['source'] = filename
+            docs.append(doc)
     
     # 3. Split into chunks
     split_docs = split_documents(docs, chunk_size=chunk_size, overlap=overlap)
     print(f"📝 Created {len(split_docs)} chunks from documents")
+    if not split_docs:
+        print("❌ No chunks to index")
+        return None
     
-    # 4. Get Pinecone index
-    index = get_pinecone_index()
+    # Each chunk's full metadata (section, category, company, project, source, ...)
+    # is stored with its vector so queries can filter on it
+    chunk_metadata = [
+        {
+            **doc.metadata,
+            'text': doc.page_content[:2048],  # llama-text-embed-v2 max tokens
+            'section': doc.metadata.get('section', 'unknown')
+        }
+        for doc in split_docs
+    ]
+    # Content-hash IDs: an unchanged chunk keeps its ID across rebuilds
+    ids = assign_chunk_ids(chunk_metadata)
+    return [json_object for _, json_object in named_objects], ids, chunk_metadata
+
+
+def _index_settings(embedder: Embedder, chunk_size: int, overlap: int) -> Dict[str, Any]:
+    """What the stored vectors depend on besides the chunk text"""
+    return {
+        "embedding_model": embedder.model_name,
+        "dimension": embedder.dimension,
+        "chunk_size": chunk_size,
+        "overlap": overlap,
+        "chunk_schema": CHUNK_SCHEMA_VERSION
+    }
+
+
+def _embed_passages(embedder: Embedder, texts: List[str]) -> np.ndarray:
+    """Embed chunk texts, reusing vectors from the passage cache and embedding only the misses"""
+    if _passage_cache is None:
+        return embedder.embed_passages(texts)
+    cached, missing = _passage_cache.lookup(embedder.model_name, "passage", embedder.dimension, texts)
+    if missing:
+        fresh = embedder.embed_passages([texts[i] for i in missing])
+        _passage_cache.store(embedder.model_name, "passage", [texts[i] for i in missing], fresh)
+        for i, vector in zip(missing, fresh):
+            cached[i] = vector
+    return np.asarray(cached, dtype=np.float32)
+
+
+def _embed_and_upsert(store: VectorStore, embedder: Embedder, ids: List[str],
+                      chunk_metadata: List[Dict[str, Any]],
+                      checkpoint: Optional[IngestCheckpoint] = None) -> Optional[np.ndarray]:
+    """
+    Embed and upsert chunks through the ingestion pipeline; returns one embedding (a verification probe).
+    With a checkpoint, every acknowledged batch is recorded so an interrupted build can resume.
+    """
+    global _last_ingestion
+    batches = plan_batches(ids, chunk_metadata, embedder.dimension, INGEST_BATCH_SIZE, INGEST_BATCH_MAX_BYTES)
+
+    def embed(batch: List[int]) -> np.ndarray:
+        return _embed_passages(embedder, [chunk_metadata[i]['text'] for i in batch])
+
+    def upsert(batch: List[int], embeddings: np.ndarray):
+        store.upsert([
+            {'id': ids[i], 'values': embeddings[j], 'metadata': chunk_metadata[i]}
+            for j, i in enumerate(batch)
+        ])
+        if checkpoint is not None:
+            checkpoint.commit([ids[i] for i in batch])
+
+    stats = run_pipeline(
+        batches, embed, upsert,
+        embed_workers=INGEST_EMBED_WORKERS, upsert_workers=INGEST_UPSERT_WORKERS, queue_size=INGEST_QUEUE_SIZE,
+        batch_bytes=lambda batch: sum(
+            estimate_record_bytes(ids[i], chunk_metadata[i], embedder.dimension) for i in batch
+        )
+    )
+    probe = stats.pop("probe")
+    _last_ingestion = stats
+    return probe
+
+
+def _refresh_data_version(json_directory: str, json_objects: List[Dict[str, Any]]):
+    """Rebuild the fact tables and invalidate cached answers if the data changed"""
+    rebuild_fact_index(json_objects)
+    version = compute_data_version(json_directory)
+    if version != get_data_version():
+        bump_data_version(version)
+
+
+def create_pinecone_embeddings(json_directory: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP):
+    """
+    Build a new index generation from the data files and switch readers to it.
     
-    # 5. Generate embeddings using Pinecone's API and upsert
-    print(f"🧠 Generating embeddings with Pinecone's {PINECONE_EMBEDDING_MODEL} and uploading...")
+    The current generation keeps serving queries while the new one is
+    embedded, uploaded and verified; the switch is one atomic pointer write
+    and old generations are deleted INDEX_GC_DELAY seconds later (so queries
+    already running on them can finish).
     
-    vectors_to_upsert = []
-    batch_size = 96  # Pinecone API batch limit
+    Args:
+        json_directory: Directory containing JSON files
+        chunk_size: Size of text chunks
+        overlap: Overlap between chunks
+    """
+    with _exclusive_build():
+        loaded = _load_chunks(json_directory, chunk_size, overlap)
+        if loaded is None:
+            return None
+        return _build_generation(json_directory, chunk_size, overlap, *loaded)
+
+
+def update_embeddings(json_directory: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP):
+    """
+    Bring the current index generation in line with the data files, touching
+    only what changed: chunks not in the generation's manifest are embedded
+    and upserted, chunks no longer produced by the data are deleted.
+    Falls back to a full rebuild (create_pinecone_embeddings) when the
+    generation is empty, has no manifest or was built with other settings.
+    Safe to call from every worker at startup: builds are serialized across
+    processes and the later callers find the index already up to date.
     
-    for i, doc in enumerate(split_docs):
-        # Prepare text for embedding (truncate if needed)
-        text = doc.page_content[:2048]  # llama-text-embed-v2 max tokens
+    Args:
+        json_directory: Directory containing JSON files
+        chunk_size: Size of text chunks
+        overlap: Overlap between chunks
+    """
+    with _exclusive_build():
+        loaded = _load_chunks(json_directory, chunk_size, overlap)
+        if loaded is None:
+            return None
+        json_objects, ids, chunk_metadata = loaded
         
-        # Create vector with metadata (embedding will be generated by Pinecone)
-        vector = {
-            'id': f'doc_{i}',
-            'metadata': {
-                'text': text,
-                'section': doc.metadata.get('section', 'unknown'),
-                'chunk_index': i
-            }
-        }
+        # Another worker may have just built or updated the index
+        generation, store = _get_active(refresh=True)
+        directory = generation_dir(VECTOR_INDEX_DIR, generation)
+        embedder = get_embedder()
+        settings = _index_settings(embedder, chunk_size, overlap)
+        manifest = load_manifest(directory)
+        if manifest is None and VECTOR_BACKEND not in ("hnsw", "numpy"):
+            manifest = _recover_manifest(generation, store, settings, ids, chunk_metadata)
+        if manifest is None or manifest["settings"] != settings or store.count() == 0:
+            print("♻️ Index is empty, has no manifest or was built with other settings - full rebuild")
+            return _build_generation(json_directory, chunk_size, overlap, *loaded)
         
-        vectors_to_upsert.append((vector, text))
+        added, removed = diff_chunks(manifest, ids)
+        print(f"🧩 Incremental update of generation {generation or '(unversioned)'}: "
+              f"{len(added)} new, {len(removed)} removed, {len(ids) - len(added)} unchanged chunks")
+        if added or removed:
+            # Upsert before deleting so a changed chunk is never missing from the index
+            position = {vector_id: i for i, vector_id in enumerate(ids)}
+            _embed_and_upsert(store, embedder, added, [chunk_metadata[position[i]] for i in added])
+            store.delete(removed)
+            store.flush()
+        if added or removed or not os.path.exists(_sparse_index_path(generation)):
+            rebuild_sparse_index(_sparse_index_path(generation), ids=ids, metadata=chunk_metadata)
+            save_manifest(directory, build_manifest(settings, ids, chunk_metadata))
+            # New revision of the same generation: other workers reload their copy
+            _switch_generation(generation, store, settings)
         
-        # Batch upsert with embeddings
-        if len(vectors_to_upsert) >= batch_size:
-            # Generate embeddings via Pinecone API
-            texts_batch = [v[1] for v in vectors_to_upsert]
-            embeddings_response = pc.inference.embed(
-                model=PINECONE_EMBEDDING_MODEL,
-                inputs=texts_batch,
-                parameters={"input_type": "passage"}
-            )
-            
-            # Create vectors with embeddings
-            vectors_with_embeddings = []
-            for j, (vec, _) in enumerate(vectors_to_upsert):
-                vec['values'] = embeddings_response[j]['values']
-                vectors_with_embeddings.append(vec)
-            
-            # Upsert to index
-            index.upsert(vectors=vectors_with_embeddings)
-            print(f"   ✅ Uploaded {len(vectors_with_embeddings)} vectors (total: {i+1}/{len(split_docs)})")
-            vectors_to_upsert = []
-    
-    # Upload remaining vectors
-    if vectors_to_upsert:
-        texts_batch = [v[1] for v in vectors_to_upsert]
-        embeddings_response = pc.inference.embed(
-            model=PINECONE_EMBEDDING_MODEL,
-            inputs=texts_batch,
-            parameters={"input_type": "passage"}
+        _refresh_data_version(json_directory, json_objects)
+        return store
+
+
+def _recover_manifest(generation: str, store: PineconeVectorStore, settings: Dict[str, Any],
+                      ids: List[str], chunk_metadata: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Rebuild a lost manifest (fresh disk) from what Pinecone holds: the pointer
+    record's settings and the namespace's chunk IDs. Returns None if the record
+    does not describe this generation with these settings.
+    """
+    record = _read_pointer_record()
+    if record is None or record.get("generation") != generation or \
+            record.get("settings") != json.dumps(settings, sort_keys=True):
+        return None
+    by_id = dict(zip(ids, chunk_metadata))
+    indexed = store.list_ids()
+    manifest = build_manifest(settings, indexed, [by_id.get(vector_id, {}) for vector_id in indexed])
+    save_manifest(generation_dir(VECTOR_INDEX_DIR, generation), manifest)
+    print(f"🩹 Recovered the manifest of generation {generation} from Pinecone ({len(indexed)} chunks)")
+    return manifest
+
+
+def _build_generation(json_directory: str, chunk_size: int, overlap: int,
+                      json_objects: List[Dict[str, Any]], ids: List[str], chunk_metadata: List[Dict[str, Any]]):
+    # 4. Open an empty store for the new generation, or resume an interrupted build
+    embedder = get_embedder()
+    settings = _index_settings(embedder, chunk_size, overlap)
+    generation, committed = _resumable_generation(settings)
+    resuming = generation is not None
+    if not resuming:
+        generation = new_generation_name()
+    store = _open_store(generation)
+    if store.dimension not in (None, embedder.dimension):
+        raise ValueError(
+            f"{embedder.model_name} produces {embedder.dimension}-dim vectors but the Pinecone index "
+            f"is {store.dimension}-dim; use a local VECTOR_BACKEND with EMBEDDING_BACKEND=local"
         )
-        
-        vectors_with_embeddings = []
-        for j, (vec, _) in enumerate(vectors_to_upsert):
-            vec['values'] = embeddings_response[j]['values']
-            vectors_with_embeddings.append(vec)
-        
-        index.upsert(vectors=vectors_with_embeddings)
-        print(f"   ✅ Uploaded {len(vectors_with_embeddings)} vectors")
+    checkpoint = None
+    if VECTOR_BACKEND not in ("hnsw", "numpy"):
+        checkpoint = _checkpoint(generation)
+        if resuming:
+            wanted = set(ids)
+            store.delete([vector_id for vector_id in committed if vector_id not in wanted])
+            print(f"⏯️ Resuming generation {generation}: {len(committed & wanted)}/{len(ids)} chunks already uploaded")
+        else:
+            checkpoint.start(settings)
     
-    print(f"\n✅ Successfully created and uploaded {len(split_docs)} embeddings to Pinecone!")
+    # 5. Generate embeddings and upsert
+    print(f"🧠 Generating embeddings with {embedder.model_name} into generation {generation}...")
+    pending = [i for i, vector_id in enumerate(ids) if vector_id not in committed]
+    probe = _embed_and_upsert(
+        store, embedder, [ids[i] for i in pending], [chunk_metadata[i] for i in pending], checkpoint
+    )
+    store.flush()
+    if probe is None:
+        probe = _embed_passages(embedder, [chunk_metadata[0]['text']])[0]
+    
+    # 6. Sparse (BM25) index and manifest for the same chunks
+    directory = generation_dir(VECTOR_INDEX_DIR, generation)
+    rebuild_sparse_index(_sparse_index_path(generation), ids=ids, metadata=chunk_metadata)
+    save_manifest(directory, build_manifest(settings, ids, chunk_metadata))
+    print(f"\n✅ Successfully created and uploaded {len(ids)} embeddings to {store.name}!")
+    
+    # 7. Verify before anyone reads from it; a failed build is thrown away
+    try:
+        _verify_generation(store, len(ids), probe)
+    except Exception:
+        _remove_generation(generation)
+        raise
+    print(f"📊 Index stats: {store.count()} vectors in generation {generation}")
+    if checkpoint is not None:
+        checkpoint.remove()
+    
+    # 8. Cut over: direct lookups, vectors and cache version switch together
+    _switch_generation(generation, store, settings)
+    rebuild_fact_index(json_objects)
+    bump_data_version(compute_data_version(json_directory))
+    print(f"🔀 Readers switched to index generation {generation}")
     
-    # Verify
-    stats = index.describe_index_stats()
-    print(f"📊 Index stats: {stats['total_vector_count']} vectors in index")
+    # 9. Drop the old generations once in-flight queries are done with them
+    if INDEX_GC_DELAY > 0:
+        timer = threading.Timer(INDEX_GC_DELAY, collect_old_generations, args=(generation,))
+        timer.daemon = True
+        timer.start()
+        _gc_timers.append(timer)
+    else:
+        _collect_old_generations(generation)  # the caller holds the build lock
     
-    return index
+    return store
 
 
-def retrieve_from_pinecone(query: str, top_k: int = 5) -> List[Document]:
+def embed_query(query: str) -> np.ndarray:
+    """Generate a query embedding with the configured embedding backend (LRU-cached)"""
+    embedder = get_embedder()
+    cached = _query_embedding_cache.get_embedding(embedder.model_name, query)
+    if cached is not None:
+        return cached
+    
+    return _query_embedding_cache.put_embedding(
+        embedder.model_name, query, embedder.embed_query(query)
+    )
+
+
+def get_embedding_cache_stats() -> Dict[str, Any]:
+    """Hit/miss/eviction counters for the query embedding cache"""
+    return _query_embedding_cache.stats()
+
+
+def get_ingestion_stats() -> Optional[Dict[str, Any]]:
+    """Throughput of the most recent embed/upsert run in this process (None before the first)"""
+    return _last_ingestion
+
+
+def get_passage_cache_stats() -> Optional[Dict[str, int]]:
+    """Hit/miss counters for the on-disk chunk embedding cache (None when disabled)"""
+    return _passage_cache.stats() if _passage_cache is not None else None
+
+
+def _search(generation: str, store: VectorStore, query: str, query_embedding: np.ndarray, top_k: int,
+            filters: Optional[Filters]) -> List[Dict[str, Any]]:
     """
-    Retrieve relevant documents from Pinecone using Pinecone's embedding API
+    Dense search, fused with BM25 matches when the generation has a sparse index
+    (hybrid "score"s are then relative to the best match of each list, see fuse_hybrid)
+    """
+    sparse_index = get_sparse_index(_sparse_index_path(generation)) if HYBRID_SEARCH else None
+    if sparse_index is None:
+        return store.query(query_embedding, top_k=top_k, filters=filters)
+    
+    candidates = top_k * HYBRID_CANDIDATE_FACTOR
+    dense = store.query(query_embedding, top_k=candidates, filters=filters)
+    sparse = sparse_index.search(query, top_k=candidates, filters=filters)
+    return fuse_hybrid(dense, sparse, top_k)
+
+
+def retrieve_from_pinecone(query: str, top_k: int = 5, query_embedding: Optional[np.ndarray] = None,
+                           filters: Optional[Filters] = None) -> List[Document]:
+    """
+    Retrieve relevant documents from the vector backend
     
     Args:
         query: Search query
         top_k: Number of results to return
+        query_embedding: Precomputed embedding for query (skips the embed call)
+        filters: Metadata filter, e.g. {"company": ["ShorthillsAI"]}; when nothing
+            matches it, the search is repeated without it
     
     Returns:
         List of Document objects
     """
-    # Get index
-    index = get_pinecone_index()
+    generation, store = _get_active()
     
-    # Generate query embedding using Pinecone's API
-    query_embedding_response = pc.inference.embed(
-        model=PINECONE_EMBEDDING_MODEL,
-        inputs=[query],
-        parameters={"input_type": "query"}
-    )
-    query_embedding = query_embedding_response[0]['values']
+    # Generate query embedding
+    if query_embedding is None:
+        query_embedding = embed_query(query)
     
-    # Search Pinecone
-    results = index.query(
-        vector=query_embedding,
-        top_k=top_k,
-        include_metadata=True
-    )
+    # Search the vector backend, narrowed by the metadata filter if one applies
+    matches = _search(generation, store, query, query_embedding, top_k, filters)
+    if filters and not matches:
+        print(f"🔎 No chunks match filter {filters}, searching everything")
+        matches = _search(generation, store, query, query_embedding, top_k, None)
     
     # Convert to LangChain Document format
     documents = []
-    for match in results['matches']:
+    for match in matches:
+        metadata = {key: value for key, value in match['metadata'].items() if key not in ('text', 'chunk_index')}
         doc = Document(
             page_content=match['metadata']['text'],
-            metadata={
-                'section': match['metadata']['section'],
-                'score': match['score']
-            }
+            metadata={**metadata, 'score': match['score']}
         )
         documents.append(doc)
     
-    print(f"🔍 Retrieved {len(documents)} documents from Pinecone")
+    filter_note = f" (filter {filters})" if filters else ""
+    print(f"🔍 Retrieved {len(documents)} documents from {store.name}{filter_note}")
     for i, doc in enumerate(documents, 1):
         print(f"   {i}. Section: {doc.metadata['section']} (Score: {doc.metadata['score']:.3f})")
     
     return documents
 
 
-def clear_pinecone_index():
-    """Delete all vectors from Pinecone index"""
+def clear_vector_store():
+    """Delete all vectors of the current index generation (readers see an empty index until a rebuild)"""
     try:
-        index = get_pinecone_index()
-        index.delete(delete_all=True)
-        print("✅ Pinecone index cleared")
+        store = get_vector_store()
+        store.clear()
+        print(f"✅ {store.name} index cleared")
     except Exception as e:
         print(f"❌ Error clearing index: {str(e)}")
 
@@ -226,7 +720,7 @@ if __name__ == "__main__":
     
     # Create embeddings
     json_directory = "backend/data"
-    create_pinecone_embeddings(json_directory, chunk_size=512, overlap=120)
+    create_pinecone_embeddings(json_directory)
     
     # Test retrieval
     print("\n" + "=" * 60)
@@ -0,0 +1,102 @@
+"""
+Reranker
+Post-retrieval stage between vector search and the prompt: rescores the
+retrieved chunks with a cheap local scorer (the retrieval score - dense
+similarity, or the fused dense/BM25 score with hybrid search - blended with
+IDF-weighted coverage of the query terms) and cuts the list where the scores
+fall off - below a fraction of the best score or at the first large gap - so
+a pointed question sends one or two chunks to Gemini instead of all top_k.
+Per-query and cumulative stats (chunks dropped, tokens saved) are kept for /stats.
+"""
+
+import math
+import threading
+from typing import Any, Dict, List, Tuple
+
+from .context_packer import estimate_tokens
+from .extractive import tokenize
+
+_stats_lock = threading.Lock()
+_stats = {"queries": 0, "chunks_in": 0, "chunks_dropped": 0, "tokens_saved": 0}
+
+
+def _lexical_scores(query_terms: List[str], chunk_terms: List[set]) -> List[float]:
+    """Share of the query's term weight each chunk covers (terms in every chunk weigh least)"""
+    n = len(chunk_terms)
+    weights = {}
+    for term in set(query_terms):
+        df = sum(term in terms for terms in chunk_terms)
+        weights[term] = math.log(1.0 + (n + 1) / (df + 0.5))
+    total = sum(weights.values())
+    if total == 0:
+        return [0.0] * n
+    return [sum(w for term, w in weights.items() if term in terms) / total for terms in chunk_terms]
+
+
+def rerank(
+    query: str,
+    chunks: List[Any],
+    lexical_weight: float = 0.3,
+    min_relative_score: float = 0.75,
+    max_score_gap: float = 0.15,
+    min_chunks: int = 1
+) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Reorder chunks by blended score and drop the tail.
+    A chunk is kept while its score is at least min_relative_score x the best
+    score and no more than max_score_gap (relative to the best) below the
+    previous kept chunk; the first min_chunks are always kept.
+    Returns (kept chunks, stats); each kept chunk gets metadata["rerank_score"].
+    """
+    if not chunks:
+        return chunks, {"chunks": 0, "kept": 0, "chunks_dropped": 0, "tokens_saved": 0}
+
+    query_terms = tokenize(query)
+    chunk_terms = [set(tokenize(chunk.page_content)) for chunk in chunks]
+    lexical = _lexical_scores(query_terms, chunk_terms)
+    # Base signal is the retrieval score: for hybrid search the fused 0-1 score
+    # (see sparse_index.fuse_hybrid), so a chunk found only by BM25 is not
+    # penalised for lacking a dense match. Ties keep the fused (RRF) order.
+    scored = sorted(
+        (
+            ((1.0 - lexical_weight) * float(chunk.metadata.get('score', 0.0)) + lexical_weight * lexical_score, i)
+            for i, (chunk, lexical_score) in enumerate(zip(chunks, lexical))
+        ),
+        key=lambda item: (-item[0], item[1])
+    )
+
+    best = scored[0][0]
+    kept, kept_indices = [], set()
+    previous = best
+    for score, i in scored:
+        if len(kept) >= min_chunks and best > 0:
+            if score < min_relative_score * best or previous - score > max_score_gap * best:
+                break
+        chunks[i].metadata['rerank_score'] = round(score, 4)
+        kept.append(chunks[i])
+        kept_indices.add(i)
+        previous = score
+
+    dropped = [chunk for i, chunk in enumerate(chunks) if i not in kept_indices]
+    stats = {
+        "chunks": len(chunks),
+        "kept": len(kept),
+        "chunks_dropped": len(dropped),
+        "tokens_saved": sum(estimate_tokens(chunk.page_content) for chunk in dropped)
+    }
+    with _stats_lock:
+        _stats["queries"] += 1
+        _stats["chunks_in"] += stats["chunks"]
+        _stats["chunks_dropped"] += stats["chunks_dropped"]
+        _stats["tokens_saved"] += stats["tokens_saved"]
+    return kept, stats
+
+
+def get_reranker_stats() -> Dict[str, Any]:
+    """Cumulative chunks dropped and tokens saved by the cutoff"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["avg_chunks_kept"] = (
+        round((stats["chunks_in"] - stats["chunks_dropped"]) / stats["queries"], 2) if stats["queries"] else 0.0
+    )
+    return stats
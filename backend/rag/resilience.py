@@ -0,0 +1,241 @@
+"""
+Resilience for Pinecone Calls
+Index builds make hundreds of inference and upsert calls; one transient
+429 or 5xx used to abort the whole build. This module gives those calls:
+  - retries with jittered exponential backoff ("full jitter": a random wait
+    up to base * 2^attempt, capped), or exactly the server's Retry-After
+  - adaptive batch sizes: a 413 (payload too large) or 429 (rate limited)
+    halves the batch for the following calls; sizes grow back after a run
+    of successes
+  - an ingestion checkpoint: IDs whose upsert was acknowledged, so a build
+    that still fails can be resumed later instead of starting over
+Errors that are not transient (400, 401, 404, ...) are raised at once.
+"""
+
+import os
+import json
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, TypeVar
+
+from .config import RETRY_MAX_ATTEMPTS, RETRY_BASE_DELAY, RETRY_MAX_DELAY
+
+T = TypeVar("T")
+
+# Worth retrying: request timeout, rate limit, server-side failures
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+# Worth retrying with a smaller batch
+SHRINK_STATUSES = {413, 429}
+# Network-level failures (client library class names differ between versions)
+TRANSIENT_ERROR_MARKERS = ("Connection", "Timeout", "Protocol")
+
+_stats_lock = threading.Lock()
+_stats = {"retries": 0, "batch_shrinks": 0, "gave_up": 0, "retry_wait_s": 0.0}
+
+
+def error_status(error: BaseException) -> Optional[int]:
+    """HTTP status of a failed call, if the exception carries one"""
+    for source in (error, getattr(error, "response", None)):
+        for attribute in ("status_code", "status"):
+            status = getattr(source, attribute, None)
+            if isinstance(status, int):
+                return status
+    return None
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the server asked us to wait (Retry-After header), if any"""
+    for source in (error, getattr(error, "response", None)):
+        headers = getattr(source, "headers", None) or {}
+        value = next((v for k, v in dict(headers).items() if k.lower() == "retry-after"), None)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
+def is_transient(error: BaseException) -> bool:
+    """True if the same call may succeed when repeated"""
+    status = error_status(error)
+    if status is not None:
+        return status in RETRYABLE_STATUSES
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    return any(marker in cls.__name__ for cls in type(error).__mro__ for marker in TRANSIENT_ERROR_MARKERS)
+
+
+def backoff_delay(attempt: int, base: float = RETRY_BASE_DELAY, cap: float = RETRY_MAX_DELAY) -> float:
+    """Full-jitter exponential backoff for the given (0-based) retry"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def _wait(error: BaseException, attempt: int) -> float:
+    delay = retry_after(error)
+    if delay is None:
+        delay = backoff_delay(attempt)
+    with _stats_lock:
+        _stats["retry_wait_s"] += delay
+    time.sleep(delay)
+    return delay
+
+
+def with_retries(fn: Callable[[], T], description: str, max_attempts: int = RETRY_MAX_ATTEMPTS,
+                 give_up_on: Sequence[int] = ()) -> T:
+    """
+    Call fn() until it succeeds, a non-transient error occurs or max_attempts
+    is reached. Statuses in give_up_on are raised at once (the caller handles them).
+    """
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except Exception as e:
+            if not is_transient(e) or error_status(e) in give_up_on:
+                raise
+            if attempt == max_attempts - 1:
+                with _stats_lock:
+                    _stats["gave_up"] += 1
+                raise
+            with _stats_lock:
+                _stats["retries"] += 1
+            delay = _wait(e, attempt)
+            print(f"⏳ {description} failed ({error_status(e) or type(e).__name__}), "
+                  f"retry {attempt + 1}/{max_attempts - 1} after {delay:.1f}s")
+            attempt += 1
+
+
+class AdaptiveBatchSize:
+    """
+    Batch size shared by the callers of one endpoint: halved on 413/429,
+    doubled back (up to the maximum) after `grow_after` successful calls in a row.
+    """
+
+    def __init__(self, maximum: int, minimum: int = 1, grow_after: int = 8):
+        self.maximum = maximum
+        self.minimum = minimum
+        self.grow_after = grow_after
+        self._size = maximum
+        self._successes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        with self._lock:
+            return self._size
+
+    def shrink(self, failed_size: int) -> bool:
+        """Halve below the size that failed; False if it cannot get any smaller"""
+        with self._lock:
+            self._successes = 0
+            if failed_size <= self.minimum:
+                return False
+            self._size = max(self.minimum, min(self._size, failed_size // 2))
+        with _stats_lock:
+            _stats["batch_shrinks"] += 1
+        return True
+
+    def succeeded(self):
+        with self._lock:
+            self._successes += 1
+            if self._successes >= self.grow_after and self._size < self.maximum:
+                self._size = min(self.maximum, self._size * 2)
+                self._successes = 0
+
+
+def call_in_batches(fn: Callable[[List[Any]], T], items: Sequence[Any], batch_size: AdaptiveBatchSize,
+                    description: str) -> List[T]:
+    """
+    fn(batch) over consecutive batches of items, with retries. A 413/429 on a
+    batch larger than the minimum shrinks the batch size and re-sends the same
+    items in smaller batches. Returns fn's results in order.
+    """
+    items = list(items)
+    results, start, attempt = [], 0, 0
+    while start < len(items):
+        batch = items[start:start + batch_size.size]
+        try:
+            results.append(with_retries(lambda: fn(batch), description, give_up_on=SHRINK_STATUSES))
+        except Exception as e:
+            if error_status(e) not in SHRINK_STATUSES:
+                raise
+            if batch_size.shrink(len(batch)):
+                print(f"📉 {description}: {error_status(e)} on {len(batch)} items, "
+                      f"batch size now {batch_size.size}")
+                if error_status(e) == 429:
+                    _wait(e, attempt)
+            elif error_status(e) == 429 and attempt < RETRY_MAX_ATTEMPTS - 1:
+                # Already at the minimum batch size: an ordinary rate-limit retry
+                with _stats_lock:
+                    _stats["retries"] += 1
+                _wait(e, attempt)
+            else:
+                if error_status(e) == 429:
+                    with _stats_lock:
+                        _stats["gave_up"] += 1
+                raise
+            attempt += 1
+            continue
+        batch_size.succeeded()
+        start += len(batch)
+        attempt = 0
+    return results
+
+
+class IngestCheckpoint:
+    """
+    IDs whose upsert into an index generation was acknowledged, appended one
+    batch per line to a file in the generation's directory. The first line
+    records the build settings; a checkpoint is only resumed with the same ones.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """{"settings", "committed"} of an unfinished build, or None"""
+        try:
+            with open(self.path, "r") as f:
+                lines = f.read().splitlines()
+            settings = json.loads(lines[0])
+        except (OSError, ValueError, IndexError):
+            return None
+        committed: Set[str] = set()
+        for line in lines[1:]:
+            try:
+                committed.update(json.loads(line))
+            except ValueError:
+                break  # torn last line: that batch is re-sent
+        return {"settings": settings, "committed": committed}
+
+    def start(self, settings: Dict[str, Any]):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w") as f:
+            f.write(json.dumps(settings, sort_keys=True) + "\n")
+
+    def commit(self, ids: Sequence[str]):
+        """Record a batch the vector store acknowledged"""
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(list(ids)) + "\n")
+                f.flush()
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def get_resilience_stats() -> Dict[str, Any]:
+    """Retries, batch shrinks and give-ups across all Pinecone calls"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["retry_wait_s"] = round(stats["retry_wait_s"], 2)
+    return stats
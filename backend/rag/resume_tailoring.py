@@ -1,43 +1,17 @@
-import re
 import os
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
+from .router import route_query, RESUME
 
 def detect_resume_command(query):
     """
     Detect if the user is requesting a tailored resume.
     Returns (is_resume_request, job_description)
     """
-    query_lower = query.lower()
-    
-    # Keywords that indicate resume request
-    resume_keywords = [
-        'resume', 'cv', 'tailor', 'customize', 'job', 'position', 'role',
-        'apply', 'application', 'interview', 'hiring', 'recruitment'
-    ]
-    
-    is_resume_request = any(keyword in query_lower for keyword in resume_keywords)
-    
-    # Extract job description if present
-    job_description = ""
-    if is_resume_request:
-        # Look for job description patterns
-        patterns = [
-            r'for\s+(?:a\s+)?(?:position\s+as\s+)?([^.!?]+)',
-            r'as\s+(?:a\s+)?([^.!?]+)',
-            r'role\s+of\s+([^.!?]+)',
-            r'job\s+as\s+([^.!?]+)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                job_description = match.group(1).strip()
-                break
-    
-    return is_resume_request, job_description
+    route, args = route_query(query)
+    return route == RESUME, args.get("job_description", "")
 
 def tailor_resume(job_description, vector_store):
     """
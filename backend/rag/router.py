@@ -0,0 +1,123 @@
+"""
+Request Router
+Decides in one pass over the message which handler a chat goes to:
+  - "greeting": hi/hello/hey on their own
+  - "resume":   an explicit request to tailor/generate a resume or CV for a
+                target job (a "for ..." / "to this job" phrase or a pasted JD);
+                "resume" inside a project name ("HR Resume Assistant") does
+                not count
+  - "github":   GitHub / repository / commit questions
+  - "rag":      everything else
+The query is lowercased and tokenized once and every word is looked up in a
+single trigger table (one dict probe per word, no per-keyword scans); arguments
+(e.g. the job description for a resume) are extracted only for the chosen
+route. Per-route counts and latencies are kept for /stats.
+"""
+
+import re
+import time
+import threading
+from typing import Any, Dict, Tuple
+
+from .fact_engine import get_fact_index
+
+GREETING = "greeting"
+RESUME = "resume"
+GITHUB = "github"
+RAG = "rag"
+
+_GREETING = re.compile(r"(?:hi|hello|hey)(?: there)?[\s!.,]*", re.IGNORECASE)
+
+_WORD = re.compile(r"[a-z]+")
+
+# Every trigger word -> the signal it carries; one dict lookup per word of the query
+_TRIGGER_WORDS: Dict[str, str] = {}
+for _signal, _words in {
+    "github": "github repo repos repository repositories commit commits",
+    "resume": "resume resumes cv curriculum",
+    "tailor": "tailor tailored tailoring customize customise personalize personalise",
+    "create": "generate create make build write prepare adapt",
+    "job": "job position role opening vacancy jd",
+    "apply": "apply applying application",
+}.items():
+    _TRIGGER_WORDS.update(dict.fromkeys(_words.split(), _signal))
+
+_RESUME_ACTIONS = frozenset({"tailor", "create"})
+_TAILOR_FOR_JOB = frozenset({"tailor", "job"})
+
+# The job a resume is for: "for a Data Scientist position", "to this JD"
+_TARGET_JOB = re.compile(
+    r"\bfor\s+\w+|\bto\s+(?:this|that|the|a|an|my|our)\b[^.!?]*?\b(?:job|role|position|jd|opening|vacancy|posting)\b",
+    re.IGNORECASE
+)
+# A message this long that asks for a resume carries the job description itself
+_PASTED_JD_WORDS = 40
+
+# Job description patterns, in priority order (same ones detect_resume_command used)
+_JOB_DESCRIPTION_PATTERNS = [
+    re.compile(r"for\s+(?:a\s+)?(?:position\s+as\s+)?([^.!?]+)", re.IGNORECASE),
+    re.compile(r"as\s+(?:a\s+)?([^.!?]+)", re.IGNORECASE),
+    re.compile(r"role\s+of\s+([^.!?]+)", re.IGNORECASE),
+    re.compile(r"job\s+as\s+([^.!?]+)", re.IGNORECASE),
+]
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, float]] = {}
+
+
+def _extract_job_description(query: str) -> str:
+    for pattern in _JOB_DESCRIPTION_PATTERNS:
+        match = pattern.search(query)
+        if match:
+            return match.group(1).strip()
+    return ""
+
+
+def _classify(query: str) -> Tuple[str, Dict[str, Any]]:
+    if not query or _GREETING.fullmatch(query):
+        return GREETING, {}
+
+    trigger_words = _TRIGGER_WORDS
+    words = _WORD.findall(query.lower())
+    hits = {trigger_words[word] for word in words if word in trigger_words}
+
+    if "resume" in hits or "tailor" in hits:
+        # Rare path: only messages that mention a resume pay for the project-name scan
+        words = _WORD.findall(get_fact_index().strip_project_names(query))
+        hits = {trigger_words[word] for word in words if word in trigger_words}
+        # A resume is only built on an explicit ask for a target job: resume/CV plus
+        # tailor/generate, or "tailor" + a job, and then "for a Data Scientist
+        # position" / "to this JD" or a pasted JD. "What was his role in the
+        # HR Resume Assistant?" is a RAG question.
+        asks = ("resume" in hits and hits & _RESUME_ACTIONS) or _TAILOR_FOR_JOB <= hits
+        if asks and (_TARGET_JOB.search(query) or len(words) >= _PASTED_JD_WORDS):
+            return RESUME, {"job_description": _extract_job_description(query)}
+    if "github" in hits:
+        return GITHUB, {"query": query}
+    return RAG, {"query": query}
+
+
+def route_query(query: str) -> Tuple[str, Dict[str, Any]]:
+    """Return (route, args) for a chat message"""
+    start = time.perf_counter()
+    route, args = _classify(query.strip())
+    elapsed = time.perf_counter() - start
+    with _stats_lock:
+        stats = _stats.setdefault(route, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+        stats["count"] += 1
+        stats["total_seconds"] += elapsed
+        stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+    return route, args
+
+
+def get_router_stats() -> Dict[str, Any]:
+    """Requests per route and routing latency (microseconds)"""
+    with _stats_lock:
+        return {
+            route: {
+                "count": stats["count"],
+                "avg_us": round(stats["total_seconds"] / stats["count"] * 1e6, 2),
+                "max_us": round(stats["max_seconds"] * 1e6, 2)
+            }
+            for route, stats in _stats.items()
+        }
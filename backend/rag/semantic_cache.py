@@ -0,0 +1,117 @@
+"""
+Semantic Response Cache
+Reuses answers for queries that mean the same thing, not just queries
+that are spelled the same ("What's his current job?" vs
+"What is Kushagra's current role?"). Each entry can carry a key (the
+entities the query names); only entries with the same key are reused, so
+"GrocExpress stack" never gets the answer cached for "SalesAssist stack".
+"""
+
+import threading
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+
+class SemanticCache:
+    """
+    Fixed-size cache of (query embedding -> response).
+    Embeddings live in one preallocated float32 matrix, L2-normalized on
+    insert, so a lookup is a single matrix-vector product. When full, the
+    least recently used slot is overwritten.
+    """
+
+    def __init__(self, max_entries: int = 256, threshold: float = 0.92):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None  # allocated on first insert, once the dimension is known
+        self._valid = np.zeros(max_entries, dtype=bool)
+        self._last_used = np.zeros(max_entries, dtype=np.int64)
+        self._responses: List[Optional[Dict[str, Any]]] = [None] * max_entries
+        self._keys: List[Hashable] = [None] * max_entries
+        self._clock = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def _normalize(embedding) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0:
+            return None
+        return vector / norm
+
+    def lookup(self, embedding, key: Hashable = None) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Return (response, similarity) for the closest cached query with the same key above the threshold"""
+        vector = self._normalize(embedding)
+        with self._lock:
+            if vector is None or self._matrix is None or not self._valid.any() \
+                    or vector.shape[0] != self._matrix.shape[1]:
+                self._misses += 1
+                return None
+
+            similarities = self._matrix @ vector
+            similarities[~self._valid] = -1.0
+            for other_slot in np.flatnonzero(self._valid).tolist():
+                if self._keys[other_slot] != key:
+                    similarities[other_slot] = -1.0
+            slot = int(np.argmax(similarities))
+            similarity = float(similarities[slot])
+
+            if similarity < self.threshold:
+                self._misses += 1
+                return None
+
+            self._clock += 1
+            self._last_used[slot] = self._clock
+            self._hits += 1
+            return self._responses[slot], similarity
+
+    def add(self, embedding, response: Dict[str, Any], key: Hashable = None):
+        """Store a response under an optional key, evicting the least recently used entry when full"""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+        with self._lock:
+            if self._matrix is None or self._matrix.shape[1] != vector.shape[0]:
+                # First insert, or the embedding model changed: start over
+                self._matrix = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+                self._valid[:] = False
+                self._responses = [None] * self.max_entries
+                self._keys = [None] * self.max_entries
+
+            if self._valid.all():
+                slot = int(np.argmin(self._last_used))
+                self._evictions += 1
+            else:
+                slot = int(np.argmin(self._valid))
+
+            self._clock += 1
+            self._matrix[slot] = vector
+            self._valid[slot] = True
+            self._last_used[slot] = self._clock
+            self._responses[slot] = response
+            self._keys[slot] = key
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._valid[:] = False
+            self._responses = [None] * self.max_entries
+            self._keys = [None] * self.max_entries
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": int(self._valid.sum()),
+                "max_entries": self.max_entries,
+                "threshold": self.threshold,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0
+            }
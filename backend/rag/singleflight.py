@@ -0,0 +1,73 @@
+"""
+Single-flight call deduplication
+Concurrent callers asking for the same key share one in-flight computation
+instead of each hitting Pinecone and Gemini
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class SingleFlight:
+    """
+    Tracks in-flight calls by key.
+    The first caller for a key becomes the leader and runs the work; every
+    caller that arrives before it finishes waits on the same Future.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self._leaders = 0
+        self._coalesced = 0
+
+    def acquire(self, key: str) -> Tuple[Future, bool]:
+        """
+        Join the in-flight call for key, or start a new one.
+        Returns (future, is_leader); the leader must call complete().
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self._coalesced += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self._leaders += 1
+            return future, True
+
+    def peek(self, key: str) -> Optional[Future]:
+        """Return the in-flight future for key without joining it"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self._coalesced += 1
+            return future
+
+    def complete(self, key: str, future: Future, fn: Callable[..., Any], *args, **kwargs):
+        """Run fn as the leader, settle the shared future and release the key"""
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                if self._calls.get(key) is future:
+                    del self._calls[key]
+
+    def do(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Blocking helper: run fn once per key and return its result to every caller"""
+        future, is_leader = self.acquire(key)
+        if is_leader:
+            self.complete(key, future, fn, *args, **kwargs)
+        return future.result()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring"""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "leaders": self._leaders,
+                "coalesced": self._coalesced
+            }
@@ -0,0 +1,205 @@
+"""
+Sparse (BM25) Chunk Index
+Lexical retrieval over the same chunks the vector backend holds, so exact
+names ("n8n", "Apache NiFi", "GrocExpress", "ShorthillsAI") that dense search
+ranks poorly still surface. Postings are stored as CSR arrays (term ->
+slice of chunk rows with precomputed BM25 weights): a query is one slice-add
+per query term. Built by create_pinecone_embeddings, saved as a single .npz
+next to the local vector index and loaded lazily.
+
+fuse_rankings() merges dense and sparse rankings by reciprocal rank fusion;
+fuse_hybrid() does that for one dense and one BM25 list and gives every
+match a score on a common 0-1 scale.
+"""
+
+import os
+import json
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .extractive import tokenize
+from .vector_store import Filters, matches_filters
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Reciprocal rank fusion constant: score = sum over rankings of 1 / (RRF_K + rank)
+RRF_K = 60
+
+
+class SparseIndex:
+    """BM25 postings over chunk texts (term-major CSR)"""
+
+    def __init__(self, ids: Sequence[str], metadata: Sequence[Dict[str, Any]]):
+        """`metadata` is each chunk's vector metadata (its "text" is what gets indexed)"""
+        self.ids = list(ids)
+        self.metadata = list(metadata)
+
+        doc_terms = [tokenize(item["text"]) for item in self.metadata]
+        lengths = np.asarray([len(terms) for terms in doc_terms], dtype=np.float32)
+        avg_length = float(lengths.mean()) if len(lengths) and lengths.mean() > 0 else 1.0
+
+        postings: Dict[str, Dict[int, int]] = {}
+        for row, terms in enumerate(doc_terms):
+            for term in terms:
+                counts = postings.setdefault(term, {})
+                counts[row] = counts.get(row, 0) + 1
+
+        vocab = sorted(postings)
+        indptr = np.zeros(len(vocab) + 1, dtype=np.int32)
+        rows, weights = [], []
+        n_docs = len(self.ids)
+        for position, term in enumerate(vocab):
+            counts = postings[term]
+            idf = np.log(1.0 + (n_docs - len(counts) + 0.5) / (len(counts) + 0.5))
+            term_rows = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+            tf = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+            norm = BM25_K1 * (1.0 - BM25_B + BM25_B * lengths[term_rows] / avg_length)
+            rows.append(term_rows)
+            weights.append((idf * tf * (BM25_K1 + 1.0) / (tf + norm)).astype(np.float32))
+            indptr[position + 1] = indptr[position] + len(counts)
+
+        self._set_arrays(
+            vocab,
+            indptr,
+            np.concatenate(rows) if rows else np.zeros(0, dtype=np.int32),
+            np.concatenate(weights) if weights else np.zeros(0, dtype=np.float32)
+        )
+
+    def _set_arrays(self, vocab: Sequence[str], indptr: np.ndarray, rows: np.ndarray, weights: np.ndarray):
+        self.vocab = {term: position for position, term in enumerate(vocab)}
+        self.indptr = indptr
+        self.rows = rows
+        self.weights = weights
+
+    def _query_terms(self, query: str) -> List[int]:
+        terms = tokenize(query)
+        # "Shorthills AI" should also match "ShorthillsAI", "Grocexpress" -> "GrocExpress"
+        terms += [a + b for a, b in zip(terms, terms[1:])]
+        return sorted({self.vocab[term] for term in terms if term in self.vocab})
+
+    def search(self, query: str, top_k: int, filters: Optional[Filters] = None) -> List[Dict[str, Any]]:
+        """Best chunks as [{"id", "score", "metadata"}] (only chunks sharing a term with the query)"""
+        positions = self._query_terms(query)
+        if not positions:
+            return []
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        for position in positions:
+            start, end = self.indptr[position], self.indptr[position + 1]
+            scores[self.rows[start:end]] += self.weights[start:end]
+        if filters:
+            for row in np.flatnonzero(scores).tolist():
+                if not matches_filters(self.metadata[row], filters):
+                    scores[row] = 0.0
+
+        k = min(top_k, int(np.count_nonzero(scores)))
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            {"id": self.ids[row], "score": float(scores[row]), "metadata": self.metadata[row]}
+            for row in top.tolist()
+        ]
+
+    def save(self, path: str):
+        """Write all arrays to one .npz (temp file, then rename)"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        vocab = sorted(self.vocab, key=self.vocab.get)
+        with open(path + ".tmp", "wb") as f:
+            np.savez(
+                f,
+                vocab=np.asarray(vocab, dtype=str),
+                indptr=self.indptr,
+                rows=self.rows,
+                weights=self.weights,
+                ids=np.asarray(self.ids, dtype=str),
+                metadata=np.asarray([json.dumps(item) for item in self.metadata], dtype=str)
+            )
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path: str) -> "SparseIndex":
+        with np.load(path) as data:
+            index = cls.__new__(cls)
+            index.ids = data["ids"].tolist()
+            index.metadata = [json.loads(item) for item in data["metadata"].tolist()]
+            index._set_arrays(data["vocab"].tolist(), data["indptr"], data["rows"], data["weights"])
+        return index
+
+
+def fuse_rankings(rankings: Sequence[List[Dict[str, Any]]], top_k: int) -> List[Dict[str, Any]]:
+    """
+    Reciprocal rank fusion of several best-first match lists.
+    Each fused match keeps the first list's "score" for its id (the dense
+    cosine similarity when the dense ranking comes first) and gains "rrf_score".
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    for ranking in rankings:
+        for rank, match in enumerate(ranking, 1):
+            entry = fused.get(match["id"])
+            if entry is None:
+                entry = fused[match["id"]] = {**match, "rrf_score": 0.0, "sources": 0}
+            entry["rrf_score"] += 1.0 / (RRF_K + rank)
+            entry["sources"] += 1
+    return sorted(fused.values(), key=lambda match: match["rrf_score"], reverse=True)[:top_k]
+
+
+def fuse_hybrid(dense: List[Dict[str, Any]], sparse: List[Dict[str, Any]], top_k: int) -> List[Dict[str, Any]]:
+    """
+    RRF of a dense and a BM25 ranking. Cosine and BM25 scores aren't comparable,
+    so each match's "score" becomes its score relative to the best of its own
+    list, taking the better of the two lists it may appear in: an exact-name
+    hit found only by BM25 scores as high as its lexical rank earns, not below
+    every dense match. The dense cosine, when there is one, stays in "dense_score".
+    """
+    relevance: Dict[str, float] = {}
+    for ranking in (dense, sparse):
+        best = max((match["score"] for match in ranking), default=0.0)
+        for match in ranking:
+            score = max(0.0, match["score"]) / best if best > 0 else 0.0
+            relevance[match["id"]] = max(relevance.get(match["id"], 0.0), score)
+    dense_scores = {match["id"]: match["score"] for match in dense}
+    fused = fuse_rankings([dense, sparse], top_k)
+    for match in fused:
+        match["score"] = round(relevance[match["id"]], 4)
+        if match["id"] in dense_scores:
+            match["dense_score"] = dense_scores[match["id"]]
+    return fused
+
+
+# One index per generation's path (see index_generations.py); readers of the
+# current generation are unaffected while a new one is being built
+_sparse_indexes: Dict[str, SparseIndex] = {}
+_sparse_index_lock = threading.Lock()
+
+
+def rebuild_sparse_index(path: str, ids: Sequence[str], metadata: Sequence[Dict[str, Any]]) -> SparseIndex:
+    """Build and save the index for a fresh set of chunks"""
+    index = SparseIndex(ids, metadata)
+    index.save(path)
+    with _sparse_index_lock:
+        _sparse_indexes[path] = index
+    print(f"🔤 Sparse index: {len(index.ids)} chunks, {len(index.vocab)} terms, {len(index.rows)} postings")
+    return index
+
+
+def get_sparse_index(path: str) -> Optional[SparseIndex]:
+    """Index saved at `path` (loaded on first use), or None if it hasn't been built yet"""
+    index = _sparse_indexes.get(path)
+    if index is None:
+        with _sparse_index_lock:
+            index = _sparse_indexes.get(path)
+            if index is None:
+                if not os.path.exists(path):
+                    return None
+                index = _sparse_indexes[path] = SparseIndex.load(path)
+    return index
+
+
+def evict_sparse_index(path: str):
+    """Forget the index loaded from `path` (its generation was removed)"""
+    with _sparse_index_lock:
+        _sparse_indexes.pop(path, None)
@@ -4,6 +4,45 @@ from langchain.text_splitter import RecursiveCharacterTextSplitter
 from .data_loading import load_all_json_files
 import json
 
+# Bump when chunk metadata changes without the chunk text changing (e.g. a
+# section's category): stored vectors then need a rebuild to pick it up
+CHUNK_SCHEMA_VERSION = 2
+
+# Section -> intent category of its chunks (stored as "category" metadata)
+SECTION_CATEGORIES = {
+    "Work Experience": "work_experience",
+    "Projects": "projects",
+    "Skills": "skills",
+    "Certifications": "certifications",
+    "Education": "education",
+    "college_activities": "education",
+    "name": "personal",
+    "age": "personal",
+    "birthdate": "personal",
+    "place_of_birth": "personal",
+    "current_residency": "personal",
+    "languages_known": "personal",
+    "sports_hobbies": "personal",
+    "other_hobbies": "personal",
+    "Contact Information": "personal",
+}
+
+# Intent category -> chunk categories worth searching. Skills and general
+# questions are answered from every section, so they are not filtered;
+# company projects live in Work Experience chunks.
+INTENT_CATEGORY_FILTERS = {
+    "work_experience": ["work_experience"],
+    "projects": ["projects", "work_experience"],
+    "education": ["education", "certifications"],
+    "personal": ["personal"],
+}
+
+
+def section_category(section):
+    """Intent category for a section name ("general" when unknown)"""
+    return SECTION_CATEGORIES.get(section, "general")
+
+
 def extract_section_texts(json_object):
     """
     Extract text for each section from a JSON object with enhanced context.
@@ -78,6 +117,24 @@ def extract_section_texts(json_object):
                             }
                         ))
         
+        # One chunk per portfolio project, so a project can be searched on its own
+        elif section == "Projects" and isinstance(content, dict):
+            for project_category, projects in content.items():
+                for project in projects:
+                    project_text = f"Project ({project_category}):\n"
+                    for field, value in project.items():
+                        if isinstance(value, list):
+                            value = ", ".join(str(item) for item in value)
+                        project_text += f"{field.replace('_', ' ')}: {value}\n"
+                    documents.append(Document(
+                        page_content=project_text,
+                        metadata={
+                            "section": "Projects",
+                            "project": project.get('Project_Name', 'N/A'),
+                            "project_category": project_category
+                        }
+                    ))
+        
         # Handle regular sections
         else:
             if isinstance(content, list):
@@ -89,15 +146,19 @@ def extract_section_texts(json_object):
     return documents
 
 def split_documents(documents, chunk_size, overlap):
-    """Use RecursiveCharacterTextSplitter to split documents into chunks."""
+    """
+    Use RecursiveCharacterTextSplitter to split documents into chunks.
+    Every chunk keeps its document's metadata plus its intent "category".
+    """
     splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=overlap)
     split_docs = []
     for doc in documents:
         chunks = splitter.split_text(doc.page_content)
         for chunk in chunks:
             modified_chunk = f"{doc.metadata['section']}:\n{chunk}"
-            # Assign the section name to each chunk's metadata for reference after retrieval 
-            split_docs.append(Document(page_content=modified_chunk, metadata={"section": doc.metadata["section"]}))
+            # Keep section, company, project etc. so retrieval can filter on them
+            metadata = {**doc.metadata, "category": section_category(doc.metadata["section"])}
+            split_docs.append(Document(page_content=modified_chunk, metadata=metadata))
 
     return split_docs
 
@@ -0,0 +1,469 @@
+"""
+Vector Store Backends
+One interface for everything that stores chunk embeddings, so retrieval,
+embedding creation and auto-update don't care where the vectors live:
+  - PineconeVectorStore: the hosted Pinecone index (network round trip per query)
+  - HnswVectorStore: in-process hnswlib graph, persisted to disk and loaded
+    at startup (microsecond queries, no external service)
+  - NumpyVectorStore: brute-force float32 matrix, memory-mapped from a .npy
+    file (exact results; one matrix-vector product beats a graph at
+    portfolio scale)
+All backends can restrict a query with metadata filters: {field: [allowed
+values]} on the FILTER_FIELDS, values OR-ed within a field, fields AND-ed.
+Vectors use Pinecone's format: {"id": str, "values": [...], "metadata": {...}}
+"""
+
+import os
+import json
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import hnswlib
+import numpy as np
+
+from .resilience import AdaptiveBatchSize, call_in_batches, with_retries
+
+# Chunk metadata fields queries can filter on
+FILTER_FIELDS = ("section", "category", "company", "project")
+
+Filters = Dict[str, Sequence[Any]]
+
+
+def matches_filters(metadata: Dict[str, Any], filters: Optional[Filters]) -> bool:
+    """True if the metadata satisfies every field of the filter"""
+    return not filters or all(metadata.get(field) in values for field, values in filters.items())
+
+
+class VectorStore:
+    """Interface every vector backend implements"""
+
+    name = "base"
+
+    @property
+    def dimension(self) -> Optional[int]:
+        """Vector dimension, or None while it is unknown (e.g. empty local index)"""
+        return None
+
+    def upsert(self, vectors: List[Dict[str, Any]]):
+        """Insert or replace vectors"""
+        raise NotImplementedError
+
+    def query(self, embedding: np.ndarray, top_k: int,
+              filters: Optional[Filters] = None) -> List[Dict[str, Any]]:
+        """
+        Nearest neighbours as [{"id", "score", "metadata"}], best first (score = cosine similarity).
+        With `filters`, only vectors whose metadata matches them are searched.
+        """
+        raise NotImplementedError
+
+    def delete(self, ids: Sequence[str]):
+        """Remove vectors by id"""
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove every vector"""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        """Number of stored vectors"""
+        raise NotImplementedError
+
+    def flush(self):
+        """Persist pending writes (no-op for remote backends)"""
+
+
+class PineconeVectorStore(VectorStore):
+    """Hosted Pinecone index, scoped to one namespace ("" = the default namespace)"""
+
+    name = "pinecone"
+    upsert_batch_size = 100
+
+    def __init__(self, index, namespace: str = ""):
+        self.index = index
+        self.namespace = namespace
+        # Shrinks on 413/429 and recovers (write calls retry transient errors, queries don't)
+        self._upsert_batch = AdaptiveBatchSize(self.upsert_batch_size)
+
+    def _stats(self) -> Dict[str, Any]:
+        return with_retries(self.index.describe_index_stats, "Pinecone describe_index_stats")
+
+    @property
+    def dimension(self) -> Optional[int]:
+        return self._stats().get("dimension")
+
+    def upsert(self, vectors: List[Dict[str, Any]]):
+        payload = [{**vector, "values": np.asarray(vector["values"], dtype=np.float32).tolist()} for vector in vectors]
+        call_in_batches(
+            lambda batch: self.index.upsert(vectors=batch, namespace=self.namespace),
+            payload, self._upsert_batch, "Pinecone upsert"
+        )
+
+    def query(self, embedding: np.ndarray, top_k: int,
+              filters: Optional[Filters] = None) -> List[Dict[str, Any]]:
+        kwargs = {"filter": {field: {"$in": list(values)} for field, values in filters.items()}} if filters else {}
+        results = self.index.query(
+            vector=np.asarray(embedding, dtype=np.float32).tolist(),
+            top_k=top_k,
+            include_metadata=True,
+            namespace=self.namespace,
+            **kwargs
+        )
+        return [
+            {"id": match["id"], "score": match["score"], "metadata": match["metadata"]}
+            for match in results["matches"]
+        ]
+
+    def delete(self, ids: Sequence[str]):
+        if ids:
+            # Delete by id is idempotent, so retrying it is safe
+            call_in_batches(
+                lambda batch: self.index.delete(ids=batch, namespace=self.namespace),
+                list(ids), AdaptiveBatchSize(1000), "Pinecone delete"
+            )
+
+    def clear(self):
+        if self.count():
+            with_retries(lambda: self.index.delete(delete_all=True, namespace=self.namespace), "Pinecone delete_all")
+
+    def count(self) -> int:
+        summary = (self._stats().get("namespaces") or {}).get(self.namespace)
+        return summary["vector_count"] if summary else 0
+
+    def namespaces(self) -> List[str]:
+        """Every namespace in the index"""
+        return list((self._stats().get("namespaces") or {}).keys())
+
+    def fetch_metadata(self, vector_id: str) -> Optional[Dict[str, Any]]:
+        """Metadata of one stored vector, or None if the namespace has no such id"""
+        response = with_retries(
+            lambda: self.index.fetch(ids=[vector_id], namespace=self.namespace), "Pinecone fetch"
+        )
+        vector = (response["vectors"] or {}).get(vector_id)
+        return dict(vector["metadata"] or {}) if vector is not None else None
+
+    def list_ids(self) -> List[str]:
+        """Every id in the namespace (serverless indexes only)"""
+        ids = []
+        for page in with_retries(lambda: list(self.index.list(namespace=self.namespace)), "Pinecone list"):
+            # Older clients yield lists of ids, newer ones ListResponse pages
+            ids.extend(getattr(item, "id", item) for item in getattr(page, "vectors", page))
+        return ids
+
+
+class HnswVectorStore(VectorStore):
+    """
+    hnswlib HNSW graph (cosine space) kept in process memory.
+    flush() writes the graph and a JSON sidecar (ids + metadata) to
+    `directory`; a new instance loads them back, so startup needs no
+    re-embedding. Writes and reads share one lock - queries on a
+    portfolio-sized graph take microseconds.
+    """
+
+    name = "hnsw"
+    INDEX_FILE = "hnsw_index.bin"
+    META_FILE = "hnsw_meta.json"
+
+    def __init__(self, directory: str, m: int = 16, ef_construction: int = 200, ef_search: int = 64):
+        self.directory = directory
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self._lock = threading.RLock()
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        self._index = None
+        self._dim = None
+        self._labels: Dict[str, int] = {}        # vector id -> hnsw label
+        self._items: Dict[int, Dict[str, Any]] = {}  # hnsw label -> {"id", "metadata"}
+        self._next_label = 0
+
+    @property
+    def dimension(self) -> Optional[int]:
+        return self._dim
+
+    def _paths(self):
+        return os.path.join(self.directory, self.INDEX_FILE), os.path.join(self.directory, self.META_FILE)
+
+    def _load(self):
+        index_path, meta_path = self._paths()
+        if not (os.path.exists(index_path) and os.path.exists(meta_path)):
+            return
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        index = hnswlib.Index(space="cosine", dim=meta["dim"])
+        index.load_index(index_path, max_elements=max(meta["next_label"], 1))
+        index.set_ef(self.ef_search)
+
+        self._index = index
+        self._dim = meta["dim"]
+        self._next_label = meta["next_label"]
+        for item in meta["items"]:
+            self._labels[item["id"]] = item["label"]
+            self._items[item["label"]] = {"id": item["id"], "metadata": item["metadata"]}
+        print(f"📂 Loaded HNSW index: {len(self._items)} vectors (dim {self._dim}) from {self.directory}")
+
+    def _ensure_capacity(self, dim: int, extra: int):
+        if self._index is None:
+            self._index = hnswlib.Index(space="cosine", dim=dim)
+            self._index.init_index(max_elements=max(extra, 64), ef_construction=self.ef_construction, M=self.m)
+            self._index.set_ef(self.ef_search)
+            self._dim = dim
+        elif dim != self._dim:
+            raise ValueError(f"Embedding dimension {dim} does not match index dimension {self._dim}")
+        needed = self._next_label + extra
+        if needed > self._index.get_max_elements():
+            self._index.resize_index(max(needed, 2 * self._index.get_max_elements()))
+
+    def upsert(self, vectors: List[Dict[str, Any]]):
+        if not vectors:
+            return
+        data = np.asarray([vector["values"] for vector in vectors], dtype=np.float32)
+        with self._lock:
+            self._ensure_capacity(data.shape[1], len(vectors))
+            labels = []
+            for vector in vectors:
+                label = self._labels.get(vector["id"])
+                if label is None:
+                    label = self._next_label
+                    self._next_label += 1
+                    self._labels[vector["id"]] = label
+                labels.append(label)
+                self._items[label] = {"id": vector["id"], "metadata": vector.get("metadata", {})}
+            # Re-adding an existing label replaces its vector
+            self._index.add_items(data, np.asarray(labels, dtype=np.int64), replace_deleted=False)
+
+    def query(self, embedding: np.ndarray, top_k: int,
+              filters: Optional[Filters] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            if self._index is None or not self._items:
+                return []
+            label_filter = None
+            candidates = len(self._items)
+            if filters:
+                allowed = {label for label, item in self._items.items() if matches_filters(item["metadata"], filters)}
+                label_filter = allowed.__contains__
+                candidates = len(allowed)
+            # hnswlib raises if it can't fill k results, so never ask for more than exist
+            k = min(top_k, candidates)
+            if k == 0:
+                return []
+            labels, distances = self._index.knn_query(
+                np.asarray(embedding, dtype=np.float32), k=k, filter=label_filter
+            )
+            return [
+                {"id": self._items[label]["id"], "score": float(1.0 - distance),
+                 "metadata": self._items[label]["metadata"]}
+                for label, distance in zip(labels[0].tolist(), distances[0].tolist())
+            ]
+
+    def delete(self, ids: Sequence[str]):
+        with self._lock:
+            for vector_id in ids:
+                label = self._labels.pop(vector_id, None)
+                if label is not None:
+                    self._index.mark_deleted(label)
+                    del self._items[label]
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+            for path in self._paths():
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def count(self) -> int:
+        return len(self._items)
+
+    def flush(self):
+        """Write graph + sidecar atomically (temp file, then rename)"""
+        with self._lock:
+            if self._index is None:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            index_path, meta_path = self._paths()
+            meta = {
+                "dim": self._dim,
+                "next_label": self._next_label,
+                "items": [{"label": label, **item} for label, item in self._items.items()]
+            }
+            self._index.save_index(index_path + ".tmp")
+            with open(meta_path + ".tmp", "w") as f:
+                json.dump(meta, f)
+            os.replace(index_path + ".tmp", index_path)
+            os.replace(meta_path + ".tmp", meta_path)
+        print(f"💾 Saved HNSW index ({len(self._items)} vectors) to {self.directory}")
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    Exact search over a float32 matrix of unit-length rows: scores are one
+    matrix-vector product and top-k is an argpartition, no index structure.
+    flush() writes the matrix as a .npy file and ids + metadata as a compact
+    JSON sidecar; a new instance memory-maps the matrix, so startup takes
+    milliseconds and pages are only read when first searched.
+    Boolean masks are precomputed per value of every FILTER_FIELDS field,
+    so a filter is a few mask ORs/ANDs and one np.where over the scores.
+    """
+
+    name = "numpy"
+    VECTORS_FILE = "numpy_vectors.npy"
+    META_FILE = "numpy_meta.json"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.RLock()
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        self._matrix: Optional[np.ndarray] = None  # (n, dim) float32, rows L2-normalised
+        self._ids: List[str] = []
+        self._metadata: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}             # vector id -> row
+        self._masks: Dict[str, Dict[Any, np.ndarray]] = {}  # field -> value -> row mask
+
+    @property
+    def dimension(self) -> Optional[int]:
+        return None if self._matrix is None else self._matrix.shape[1]
+
+    def _paths(self):
+        return os.path.join(self.directory, self.VECTORS_FILE), os.path.join(self.directory, self.META_FILE)
+
+    def _rebuild_lookups(self):
+        self._rows = {vector_id: row for row, vector_id in enumerate(self._ids)}
+        self._masks = {}
+        for field in FILTER_FIELDS:
+            values = np.asarray([metadata.get(field) for metadata in self._metadata], dtype=object)
+            self._masks[field] = {value: values == value for value in set(values.tolist()) if value is not None}
+
+    def _load(self):
+        vectors_path, meta_path = self._paths()
+        if not (os.path.exists(vectors_path) and os.path.exists(meta_path)):
+            return
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        self._matrix = np.load(vectors_path, mmap_mode="r")
+        self._ids = meta["ids"]
+        self._metadata = meta["metadata"]
+        self._rebuild_lookups()
+        print(f"📂 Loaded NumPy index: {len(self._ids)} vectors (dim {self.dimension}) from {self.directory}")
+
+    @staticmethod
+    def _normalise(data: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(data, axis=-1, keepdims=True)
+        return data / np.where(norms == 0, 1.0, norms)
+
+    def upsert(self, vectors: List[Dict[str, Any]]):
+        if not vectors:
+            return
+        data = self._normalise(np.asarray([vector["values"] for vector in vectors], dtype=np.float32))
+        with self._lock:
+            if self._matrix is not None and data.shape[1] != self._matrix.shape[1]:
+                raise ValueError(
+                    f"Embedding dimension {data.shape[1]} does not match index dimension {self._matrix.shape[1]}"
+                )
+            # Writes go to new copies that replace the current ones in one step:
+            # query() takes its snapshot of matrix/ids/metadata under the lock
+            # and reads it outside, so nothing it holds may change in place.
+            # The memory-mapped file itself is replaced on flush().
+            matrix = np.empty((0, data.shape[1]), dtype=np.float32) if self._matrix is None else np.array(self._matrix)
+            ids, metadata, rows = list(self._ids), list(self._metadata), dict(self._rows)
+            new_rows = []
+            for vector, row_data in zip(vectors, data):
+                row = rows.get(vector["id"])
+                if row is None:
+                    rows[vector["id"]] = len(ids)
+                    ids.append(vector["id"])
+                    metadata.append(vector.get("metadata", {}))
+                    new_rows.append(row_data)
+                elif row < len(matrix):
+                    matrix[row] = row_data
+                    metadata[row] = vector.get("metadata", {})
+                else:
+                    # Repeated id within this batch
+                    new_rows[row - len(matrix)] = row_data
+                    metadata[row] = vector.get("metadata", {})
+            if new_rows:
+                matrix = np.vstack([matrix, np.asarray(new_rows, dtype=np.float32)])
+            self._matrix, self._ids, self._metadata = matrix, ids, metadata
+            self._rebuild_lookups()
+
+    @staticmethod
+    def _filter_mask(masks: Dict[str, Dict[Any, np.ndarray]], metadata: List[Dict[str, Any]],
+                     n: int, filters: Filters) -> np.ndarray:
+        mask = np.ones(n, dtype=bool)
+        for field, values in filters.items():
+            field_masks = masks.get(field)
+            if field_masks is None:
+                # Not a precomputed field: check the metadata row by row
+                return mask & np.fromiter((matches_filters(m, filters) for m in metadata[:n]), bool, n)
+            field_mask = np.zeros(n, dtype=bool)
+            for value in values:
+                if value in field_masks:
+                    field_mask |= field_masks[value]
+            mask &= field_mask
+        return mask
+
+    def query(self, embedding: np.ndarray, top_k: int,
+              filters: Optional[Filters] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            matrix, ids, metadata, masks = self._matrix, self._ids, self._metadata, self._masks
+        if matrix is None or not ids:
+            return []
+
+        scores = matrix @ self._normalise(np.asarray(embedding, dtype=np.float32))
+        candidates = len(ids)
+        if filters:
+            mask = self._filter_mask(masks, metadata, len(scores), filters)
+            candidates = int(mask.sum())
+            scores = np.where(mask, scores, -np.inf)
+
+        k = min(top_k, candidates)
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            {"id": ids[row], "score": float(scores[row]), "metadata": metadata[row]}
+            for row in top.tolist()
+        ]
+
+    def delete(self, ids: Sequence[str]):
+        with self._lock:
+            rows = [self._rows[vector_id] for vector_id in ids if vector_id in self._rows]
+            if not rows:
+                return
+            drop = set(rows)
+            keep = [row for row in range(len(self._ids)) if row not in drop]
+            self._matrix = np.array(self._matrix[keep])
+            self._ids = [self._ids[row] for row in keep]
+            self._metadata = [self._metadata[row] for row in keep]
+            self._rebuild_lookups()
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+            for path in self._paths():
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def count(self) -> int:
+        return len(self._ids)
+
+    def flush(self):
+        """Write matrix + sidecar atomically (temp file, then rename), then re-map the file"""
+        with self._lock:
+            if self._matrix is None:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            vectors_path, meta_path = self._paths()
+            with open(vectors_path + ".tmp", "wb") as f:
+                np.save(f, np.ascontiguousarray(self._matrix, dtype=np.float32))
+            with open(meta_path + ".tmp", "w") as f:
+                json.dump({"ids": self._ids, "metadata": self._metadata}, f, separators=(",", ":"))
+            os.replace(vectors_path + ".tmp", vectors_path)
+            os.replace(meta_path + ".tmp", meta_path)
+            self._matrix = np.load(vectors_path, mmap_mode="r")
+        print(f"💾 Saved NumPy index ({len(self._ids)} vectors) to {self.directory}")
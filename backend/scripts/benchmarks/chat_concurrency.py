@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Chat Concurrency Benchmark
+
+Measures how many concurrent chats one event loop can keep in flight,
+comparing the old blocking call path (generate_response run directly inside
+the async handler) with generate_response_async.
+
+Pinecone and Gemini are replaced by stubs that sleep for a fixed latency,
+so no API keys or network access are needed.
+
+Usage:
+python -m backend.scripts.benchmarks.chat_concurrency --requests 40
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+# The generator refuses to import without keys; the stubs never use them
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("PINECONE_API_KEY", "benchmark")
+# Answers persisted by an earlier run would skip the pipeline being measured
+os.environ.setdefault("ENABLE_DISK_CACHE", "false")
+
+from langchain.docstore.document import Document
+from backend.rag import generator
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark concurrent /chat throughput")
+    parser.add_argument("--requests", type=int, default=40, help="Concurrent chats to issue")
+    parser.add_argument("--retrieval-latency", type=float, default=0.15, help="Stubbed Pinecone latency (s)")
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="Stubbed Gemini latency (s)")
+    return parser.parse_args()
+
+
+def install_stubs(retrieval_latency, llm_latency):
+    """Replace the network-bound backends with sleeping stubs."""
+    def fake_embed(query):
+        # Random directions never cross the semantic cache threshold
+        return [random.gauss(0.0, 1.0) for _ in range(1024)]
+
+    def fake_retrieve(query, top_k=5, query_embedding=None, filters=None):
+        time.sleep(retrieval_latency)
+        return [Document(page_content=f"Stub chunk {i} for {query}", metadata={"section": "Stub", "score": 0.9})
+                for i in range(top_k)]
+
+    class FakeLLM:
+        def generate(self, prompt, purpose="generation"):
+            time.sleep(llm_latency)
+            return "Stubbed answer"
+
+    generator.embed_query = fake_embed
+    generator.retrieve_documents = fake_retrieve
+    fake_llm = FakeLLM()
+    generator.get_llm_client = lambda model_name=None: fake_llm
+
+
+async def heartbeat(stop, interval=0.01):
+    """Track the worst event-loop stall, i.e. how long /health would wait."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def blocking_chat(query):
+    """Old endpoint behaviour: the sync pipeline runs on the event loop."""
+    return generator.generate_response(query)
+
+
+async def run_mode(label, chat, num_requests):
+    """Issue num_requests unique chats at once and report throughput."""
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(heartbeat(stop))
+    await asyncio.sleep(0)
+
+    start = time.perf_counter()
+    # Unique queries so the response cache never short-circuits the pipeline
+    await asyncio.gather(*(chat(f"{label} benchmark question {i}") for i in range(num_requests)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    worst_stall = await monitor
+    print(f"{label:<10} {num_requests:>8} {elapsed:>10.2f}s {num_requests / elapsed:>10.1f} {worst_stall * 1000:>14.0f}ms")
+    return elapsed
+
+
+async def main():
+    args = parse_args()
+    install_stubs(args.retrieval_latency, args.llm_latency)
+
+    print("=" * 60)
+    print("⚡ /chat concurrency benchmark (stubbed Pinecone + Gemini)")
+    print("=" * 60)
+    print(f"Per-chat latency: {args.retrieval_latency + args.llm_latency:.2f}s, workers: {generator.RAG_MAX_WORKERS}\n")
+    print(f"{'Mode':<10} {'Requests':>8} {'Wall':>11} {'Chats/s':>10} {'Worst stall':>16}")
+
+    before = await run_mode("blocking", blocking_chat, args.requests)
+    after = await run_mode("executor", generator.generate_response_async, args.requests)
+
+    print(f"\n🚀 Speedup: {before / after:.1f}x")
+    generator.shutdown_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Hybrid Retrieval + Reranker Check
+
+Builds a small synthetic corpus in which the chunk that answers the query
+is found only by BM25 (an exact product name the dense ranking misses), runs
+it through fuse_hybrid() and the reranker cutoff, and checks that the answer
+chunk is kept. For comparison it also runs the old fusion, which gave
+BM25-only matches the weakest dense score. Exits with status 1 if the answer
+chunk is dropped. No API keys are needed.
+
+Usage:
+python -m backend.scripts.benchmarks.hybrid_rerank
+"""
+
+import os
+import sys
+
+from langchain.docstore.document import Document
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from backend.rag.sparse_index import SparseIndex, fuse_hybrid, fuse_rankings
+from backend.rag.reranker import rerank
+
+QUERY = "Where did he use n8n for workflow automation?"
+ANSWER_ID = "chunk_n8n"
+CHUNKS = {
+    ANSWER_ID: "Projects: Automated lead enrichment with n8n workflows triggering Slack and HubSpot updates.",
+    "chunk_workflow": "Work Experience: Designed workflow orchestration for data pipelines with Apache Airflow.",
+    "chunk_automation": "Projects: Built automation tools for internal reporting and dashboards.",
+    "chunk_llm": "Projects: LLM-powered assistant that answers questions over company documents.",
+    "chunk_skills": "Skills: Python, FastAPI, Docker, Kubernetes, Airflow, Pinecone, LangChain.",
+    "chunk_etl": "Work Experience: Migrated ETL jobs to Apache NiFi and scheduled batch loads.",
+    "chunk_bot": "Projects: Portfolio chatbot with retrieval over resume data.",
+    "chunk_grocery": "Projects: GrocExpress grocery delivery app with a recommendation engine.",
+    "chunk_sales": "Projects: SalesAssist sales call summarizer.",
+}
+# Dense cosine similarities of the top_k * HYBRID_CANDIDATE_FACTOR candidates:
+# semantically close chunks, the n8n chunk is not among them
+DENSE = [("chunk_workflow", 0.71), ("chunk_automation", 0.66), ("chunk_llm", 0.60), ("chunk_skills", 0.55),
+         ("chunk_etl", 0.52), ("chunk_bot", 0.47), ("chunk_grocery", 0.41), ("chunk_sales", 0.38)]
+
+
+def old_fusion(dense, sparse, top_k):
+    """Fusion before fuse_hybrid: BM25-only matches got the weakest dense score"""
+    floor = min((match["score"] for match in dense), default=0.0)
+    return fuse_rankings([dense, [{**match, "score": floor} for match in sparse]], top_k)
+
+
+def run(label, fuse):
+    metadata = {chunk_id: {"text": text} for chunk_id, text in CHUNKS.items()}
+    sparse_index = SparseIndex(list(CHUNKS), [metadata[chunk_id] for chunk_id in CHUNKS])
+    dense = [{"id": chunk_id, "score": score, "metadata": metadata[chunk_id]} for chunk_id, score in DENSE]
+    sparse = sparse_index.search(QUERY, top_k=8)
+    fused = fuse(dense, sparse, 4)
+    documents = [Document(page_content=match["metadata"]["text"], metadata={"id": match["id"], "score": match["score"]})
+                 for match in fused]
+    kept, stats = rerank(QUERY, documents)
+    kept_ids = [doc.metadata["id"] for doc in kept]
+    print(f"\n▶️  {label}")
+    for match in fused:
+        source = "dense+bm25" if match["sources"] == 2 else ("bm25 only" if match["id"] not in dict(DENSE) else "dense only")
+        print(f"   {match['id']:<18} {source:<11} score {match['score']:.3f}  {'kept' if match['id'] in kept_ids else 'dropped'}")
+    return ANSWER_ID in kept_ids
+
+
+def main():
+    run("old fusion (dense floor for BM25-only)", old_fusion)
+    ok = run("fuse_hybrid", fuse_hybrid)
+    print(f"\n{'✅' if ok else '❌'} BM25-only answer chunk {'kept' if ok else 'dropped'} by the reranker")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
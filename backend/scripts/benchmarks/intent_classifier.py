@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Intent Classifier Benchmark
+
+Compares the three ways the generator can classify a query:
+- keyword: the keyword rules used when SKIP_INTENT_CLASSIFICATION=true
+- local:   the trained TF-IDF classifier (held-out accuracy via
+           leave-one-out: each question is predicted by a model trained
+           without it)
+- llm:     classify_query_intent (one Gemini call per query; only with
+           --with-llm and a real GEMINI_API_KEY)
+
+Reports category accuracy, complexity accuracy (local and llm) and
+per-query latency on the evaluation dataset questions.
+
+Usage:
+python -m backend.scripts.benchmarks.intent_classifier
+python -m backend.scripts.benchmarks.intent_classifier --with-llm
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+# The generator refuses to import without keys; keyword/local modes never use them
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("PINECONE_API_KEY", "benchmark")
+
+from backend.rag import generator
+from backend.scripts.intent.train_intent_model import load_training_examples, train, CATEGORY_ALIASES
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Compare keyword, local and LLM intent classification")
+    parser.add_argument("--with-llm", action="store_true", help="Also run classify_query_intent (uses Gemini quota)")
+    return parser.parse_args()
+
+
+def timed(fn, question):
+    start = time.perf_counter()
+    result = fn(question)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def report(name, rows):
+    """rows: (predicted_category, predicted_complexity or None, latency_ms, example)"""
+    category_hits = sum(row[0] == row[3]["category"] for row in rows)
+    complexity_rows = [row for row in rows if row[1] is not None]
+    complexity_hits = sum(row[1] == row[3]["complexity"] for row in complexity_rows)
+    latencies = sorted(row[2] for row in rows)
+    complexity = f"{complexity_hits / len(complexity_rows):6.1%}" if complexity_rows else "   n/a"
+    print(f"{name:<10} {category_hits / len(rows):8.1%} {complexity:>10} "
+          f"{statistics.median(latencies):10.3f} {latencies[int(len(latencies) * 0.95) - 1]:10.3f}")
+
+
+def main():
+    args = parse_args()
+    examples = load_training_examples(include_supplementary=False)
+    # Supplementary questions are always in the training folds, never scored
+    supplementary = [e for e in load_training_examples() if e not in examples]
+    print(f"📚 {len(examples)} evaluation questions\n")
+
+    keyword_rows = []
+    for example in examples:
+        (intent, _), latency = timed(generator._keyword_intent, example["question"])
+        # The keyword rules always report "moderate" or "simple" by category, not by question
+        keyword_rows.append((intent["category"], intent["complexity"], latency, example))
+
+    local_rows = []
+    for i, example in enumerate(examples):
+        model = train(examples[:i] + examples[i + 1:] + supplementary)
+        intent, latency = timed(model.predict, example["question"])
+        local_rows.append((intent["category"], intent["complexity"], latency, example))
+
+    llm_rows = []
+    if args.with_llm:
+        for example in examples:
+            intent, latency = timed(generator.classify_query_intent, example["question"])
+            category = CATEGORY_ALIASES.get(intent.get("category"), intent.get("category"))
+            llm_rows.append((category, intent.get("complexity"), latency, example))
+
+    print(f"{'mode':<10} {'category':>8} {'complexity':>10} {'p50 (ms)':>10} {'p95 (ms)':>10}")
+    report("keyword", keyword_rows)
+    report("local", local_rows)
+    if llm_rows:
+        report("llm", llm_rows)
+    else:
+        print("llm        (skipped - pass --with-llm to spend one Gemini call per question)")
+
+    misses = [row for row in local_rows if row[0] != row[3]["category"]]
+    if misses:
+        print("\nLocal classifier misses (held out):")
+        for category, _, _, example in misses:
+            print(f"  {example['question']!r}: predicted {category}, labelled {example['category']}")
+
+
+if __name__ == "__main__":
+    main()
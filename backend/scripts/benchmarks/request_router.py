@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Request Router Micro-benchmark
+
+Compares the old chat_endpoint routing (greeting check, resume keyword scan
++ job regexes, GitHub keyword scan - each lowercasing the query again) with
+the single-pass compiled router in backend/rag/router.py.
+
+Inputs are the evaluation dataset questions plus a few greeting, resume and
+GitHub messages. Prints per-message latency for both and every message the
+two disagree on (the old resume keywords sent questions like "What was his
+role at ShorthillsAI?" to the resume builder), then any message in
+EXPECTED_ROUTES the router gets wrong.
+
+Usage:
+python -m backend.scripts.benchmarks.request_router --rounds 2000
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from backend.rag.router import route_query, _classify
+from backend.scripts.intent.train_intent_model import load_training_examples
+
+# Messages with the route they must take; "resume" inside a project name
+# ("HR Resume Assistant") must not reach the resume builder
+EXPECTED_ROUTES = [
+    ("hi", "greeting"), ("Hello", "greeting"), ("hey", "greeting"),
+    ("Tailor my resume for a Data Scientist position", "resume"),
+    ("Can you create a CV for the role of ML Engineer?", "resume"),
+    ("Tailor my resume to this job", "resume"),
+    ("What was his role in the HR Resume Assistant?", "rag"),
+    ("What technologies did he use to build the HR Resume Assistant?", "rag"),
+    ("Tell me about the HR Resume Assistant project", "rag"),
+    ("Did he build a resume parser?", "rag"),
+    ("Show me his GitHub stats", "github"),
+    ("How many commits did he push this month?", "github"),
+    ("What repositories does he maintain?", "github"),
+]
+EXTRA_MESSAGES = [message for message, _ in EXPECTED_ROUTES]
+
+
+def legacy_route(query):
+    """chat_endpoint routing before the compiled router"""
+    if not query or query.lower() in ['hi', 'hello', 'hey']:
+        return "greeting"
+    query_lower = query.lower()
+    resume_keywords = [
+        'resume', 'cv', 'tailor', 'customize', 'job', 'position', 'role',
+        'apply', 'application', 'interview', 'hiring', 'recruitment'
+    ]
+    if any(keyword in query_lower for keyword in resume_keywords):
+        patterns = [
+            r'for\s+(?:a\s+)?(?:position\s+as\s+)?([^.!?]+)',
+            r'as\s+(?:a\s+)?([^.!?]+)',
+            r'role\s+of\s+([^.!?]+)',
+            r'job\s+as\s+([^.!?]+)'
+        ]
+        for pattern in patterns:
+            if re.search(pattern, query, re.IGNORECASE):
+                break
+        return "resume"
+    if any(keyword in query.lower() for keyword in ["github", "repo", "commits"]):
+        return "github"
+    return "rag"
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark chat request routing")
+    parser.add_argument("--rounds", type=int, default=2000, help="Passes over the message set")
+    return parser.parse_args()
+
+
+def measure(fn, messages, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for message in messages:
+            fn(message)
+    return (time.perf_counter() - start) / (rounds * len(messages)) * 1e6
+
+
+def main():
+    args = parse_args()
+    messages = [e["question"] for e in load_training_examples()] + EXTRA_MESSAGES
+
+    legacy_us = measure(legacy_route, messages, args.rounds)
+    classify_us = measure(_classify, messages, args.rounds)
+    router_us = measure(route_query, messages, args.rounds)
+    print(f"📨 {len(messages)} messages x {args.rounds} rounds")
+    print(f"   legacy multi-pass:      {legacy_us:6.2f} us/message")
+    print(f"   single-pass router:     {classify_us:6.2f} us/message")
+    print(f"   route_query (+ stats):  {router_us:6.2f} us/message")
+
+    disagreements = [(m, legacy_route(m), route_query(m)[0]) for m in messages]
+    disagreements = [d for d in disagreements if d[1] != d[2]]
+    print(f"\n🔀 {len(disagreements)} messages routed differently:")
+    for message, old, new in disagreements:
+        print(f"   {old:>8} -> {new:<8} {message}")
+
+    misrouted = [(m, expected, route_query(m)[0]) for m, expected in EXPECTED_ROUTES]
+    misrouted = [m for m in misrouted if m[1] != m[2]]
+    print(f"\n🎯 {len(EXPECTED_ROUTES) - len(misrouted)}/{len(EXPECTED_ROUTES)} expected routes matched")
+    for message, expected, got in misrouted:
+        print(f"   ❌ expected {expected}, got {got}: {message}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Vector Store Benchmark
+
+Compares the vector backends behind retrieve_from_pinecone on a synthetic
+corpus of unit vectors (Pinecone's 1024 dimensions by default):
+- numpy: brute-force matrix product over a memory-mapped .npy file
+- hnsw:  in-process hnswlib graph
+- pinecone: the hosted index (only with --with-pinecone and a real
+            PINECONE_API_KEY; queries the live index with random vectors)
+
+Reports load time from disk, unfiltered and section-filtered query latency
+and recall@k against exact search, for each corpus size.
+
+Usage:
+python -m backend.scripts.benchmarks.vector_store
+python -m backend.scripts.benchmarks.vector_store --sizes 60 1000 10000 --with-pinecone
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+
+import numpy as np
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from backend.rag.vector_store import NumpyVectorStore, HnswVectorStore
+
+SECTIONS = ["Work Experience", "Projects", "Education", "Skills", "Personal"]
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the vector store backends")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[60, 1000, 10000], help="Corpus sizes (vectors)")
+    parser.add_argument("--dim", type=int, default=1024, help="Embedding dimension")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per measurement")
+    parser.add_argument("--top-k", type=int, default=5, help="Results per query")
+    parser.add_argument("--with-pinecone", action="store_true", help="Also query the live Pinecone index")
+    return parser.parse_args()
+
+
+def random_unit(rng, n, dim):
+    data = rng.standard_normal((n, dim)).astype(np.float32)
+    return data / np.linalg.norm(data, axis=1, keepdims=True)
+
+
+def latencies_ms(store, queries, top_k, filters=None):
+    times = []
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(store.query(query, top_k, filters=filters))
+        times.append((time.perf_counter() - start) * 1000)
+    return sorted(times), results
+
+
+def p50_p95(times):
+    return statistics.median(times), times[int(len(times) * 0.95) - 1]
+
+
+def recall(results, exact):
+    hits = sum(len({m["id"] for m in got} & {m["id"] for m in want}) for got, want in zip(results, exact))
+    return hits / sum(len(want) for want in exact)
+
+
+def benchmark_local(size, args, rng):
+    vectors = random_unit(rng, size, args.dim)
+    records = [
+        {"id": f"chunk_{i}", "values": vectors[i], "metadata": {"section": SECTIONS[i % len(SECTIONS)], "text": ""}}
+        for i in range(size)
+    ]
+    queries = random_unit(rng, args.queries, args.dim)
+    rows = []
+    exact = None
+    directory = tempfile.mkdtemp(prefix="vector_bench_")
+    try:
+        for name, factory in (("numpy", NumpyVectorStore), ("hnsw", HnswVectorStore)):
+            path = os.path.join(directory, name)
+            build_start = time.perf_counter()
+            store = factory(path)
+            store.upsert(records)
+            store.flush()
+            build_s = time.perf_counter() - build_start
+
+            load_start = time.perf_counter()
+            store = factory(path)
+            load_ms = (time.perf_counter() - load_start) * 1000
+
+            times, results = latencies_ms(store, queries, args.top_k)
+            filtered_times, _ = latencies_ms(store, queries, args.top_k, filters={"section": SECTIONS[:1]})
+            if exact is None:
+                exact = results  # brute force is exact
+            rows.append((name, build_s, load_ms, *p50_p95(times), p50_p95(filtered_times)[0], recall(results, exact)))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return rows
+
+
+def benchmark_pinecone(args, rng):
+    from backend.rag.pinecone_store import get_pinecone_index
+    from backend.rag.vector_store import PineconeVectorStore
+
+    load_start = time.perf_counter()
+    store = PineconeVectorStore(get_pinecone_index())
+    dim = store.dimension
+    load_ms = (time.perf_counter() - load_start) * 1000
+    queries = random_unit(rng, min(args.queries, 50), dim)
+    times, _ = latencies_ms(store, queries, args.top_k)
+    filtered_times, _ = latencies_ms(store, queries, args.top_k, filters={"section": SECTIONS[:1]})
+    return ("pinecone", float("nan"), load_ms, *p50_p95(times), p50_p95(filtered_times)[0], float("nan")), store.count()
+
+
+def print_row(row):
+    name, build_s, load_ms, p50, p95, filtered_p50, recall_at_k = row
+    print(f"{name:<10} {build_s:9.3f} {load_ms:9.2f} {p50:9.3f} {p95:9.3f} {filtered_p50:13.3f} {recall_at_k:9.1%}")
+
+
+def main():
+    args = parse_args()
+    rng = np.random.default_rng(0)
+    header = (f"{'backend':<10} {'build (s)':>9} {'load (ms)':>9} {'p50 (ms)':>9} {'p95 (ms)':>9} "
+              f"{'filtered p50':>13} {'recall@' + str(args.top_k):>9}")
+
+    for size in args.sizes:
+        print(f"\n📐 {size} vectors x {args.dim} dims, {args.queries} queries")
+        print(header)
+        for row in benchmark_local(size, args, rng):
+            print_row(row)
+
+    if args.with_pinecone:
+        row, count = benchmark_pinecone(args, rng)
+        print(f"\n🌲 Live Pinecone index ({count} vectors)")
+        print(header)
+        print_row(row)
+    else:
+        print("\npinecone   (skipped - pass --with-pinecone to query the live index)")
+
+
+if __name__ == "__main__":
+    main()
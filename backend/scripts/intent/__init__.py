@@ -0,0 +1,3 @@
+"""
+Training scripts for the local intent classifier.
+"""
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Train the Local Intent Classifier
+
+Reads the labelled questions of the RAG evaluation datasets, trains the
+TF-IDF + softmax intent model and writes it to INTENT_MODEL_PATH.
+
+- category: the dataset's category ("technical" is folded into "skills",
+  the label set classify_query_intent uses)
+- complexity: from the number of key facts the answer needs
+  (<= 3 simple, 4 moderate, >= 5 complex)
+
+The datasets are read with ast instead of imported, so training needs no
+API keys (the evaluation modules import the generator).
+
+Usage:
+python -m backend.scripts.intent.train_intent_model
+"""
+
+import os
+import ast
+import sys
+import argparse
+from typing import Dict, List
+
+# Add the project root to Python path
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+sys.path.append(PROJECT_ROOT)
+
+from backend.rag.intent_model import IntentModel
+from backend.rag.config import INTENT_MODEL_PATH
+
+DATASETS = [
+    ("backend/rag/rag_evaluation.py", "EVALUATION_DATASET"),
+    ("backend/rag/rag_evaluation_mini.py", "MINI_EVALUATION_DATASET"),
+]
+
+CATEGORY_ALIASES = {"technical": "skills"}
+
+# Hand-written questions for phrasings the evaluation sets don't cover
+SUPPLEMENTARY_EXAMPLES = [
+    {"question": "Give me an overview of Kushagra's profile", "category": "general", "complexity": "complex"},
+    {"question": "Who is Kushagra?", "category": "general", "complexity": "moderate"},
+    {"question": "Why should we hire Kushagra?", "category": "general", "complexity": "complex"},
+    {"question": "Summarize his background", "category": "general", "complexity": "complex"},
+    {"question": "Where has Kushagra worked?", "category": "work_experience", "complexity": "moderate"},
+    {"question": "What was his internship about?", "category": "work_experience", "complexity": "moderate"},
+    {"question": "What is his job title?", "category": "work_experience", "complexity": "simple"},
+    {"question": "Which companies has he interned at?", "category": "work_experience", "complexity": "moderate"},
+    {"question": "What projects has Kushagra built?", "category": "projects", "complexity": "complex"},
+    {"question": "Show me his GitHub projects on machine learning", "category": "projects", "complexity": "moderate"},
+    {"question": "What is the AskPDF app?", "category": "projects", "complexity": "simple"},
+    {"question": "Which programming languages does Kushagra know?", "category": "skills", "complexity": "simple"},
+    {"question": "Is he good at Python?", "category": "skills", "complexity": "simple"},
+    {"question": "What cloud platforms can he use?", "category": "skills", "complexity": "moderate"},
+    {"question": "Where did Kushagra study?", "category": "education", "complexity": "simple"},
+    {"question": "What was his major in college?", "category": "education", "complexity": "simple"},
+    {"question": "Does he have any certifications or diplomas?", "category": "education", "complexity": "moderate"},
+    {"question": "When was Kushagra born?", "category": "personal", "complexity": "simple"},
+    {"question": "What does he like to do for fun?", "category": "personal", "complexity": "simple"},
+    {"question": "Which sports does Kushagra play?", "category": "personal", "complexity": "simple"},
+]
+
+
+def complexity_from_key_facts(count: int) -> str:
+    if count <= 3:
+        return "simple"
+    if count == 4:
+        return "moderate"
+    return "complex"
+
+
+def load_dataset(path: str, name: str) -> List[Dict]:
+    """Read a module-level list literal without importing the module"""
+    with open(os.path.join(PROJECT_ROOT, path), "r") as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == name for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise ValueError(f"{name} not found in {path}")
+
+
+def load_training_examples(include_supplementary: bool = True) -> List[Dict[str, str]]:
+    """Deduplicated (question, category, complexity) examples"""
+    examples: Dict[str, Dict[str, str]] = {}
+    for path, name in DATASETS:
+        for item in load_dataset(path, name):
+            question = item["question"].strip()
+            examples.setdefault(question.lower(), {
+                "question": question,
+                "category": CATEGORY_ALIASES.get(item["category"], item["category"]),
+                "complexity": complexity_from_key_facts(len(item.get("key_facts", [])))
+            })
+    if include_supplementary:
+        for item in SUPPLEMENTARY_EXAMPLES:
+            examples.setdefault(item["question"].lower(), dict(item))
+    return list(examples.values())
+
+
+def train(examples: List[Dict[str, str]]) -> IntentModel:
+    return IntentModel.train(
+        [e["question"] for e in examples],
+        [e["category"] for e in examples],
+        [e["complexity"] for e in examples]
+    )
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Train the local intent classifier")
+    parser.add_argument("--output", default=INTENT_MODEL_PATH, help="Where to write the .npz model")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    examples = load_training_examples()
+    print(f"📚 {len(examples)} labelled questions")
+
+    model = train(examples)
+    output = args.output if os.path.isabs(args.output) else os.path.join(PROJECT_ROOT, args.output)
+    model.save(output)
+
+    correct = sum(model.predict(e["question"])["category"] == e["category"] for e in examples)
+    print(f"✅ Saved {output} ({os.path.getsize(output) / 1024:.1f} KB, {len(model.vocabulary)} features)")
+    print(f"   Training accuracy: {correct / len(examples):.1%} "
+          "(see backend/scripts/benchmarks/intent_classifier.py for held-out accuracy)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,18 @@
 from fastapi import FastAPI, HTTPException, Request, UploadFile, File, Depends, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 import os
-from pathlib import Path
-from backend.rag.pinecone_store import create_pinecone_embeddings, get_pinecone_index
-from backend.rag.generator import generate_response
+from backend.rag.config import CHUNK_SIZE, CHUNK_OVERLAP
+from backend.rag.pinecone_store import update_embeddings, get_vector_store, get_embedder
+from backend.rag.generator import (
+    generate_response_async, generate_response_stream_async, get_cache_stats, shutdown_executor
+)
+from backend.rag.llm_client import is_quota_error
 from backend.rag.github_stats import get_github_stats
-from backend.rag.resume_tailoring import detect_resume_command, tailor_resume  # Add this import
+from backend.rag.resume_tailoring import tailor_resume  # Add this import
+from backend.rag.router import route_query, get_router_stats, GREETING, RESUME, GITHUB
 from backend.rag.auto_update import start_auto_update, stop_auto_update
 from backend.models import create_tables, get_db
 from backend.document_service import DocumentService
@@ -20,6 +25,7 @@ from typing import Optional, List
 import logging
 import tempfile
 import random
+import json
 
 # Creative error messages for RAG failure
 CREATIVE_ERROR_MESSAGES = [
@@ -64,8 +70,8 @@ app.add_middleware(
 
 # Backend API only - Frontend is deployed on Vercel
 
-# Global Pinecone index reference
-pinecone_index = None
+# Global vector store reference (Pinecone or local HNSW, see VECTOR_BACKEND)
+vector_store = None
 # Global Whisper model reference
 whisper_model = None
 # Global document service
@@ -85,8 +91,8 @@ class TranscriptionResponse(BaseModel):
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize Pinecone index, Whisper model, and database on startup"""
-    global pinecone_index, whisper_model
+    """Initialize vector store, Whisper model, and database on startup"""
+    global vector_store, whisper_model
     
     try:
         # Create database tables
@@ -109,23 +115,29 @@ async def startup_event():
             finally:
                 db.close()
         
-        # Initialize Pinecone
-        logger.info("Initializing Pinecone vector store...")
-        pinecone_index = get_pinecone_index()
+        # Initialize the vector store (a local index is loaded from disk here)
+        vector_store = get_vector_store()
+        logger.info(f"Initializing {vector_store.name} vector store...")
         
-        # Check if we need to create embeddings
-        stats = pinecone_index.describe_index_stats()
-        if stats['total_vector_count'] == 0:
-            logger.info("No embeddings found. Creating new embeddings...")
-            json_directory = Path("backend/data")
-            create_pinecone_embeddings(
-                json_directory=str(json_directory),
-                chunk_size=512,
-                overlap=120
-            )
-            logger.info("✅ Pinecone embeddings created successfully")
+        # Load the embedding model now so the first query doesn't pay for it
+        embedder = get_embedder()
+        embedder.warm_up()
+        logger.info(f"Embedding model {embedder.model_name} ready (dim {embedder.dimension})")
+        
+        # Check if we need to create embeddings (none yet, or built with another model)
+        vector_count = vector_store.count()
+        if vector_count == 0 or vector_store.dimension not in (None, embedder.dimension):
+            logger.info("No embeddings found for this model. Creating new embeddings...")
+            # Goes through update_embeddings so that when several workers start at once,
+            # one builds and the others find the finished index instead of rebuilding it
+            update_embeddings(json_directory="backend/data", chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP)
+            vector_store = get_vector_store()
+            logger.info(f"✅ {vector_store.name} embeddings created successfully")
         else:
-            logger.info(f"✅ Pinecone index loaded with {stats['total_vector_count']} vectors")
+            logger.info(f"✅ {vector_store.name} index loaded with {vector_count} vectors")
+            # Pick up data edits made while the server was down (no-op if nothing changed)
+            update_embeddings(json_directory="backend/data", chunk_size=CHUNK_SIZE, overlap=CHUNK_OVERLAP)
+            vector_store = get_vector_store()
 
         # Load Whisper model only if ENABLE_WHISPER env var is set
         if os.getenv("ENABLE_WHISPER", "false").lower() == "true":
@@ -148,16 +160,17 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup resources on shutdown"""
-    global pinecone_index, whisper_model
+    global vector_store, whisper_model
     
     # Stop auto-update monitoring
     logger.info("Stopping auto-update system...")
     stop_auto_update()
+    shutdown_executor()
     
-    if pinecone_index:
+    if vector_store:
         try:
-            pinecone_index = None
-            logger.info("Pinecone index cleaned up successfully")
+            vector_store = None
+            logger.info("Vector store cleaned up successfully")
         except Exception as e:
             logger.error(f"Error during cleanup: {str(e)}")
     whisper_model = None
@@ -171,6 +184,52 @@ async def global_exception_handler(request: Request, exc: Exception):
         content={"detail": "An unexpected error occurred. Please try again later."}
     )
 
+async def answer_routed_query(query: str) -> Optional[ChatResponse]:
+    """
+    Answer the routes that skip RAG (greeting / resume / GitHub).
+    Returns None when the query should go to RAG. Shared by /chat and /chat/stream.
+    """
+    # One pass decides greeting / resume / GitHub / RAG
+    route, route_args = route_query(query)
+    
+    # Handle greetings
+    if route == GREETING:
+        return ChatResponse(
+            response="Hello! I'm Kushagra's Portfolio Chatbot. How can I help you today?",
+            type="text"
+        )
+    if route == RESUME:
+        try:
+            result = await run_in_threadpool(tailor_resume, route_args["job_description"], vector_store)
+            # Pass either the full path or just the filename, depending on your frontend needs
+            return ChatResponse(
+                response=result["answer"],
+                type="resume",
+                metadata={"file_path": result["file_path"], "filename": os.path.basename(result["file_path"])}
+            )
+        except Exception as e:
+            logger.error(f"Resume tailoring error: {str(e)}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to tailor resume: {str(e)}"
+            )
+    # Handle GitHub related queries
+    if route == GITHUB:
+        try:
+            github_data = await run_in_threadpool(get_github_stats, query)
+            return ChatResponse(
+                response="Here's the GitHub information you requested",
+                type="github_stats",
+                metadata={"github_data": github_data}
+            )
+        except Exception as e:
+            logger.error(f"GitHub stats error: {str(e)}")
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to fetch GitHub statistics. Please try again later."
+            )
+    return None
+
 @app.post("/chat", response_model=ChatResponse)
 async def chat_endpoint(request: ChatRequest, http_request: Request):
     """Handle chat requests"""
@@ -184,53 +243,20 @@ async def chat_endpoint(request: ChatRequest, http_request: Request):
             )
         query = request.message.strip()
         
-        # Handle greetings
-        if not query or query.lower() in ['hi', 'hello','hey']:
-            return ChatResponse(
-                response="Hello! I'm Kushagra's Portfolio Chatbot. How can I help you today?",
-                type="text"
-            )
-        is_resume_request, job_description = detect_resume_command(query)
-        if is_resume_request:
-            try:
-                result = tailor_resume(job_description, pinecone_index)
-                # Pass either the full path or just the filename, depending on your frontend needs
-                return ChatResponse(
-                    response=result["answer"],
-                    type="resume",
-                    metadata={"file_path": result["file_path"], "filename": os.path.basename(result["file_path"])}
-                )
-            except Exception as e:
-                logger.error(f"Resume tailoring error: {str(e)}")
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to tailor resume: {str(e)}"
-                )
-        # Handle GitHub related queries
-        if any(keyword in query.lower() for keyword in ["github", "repo", "commits"]):
-            try:
-                github_data = get_github_stats(query)
-                return ChatResponse(
-                    response="Here's the GitHub information you requested",
-                    type="github_stats",
-                    metadata={"github_data": github_data}
-                )
-            except Exception as e:
-                logger.error(f"GitHub stats error: {str(e)}")
-                raise HTTPException(
-                    status_code=500,
-                    detail="Failed to fetch GitHub statistics. Please try again later."
-                )
+        # Greetings, resume tailoring and GitHub stats are answered without RAG
+        routed = await answer_routed_query(query)
+        if routed is not None:
+            return routed
         
-        # Handle general queries using RAG with Pinecone
-        if not pinecone_index:
+        # Handle general queries using RAG over the vector store
+        if not vector_store:
             raise HTTPException(
                 status_code=503,
-                detail="Pinecone vector store is not initialized. Please try again later."
+                detail="Vector store is not initialized. Please try again later."
             )
             
         try:
-            response = generate_response(query)
+            response = await generate_response_async(query)
             if not response or not response.get("answer"):
                 error_message = random.choice(CREATIVE_ERROR_MESSAGES)
                 raise HTTPException(
@@ -241,9 +267,9 @@ async def chat_endpoint(request: ChatRequest, http_request: Request):
             # Re-raise HTTP exceptions as-is
             raise
         except Exception as gen_error:
-            # Check if it's a quota/API error
-            error_str = str(gen_error).lower()
-            if any(keyword in error_str for keyword in ['quota', 'exceeded', 'rate limit', 'resourceexhausted', '429']):
+            # Quota errors during generation are already answered extractively by the
+            # generator; reaching here means the quota ran out before retrieval finished
+            if is_quota_error(gen_error):
                 error_message = random.choice(CREATIVE_ERROR_MESSAGES)
                 logger.warning(f"API quota exceeded: {str(gen_error)}")
                 raise HTTPException(
@@ -261,6 +287,7 @@ async def chat_endpoint(request: ChatRequest, http_request: Request):
         return ChatResponse(
             response=response["answer"],
             type="text",
+            metadata={"degraded": True} if response.get("degraded") else {}
         )
         
     except HTTPException as he:
@@ -272,6 +299,56 @@ async def chat_endpoint(request: ChatRequest, http_request: Request):
             detail="An error occurred while processing your request. Please try again."
         )
 
+def format_sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/chat/stream")
+async def chat_stream_endpoint(request: ChatRequest, http_request: Request):
+    """
+    Stream a RAG answer as Server-Sent Events.
+    Sends retrieval metadata first, then Gemini tokens as they arrive.
+    Cached answers are replayed as a single "answer" event, and so are the
+    routes /chat answers without RAG (greeting / resume / GitHub).
+    """
+    client_ip = http_request.client.host if http_request.client else "unknown"
+    if not check_rate_limit(client_ip, "chat", max_requests=50, window_minutes=60):
+        raise HTTPException(
+            status_code=429, 
+            detail="Too many requests. Please try again later."
+        )
+    query = request.message.strip()
+    
+    # Routed before the stream starts, so failures keep their HTTP status like /chat
+    routed = await answer_routed_query(query)
+    
+    if routed is None and not vector_store:
+        raise HTTPException(
+            status_code=503,
+            detail="Vector store is not initialized. Please try again later."
+        )
+    
+    async def event_stream():
+        if routed is not None:
+            yield format_sse("answer", {"answer": routed.response, "type": routed.type, "metadata": routed.metadata})
+            return
+        try:
+            async for event in generate_response_stream_async(query):
+                yield format_sse(event["event"], event["data"])
+        except Exception as gen_error:
+            # Headers are already sent, so errors go out as an event
+            if is_quota_error(gen_error):
+                logger.warning(f"API quota exceeded: {str(gen_error)}")
+            else:
+                logger.error(f"RAG streaming error: {str(gen_error)}")
+            yield format_sse("error", {"detail": random.choice(CREATIVE_ERROR_MESSAGES)})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/transcribe", response_model=TranscriptionResponse)
 async def transcribe_audio(file: UploadFile = File(...)):
     """Transcribe audio file using Whisper"""
@@ -314,13 +391,19 @@ async def transcribe_audio(file: UploadFile = File(...)):
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    global pinecone_index, whisper_model
+    global vector_store, whisper_model
     return {
         "status": "healthy",
-        "pinecone_initialized": pinecone_index is not None,
+        "vector_store_initialized": vector_store is not None,
+        "vector_backend": vector_store.name if vector_store else None,
         "whisper_model_initialized": whisper_model is not None
     }
 
+@app.get("/stats")
+async def stats():
+    """Chat pipeline counters: cache hits, coalesced requests and routing"""
+    return {**get_cache_stats(), "router": get_router_stats()}
+
 @app.get("/download-resume/{filename:path}")
 async def download_resume(filename: str):
     """Download the tailored resume"""
@@ -524,6 +607,7 @@ async def root():
             "health": "/health",
             "docs": "/docs",
             "chat": "/chat",
+            "chat_stream": "/chat/stream",
             "documents": "/documents/"
         },
         "frontend": "Deployed separately on Vercel"
@@ -8,7 +8,8 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from backend.rag.pinecone_store import create_pinecone_embeddings, get_pinecone_index
+from backend.rag.config import CHUNK_SIZE, CHUNK_OVERLAP
+from backend.rag.pinecone_store import create_pinecone_embeddings, get_vector_store, get_current_generation, wait_for_old_generations
 
 def regenerate_embeddings():
     """Regenerate all Pinecone embeddings with improved chunking"""
@@ -16,38 +17,35 @@ def regenerate_embeddings():
     print("REGENERATING PINECONE EMBEDDINGS")
     print("=" * 80)
     
-    print("\n🗑️  Step 1: Clearing existing embeddings...")
+    print("\n📊 Step 1: Current index generation...")
     try:
-        index = get_pinecone_index()
-        stats = index.describe_index_stats()
-        print(f"   Current vectors in index: {stats['total_vector_count']}")
-        
-        # Delete all vectors (fresh start)
-        index.delete(delete_all=True)
-        print("   ✅ Cleared all existing vectors")
+        store = get_vector_store()
+        print(f"   Generation {get_current_generation() or '(unversioned)'}: {store.count()} vectors in {store.name} index")
+        print("   (it keeps serving chats until the new generation is ready)")
     except Exception as e:
-        print(f"   ⚠️  Could not clear index: {e}")
+        print(f"   ⚠️  Could not read index: {e}")
     
-    print("\n📚 Step 2: Creating new embeddings with improved chunking...")
+    print("\n📚 Step 2: Creating new embeddings in a new index generation...")
     json_directory = Path("backend/data")
     
     try:
         create_pinecone_embeddings(
             json_directory=str(json_directory),
-            chunk_size=512,  # Good size for preserving context
-            overlap=150  # Increased overlap for better context continuity
+            chunk_size=CHUNK_SIZE,  # Same settings as startup and the auto-updater,
+            overlap=CHUNK_OVERLAP  # so later incremental updates can reuse this generation
         )
         print("   ✅ Successfully created new embeddings!")
+        # Old generations are removed after the INDEX_GC_DELAY grace period;
+        # stay alive until then so the clean-up is not lost on exit
+        wait_for_old_generations()
     except Exception as e:
         print(f"   ❌ Error: {e}")
         raise
     
     print("\n✅ Step 3: Verifying new embeddings...")
     try:
-        index = get_pinecone_index()
-        stats = index.describe_index_stats()
-        print(f"   Total vectors in index: {stats['total_vector_count']}")
-        print(f"   Dimensions: {stats.get('dimension', 'N/A')}")
+        store = get_vector_store()
+        print(f"   Generation {get_current_generation()}: {store.count()} vectors in {store.name} index")
     except Exception as e:
         print(f"   ⚠️  Could not verify: {e}")
     
@@ -6,7 +6,8 @@ Run this script whenever you update your data files to regenerate embeddings
 
 import sys
 from pathlib import Path
-from backend.rag.pinecone_store import create_pinecone_embeddings, clear_pinecone_index, get_pinecone_index
+from backend.rag.config import CHUNK_SIZE, CHUNK_OVERLAP
+from backend.rag.pinecone_store import update_embeddings, get_vector_store, get_current_generation, wait_for_old_generations
 
 def main():
     print("=" * 60)
@@ -15,9 +16,9 @@ def main():
     
     # Ask for confirmation
     print("\n⚠️  This will:")
-    print("   1. Clear all existing embeddings from Pinecone")
-    print("   2. Re-generate embeddings from backend/data/")
-    print("   3. Upload new embeddings to Pinecone")
+    print("   1. Re-chunk backend/data/ and compare it with the index manifest")
+    print("   2. Embed and upload only new/changed chunks, delete removed ones")
+    print("   (a full rebuild into a new index generation if the index has no manifest)")
     
     confirm = input("\n❓ Continue? (yes/no): ").lower().strip()
     
@@ -26,30 +27,25 @@ def main():
         sys.exit(0)
     
     try:
-        # Step 1: Clear existing embeddings
-        print("\n🧹 Clearing existing embeddings...")
-        clear_pinecone_index()
-        
-        # Step 2: Create new embeddings
-        print("\n🔄 Creating new embeddings...")
+        # Step 1-2: Update changed embeddings (the index keeps serving meanwhile)
+        print("\n🔄 Updating embeddings...")
         json_directory = "backend/data"
-        create_pinecone_embeddings(
+        update_embeddings(
             json_directory=json_directory,
-            chunk_size=512,
-            overlap=120
+            chunk_size=CHUNK_SIZE,
+            overlap=CHUNK_OVERLAP
         )
         
-        # Step 3: Verify
+        # Step 3: Verify, then wait out the INDEX_GC_DELAY grace period so the
+        # delayed removal of an old generation (after a full rebuild) still runs
         print("\n✅ Verifying...")
-        index = get_pinecone_index()
-        stats = index.describe_index_stats()
+        store = get_vector_store()
+        wait_for_old_generations()
         
         print("\n" + "=" * 60)
         print("✅ SUCCESS!")
         print("=" * 60)
-        print(f"📊 Total vectors in Pinecone: {stats['total_vector_count']}")
-        print(f"🌲 Index name: chatfolio")
-        print(f"📍 Dimension: 384")
+        print(f"📊 Total vectors in {store.name} generation {get_current_generation()}: {store.count()}")
         print("\n🚀 Your embeddings are updated and ready!")
         
     except Exception as e: